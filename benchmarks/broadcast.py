@@ -0,0 +1,103 @@
+"""
+Simulates a broadcast by appending moves to PGN files, one file per game.
+
+Every interval one move is appended to a few of the games, the way a relay
+writes them as they are played. Watch the files with bin/pgn-dashboard:
+
+    python benchmarks/broadcast.py /tmp/round1 --games 16 &
+    bin/pgn-dashboard /tmp/round1/*.pgn
+
+With --measure the files are also followed by a Dashboard on an off screen
+canvas polled at --fps, and the CPU time spent polling and drawing is
+reported separately for polls where nothing moved and polls that redrew.
+"""
+
+import os
+import time
+import random
+import argparse
+
+import chess
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from chessplotlib.dashboard import Dashboard
+from suite import synthetic_game
+
+
+def start_games(directory, games, plies):
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    lines = []
+    for i in range(games):
+        path = os.path.join(directory, f"board{i + 1:02d}.pgn")
+        with open(path, "w") as f:
+            f.write(f'[White "White {i + 1}"]\n[Black "Black {i + 1}"]\n\n')
+        paths.append(path)
+        lines.append(list(synthetic_game(plies, seed=i).mainline_moves()))
+    return paths, lines
+
+
+def append_move(path, board, move):
+    text = board.san(move)
+    if board.turn == chess.WHITE:
+        text = f"{board.fullmove_number}. {text}"
+    board.push(move)
+    with open(path, "a") as f:
+        f.write(text + " ")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("directory", help="Directory to write the games to.")
+    parser.add_argument("--games", type=int, default=16)
+    parser.add_argument("--plies", type=int, default=120)
+    parser.add_argument(
+        "--interval", type=float, default=1.0, help="Seconds between moves."
+    )
+    parser.add_argument(
+        "--moves", type=int, default=2, help="Games that move each interval."
+    )
+    parser.add_argument("--measure", action="store_true")
+    parser.add_argument("--fps", type=float, default=4.0)
+    args = parser.parse_args()
+
+    paths, lines = start_games(args.directory, args.games, args.plies)
+    boards = [chess.Board() for _ in paths]
+    rng = random.Random(0)
+
+    dashboard = None
+    if args.measure:
+        fig = Figure(figsize=(12, 12))
+        FigureCanvasAgg(fig)
+        dashboard = Dashboard(fig, paths, fps=args.fps)
+        fig.canvas.draw()
+    idle = []
+    drawn = []
+
+    def playing():
+        return [i for (i, b) in enumerate(boards) if len(b.move_stack) < len(lines[i])]
+
+    next_move = time.monotonic()
+    while playing():
+        if time.monotonic() >= next_move:
+            games = playing()
+            for i in rng.sample(games, min(args.moves, len(games))):
+                move = lines[i][len(boards[i].move_stack)]
+                append_move(paths[i], boards[i], move)
+            next_move += args.interval
+
+        if dashboard is None:
+            time.sleep(max(next_move - time.monotonic(), 0))
+            continue
+
+        start = time.process_time()
+        redrawn = dashboard.update()
+        (drawn if redrawn else idle).append(time.process_time() - start)
+        time.sleep(1 / args.fps)
+
+    if dashboard is not None:
+        for name, times in (("idle", idle), ("redraw", drawn)):
+            if times:
+                average = sum(times) / len(times) * 1000
+                print(f"{name:8s} polls {len(times):5d}  cpu {average:8.3f} ms/poll")
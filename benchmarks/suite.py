@@ -0,0 +1,284 @@
+"""
+Benchmarks the plotting hot paths and checks them against a baseline.
+
+Measures plot_board over the positions in test/boards.txt, the plot_move and
+mark_move overlays, savefig to PNG and SVG, the native SVG writer, PGNViewer
+step latency over a long synthetic game and the time to import chessplotlib.
+It also records how many artists a board creates, the size of the native SVG
+and the peak memory of a render. Run from the root of the repo:
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --baseline benchmarks/baseline.json
+
+Every metric is lower-is-better and every timing is the fastest of --repeat
+runs, (default 20), since noise only ever adds time. With --baseline, any
+metric more than --threshold (default 25%) above its baseline fails the run
+with exit code 1. Timings must also be --min-delta (default 0.5) ms slower,
+so sub-millisecond jitter is not reported as a regression.
+Use --save-baseline to replace the stored baseline after an intended change.
+"""
+
+import io
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import subprocess
+import tracemalloc
+from types import SimpleNamespace
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import chess
+import chess.pgn
+import matplotlib.pyplot as plt
+
+from chessplotlib import plot_board, plot_move, plot_moves, mark_move
+from chessplotlib.pgn import PGNViewer
+from chessplotlib.svg import render_svg
+
+
+def timed(fn, repeat):
+    """
+    Fastest seconds per call of fn over repeat calls, after one warm up call
+    """
+    fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def synthetic_game(plies, seed=0):
+    """
+    A reproducible game of random legal moves, shorter if it ends in mate
+    """
+    rng = random.Random(seed)
+    game = chess.pgn.Game()
+    node = game
+    board = chess.Board()
+    while len(board.move_stack) < plies:
+        moves = list(board.legal_moves)
+        if not moves:
+            break
+        move = rng.choice(moves)
+        node = node.add_variation(move)
+        board.push(move)
+    return game
+
+
+def bench_plot(boards, moves, repeat):
+    fig, ax = plt.subplots(1, 1)
+
+    def board_only():
+        for board in boards:
+            ax.clear()
+            plot_board(ax, board)
+
+    def collections():
+        for board in boards:
+            ax.clear()
+            plot_board(ax, board, collections=True)
+
+    def overlays():
+        for board, move in zip(boards, moves):
+            ax.clear()
+            plot_board(ax, board)
+            plot_move(ax, board, move)
+            mark_move(ax, move)
+
+    def legal_moves():
+        ax.clear()
+        plot_board(ax, boards[1])
+        plot_moves(ax, boards[1])
+        fig.canvas.draw()
+
+    def draw():
+        ax.clear()
+        plot_board(ax, boards[1])
+        plot_move(ax, boards[1], moves[1])
+        fig.canvas.draw()
+
+    n = len(boards)
+    results = {
+        "plot_board_ms": timed(board_only, repeat) / n * 1000,
+        "plot_board_collections_ms": timed(collections, repeat) / n * 1000,
+        "plot_board_overlays_ms": timed(overlays, repeat) / n * 1000,
+        "draw_ms": timed(draw, repeat) * 1000,
+        "draw_legal_moves_ms": timed(legal_moves, repeat) * 1000,
+    }
+
+    for fmt in ("png", "svg"):
+
+        def save():
+            fig.savefig(io.BytesIO(), format=fmt)
+
+        results[f"savefig_{fmt}_ms"] = timed(save, repeat) * 1000
+
+    ax.clear()
+    plot_board(ax, boards[1])
+    results["artists_plot_board"] = len(ax.get_children())
+    ax.clear()
+    plot_board(ax, boards[1], collections=True)
+    results["artists_plot_board_collections"] = len(ax.get_children())
+
+    plt.close(fig)
+    return results
+
+
+def bench_viewer(plies, repeat, blit, steps=20):
+    """
+    Milliseconds per step, over the same steps from the middle of the game
+    """
+    fig, ax = plt.subplots(1, 1)
+    game = synthetic_game(plies)
+    viewer = PGNViewer(fig, ax, game, blit=blit)
+    fig.canvas.draw()
+
+    right = SimpleNamespace(key="right")
+    steps = min(steps, len(viewer.moves) - 1)
+
+    # Start from the middle so the lazy boards replay from a checkpoint
+    start = len(viewer.moves) // 2 - steps // 2
+
+    def step():
+        viewer.move_num = start
+        for _ in range(steps):
+            viewer._press(right)
+
+    result = timed(step, repeat) / steps * 1000
+    plt.close(fig)
+    return result
+
+
+def bench_memory(board, move):
+    fig, ax = plt.subplots(1, 1)
+    tracemalloc.start()
+    plot_board(ax, board)
+    plot_move(ax, board, move)
+    fig.savefig(io.BytesIO(), format="png")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    plt.close(fig)
+    return peak / 2**20
+
+
+def bench_svg(boards, moves, repeat):
+    def render():
+        for board, move in zip(boards, moves):
+            render_svg(board, move, marks=[move.from_square, move.to_square])
+
+    n = len(boards)
+    size = sum(len(render_svg(board, move)) for (board, move) in zip(boards, moves))
+    return {
+        "render_svg_ms": timed(render, repeat) / n * 1000,
+        "render_svg_kib": size / n / 2**10,
+    }
+
+
+def bench_import(repeat):
+    """
+    Best of repeat fresh interpreters, so the result excludes slow outliers
+    """
+    code = (
+        "import time; start = time.perf_counter(); import chessplotlib; "
+        "print(time.perf_counter() - start)"
+    )
+    times = []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, "-c", code])
+        times.append(float(output))
+    return min(times) * 1000
+
+
+def run(repeat, plies):
+    with open("test/boards.txt", "r") as bf:
+        boards = [chess.Board(l.rstrip()) for l in bf.readlines()]
+    with open("test/moves.txt", "r") as mf:
+        moves = [chess.Move.from_uci(l.rstrip()) for l in mf.readlines()]
+
+    metrics = bench_plot(boards, moves, repeat)
+    metrics.update(bench_svg(boards, moves, repeat))
+    metrics["viewer_step_ms"] = bench_viewer(plies, repeat, blit=False)
+    metrics["viewer_step_blit_ms"] = bench_viewer(plies, repeat, blit=True)
+    metrics["render_peak_mib"] = bench_memory(boards[1], moves[1])
+    metrics["import_ms"] = bench_import(repeat)
+    return metrics
+
+
+def compare(metrics, baseline, threshold, min_delta):
+    """
+    Prints each metric beside its baseline, returns the names that regressed
+    """
+    regressions = []
+    for name, value in metrics.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:32s} {value:10.3f}")
+            continue
+
+        ratio = value / base if base else 1.0
+        flag = ""
+        slower = not name.endswith("_ms") or value - base > min_delta
+        if ratio > 1 + threshold and slower:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:32s} {value:10.3f} {base:10.3f} {ratio:6.2f}x{flag}")
+
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--plies", type=int, default=400)
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="JSON results to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=0.5,
+        help="Milliseconds a timing must also grow by to regress.",
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Overwrite --baseline."
+    )
+    args = parser.parse_args()
+
+    metrics = run(args.repeat, args.plies)
+    results = {
+        "python": platform.python_version(),
+        "matplotlib": matplotlib.__version__,
+        "chess": chess.__version__,
+        "platform": platform.platform(),
+        "metrics": metrics,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    baseline = {}
+    if args.baseline and not args.save_baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)["metrics"]
+
+    regressions = compare(metrics, baseline, args.threshold, args.min_delta)
+
+    if args.baseline and args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if regressions:
+        print(f"Regressed more than {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
@@ -0,0 +1,46 @@
+"""
+Measures how render_board scales with the number of threads.
+
+Renders every position in test/boards.txt repeatedly from a thread pool and
+prints the throughput for each pool size. Run from the root of the repo:
+
+    python benchmarks/threads.py --threads 1 2 4 8
+"""
+
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import chess
+
+from chessplotlib.render import render_board
+
+
+def throughput(boards, threads, fmt):
+    with ThreadPoolExecutor(threads) as pool:
+        # Warm up the font and glyph caches of every worker thread
+        list(pool.map(lambda b: render_board(b, fmt=fmt), boards[:threads]))
+
+        start = time.perf_counter()
+        list(pool.map(lambda b: render_board(b, fmt=fmt), boards))
+        elapsed = time.perf_counter() - start
+
+    return len(boards) / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--fmt", default="png")
+    args = parser.parse_args()
+
+    with open("test/boards.txt", "r") as bf:
+        fens = [l.rstrip() for l in bf.readlines()]
+    boards = [chess.Board(fen) for fen in fens] * args.repeat
+
+    base = None
+    for threads in args.threads:
+        rate = throughput(boards, threads, args.fmt)
+        base = base or rate
+        print(f"{threads:3d} threads: {rate:7.1f} boards/sec ({rate / base:.2f}x)")
@@ -1 +1,49 @@
-from chessplotlib.plot import plot_board, plot_move, mark_square, mark_move
+import importlib
+from typing import TYPE_CHECKING
+
+# Public names and the module that defines them. Modules are imported the
+# first time one of their names is used, so importing the package does not
+# load matplotlib. The modules only import pyplot for type hints, under
+# TYPE_CHECKING, since importing it selects a backend.
+_EXPORTS = {
+    "plot_board": "chessplotlib.plot",
+    "plot_board_grid": "chessplotlib.plot",
+    "plot_move": "chessplotlib.plot",
+    "plot_moves": "chessplotlib.plot",
+    "plot_heatmap": "chessplotlib.plot",
+    "mark_square": "chessplotlib.plot",
+    "mark_squares": "chessplotlib.plot",
+    "mark_move": "chessplotlib.plot",
+    "BoardArtist": "chessplotlib.artist",
+    "PGNViewer": "chessplotlib.pgn",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from chessplotlib.plot import (
+        plot_board,
+        plot_board_grid,
+        plot_move,
+        plot_moves,
+        plot_heatmap,
+        mark_square,
+        mark_squares,
+        mark_move,
+    )
+    from chessplotlib.artist import BoardArtist
+    from chessplotlib.pgn import PGNViewer
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,222 @@
+import io
+import itertools
+import multiprocessing
+from typing import Iterator, List, Optional, Tuple
+
+import chess
+import chess.pgn
+import numpy as np
+
+from chessplotlib.database import PGNDatabase, iter_games
+
+# Piece of each row of an occupancy array
+OCCUPANCY_PIECES = "PNBRQKpnbrqk"
+
+# Number of positions unpacked with NumPy at a time
+_BUFFER_POSITIONS = 4096
+
+
+def occupancy(
+    path: str,
+    workers: int = 1,
+    chunksize: int = 256,
+    database: Optional[PGNDatabase] = None,
+) -> np.ndarray:
+    r"""
+    Counts how often each piece stands on each square across a PGN file.
+
+    Every position of the main line of every game is counted, including the
+    starting position. Games are streamed without building a game tree, and
+    their piece bitboards are unpacked into counts with NumPy a few thousand
+    positions at a time, so memory does not grow with the size of the file.
+
+    The file is split into chunks of `chunksize` games by byte offset, which
+    are counted by a pool of processes and summed. The offsets come from
+    `database` if one is given, and otherwise from a streaming scan.
+
+    Parameters
+    ----------
+    path: str
+        Path to the PGN file
+    workers: int, default=1
+        Number of processes, 1 counts in the current process
+    chunksize: int, default=256
+        Number of games sent to a worker at a time
+    database: PGNDatabase, optional
+        Index of the same file, to skip the scan for game offsets
+
+    Returns
+    -------
+    np.ndarray
+        (12, 64) counts, one row per piece of `OCCUPANCY_PIECES` indexed by
+        chess.Square. Every position has one white king, so the "K" row sums
+        to the number of positions.
+
+    Examples
+    --------
+    >>> import chess
+    >>> import matplotlib.pyplot as plt
+    >>> from chessplotlib import plot_board, plot_heatmap
+    >>> from chessplotlib.aggregate import OCCUPANCY_PIECES, occupancy
+    >>> counts = occupancy("games.pgn", workers=4)
+    >>> knights = counts[OCCUPANCY_PIECES.index("N")]
+    >>> ax = plt.gca()
+    >>> plot_board(ax, chess.Board.empty())
+    >>> plot_heatmap(ax, knights / counts[OCCUPANCY_PIECES.index("K")].sum())
+    >>> plt.show()
+    """
+    tasks = _game_ranges(path, chunksize, database)
+    counts = np.zeros((12, 64), dtype=np.int64)
+
+    if workers == 1:
+        for task in tasks:
+            counts += _count_range(task)
+        return counts
+
+    with multiprocessing.Pool(workers) as pool:
+        for partial in pool.imap_unordered(_count_range, tasks):
+            counts += partial
+
+    return counts
+
+
+def count_positions(boards) -> np.ndarray:
+    """
+    Counts the pieces of many positions.
+
+    Parameters
+    ----------
+    boards: Iterable[chess.Board]
+        Positions to count
+
+    Returns
+    -------
+    np.ndarray
+        (12, 64) counts in the layout of `occupancy`
+    """
+    counter = _OccupancyCounter()
+    for board in boards:
+        counter.add(board)
+    return counter.finish()
+
+
+class _OccupancyCounter:
+    """
+    Accumulates piece bitboards and unpacks them in batches
+    """
+
+    def __init__(self):
+        self.counts = np.zeros((12, 64), dtype=np.int64)
+        self._masks: List[int] = []
+
+    def add(self, board: chess.Board):
+        masks = self._masks
+        for color in chess.COLORS:
+            occupied = board.occupied_co[color]
+            masks += (
+                board.pawns & occupied,
+                board.knights & occupied,
+                board.bishops & occupied,
+                board.rooks & occupied,
+                board.queens & occupied,
+                board.kings & occupied,
+            )
+
+        if len(masks) >= 12 * _BUFFER_POSITIONS:
+            self._flush()
+
+    def finish(self) -> np.ndarray:
+        self._flush()
+        return self.counts
+
+    def _flush(self):
+        if not self._masks:
+            return
+
+        masks = np.array(self._masks, dtype="<u8").reshape(-1, 12)
+        bits = np.unpackbits(
+            masks.view(np.uint8).reshape(-1, 12, 8), axis=-1, bitorder="little"
+        )
+        self.counts += bits.sum(axis=0, dtype=np.int64)
+        self._masks.clear()
+
+
+class _OccupancyVisitor(chess.pgn.BaseVisitor):
+    """
+    Feeds every main line position of a game to a counter, skipping variations
+    """
+
+    def __init__(self, counter: _OccupancyCounter):
+        self.counter = counter
+
+    def begin_variation(self):
+        return chess.pgn.SKIP
+
+    def visit_board(self, board: chess.Board):
+        self.counter.add(board)
+
+    def result(self):
+        return True
+
+
+def _game_ranges(
+    path: str, chunksize: int, database: Optional[PGNDatabase]
+) -> Iterator[Tuple[str, int, Optional[int]]]:
+    """
+    Splits a PGN file into (path, start, end) tasks of chunksize games.
+
+    The offsets come from `database` if one is given, and otherwise from a
+    streaming scan.
+    """
+    if database is not None:
+        offsets = database.offsets.tolist()
+        ranges = _chunk_ranges(iter(offsets[:-1]), offsets[-1], chunksize)
+    else:
+        offsets = (offset for (offset, _) in iter_games(path))
+        ranges = _chunk_ranges(offsets, None, chunksize)
+
+    return ((path, start, end) for (start, end) in ranges)
+
+
+def _chunk_ranges(
+    offsets: Iterator[int], size: Optional[int], chunksize: int
+) -> Iterator[Tuple[int, Optional[int]]]:
+    """
+    Groups game offsets into (start, end) byte ranges of chunksize games.
+
+    The end of the last range is `size`, where None reads to the end of the
+    file.
+    """
+    start = next(offsets, None)
+    while start is not None:
+        following = list(itertools.islice(offsets, chunksize))
+        if len(following) < chunksize:
+            yield start, size
+            return
+
+        yield start, following[-1]
+        start = following[-1]
+
+
+def _count_range(task: Tuple[str, int, Optional[int]]) -> np.ndarray:
+    """
+    Counts the positions of the games in a byte range of a PGN file
+    """
+    handle = _read_range(*task)
+    counter = _OccupancyCounter()
+    visitor = _OccupancyVisitor(counter)
+    while chess.pgn.read_game(handle, Visitor=lambda: visitor) is not None:
+        pass
+
+    return counter.finish()
+
+
+def _read_range(path: str, start: int, end: Optional[int]) -> io.StringIO:
+    """
+    Reads a byte range of a PGN file, None reads to the end of the file
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read() if end is None else f.read(end - start)
+
+    return io.StringIO(data.decode("utf-8", errors="replace"))
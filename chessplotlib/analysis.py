@@ -0,0 +1,340 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Optional, Sequence, Union
+
+import chess
+import chess.engine
+import chess.polyglot
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.patches import Rectangle
+from mpl_toolkits.axes_grid1 import make_axes_locatable
+
+from chessplotlib.plot import _arrow_polygons
+
+
+class EngineAnalysis:
+    r"""
+    Analyses positions with a UCI engine without blocking the caller.
+
+    The engine is run through the asyncio API of `chess.engine` on an event
+    loop in a daemon thread. `request` returns immediately with whatever is
+    known about a position and starts an analysis if it is not finished.
+    Only one position is analysed at a time, so requesting a new position
+    cancels the analysis of the previous one, which stops the search in the
+    engine. Every info the engine sends with a score and a line is stored
+    by the `chess.polyglot.zobrist_hash` of the position in an LRU cache, so
+    revisited positions are answered from the cache and `result` always has
+    the deepest info received so far. Every method may be called from any
+    thread.
+
+    Attributes
+    ----------
+    limit : chess.engine.Limit
+        When an analysis is finished
+    cache_size : int
+        Number of positions kept
+
+    Examples
+    --------
+    >>> import chess
+    >>> import chess.engine
+    >>> from chessplotlib.analysis import EngineAnalysis
+    >>> analysis = EngineAnalysis("stockfish", limit=chess.engine.Limit(depth=20))
+    >>> analysis.request(chess.Board())
+    >>> info = analysis.wait(chess.Board(), timeout=10)
+    >>> info["score"].white(), info["pv"][0]
+    (Cp(+35), Move.from_uci('e2e4'))
+    >>> analysis.close()
+    """
+
+    def __init__(
+        self,
+        command: Union[str, Sequence[str]],
+        limit: Optional[chess.engine.Limit] = None,
+        options: Optional[dict] = None,
+        cache_size: int = 4096,
+    ):
+        """
+        Parameters
+        ----------
+        command : str or Sequence[str]
+            Path of a UCI engine, or a command with arguments
+        limit : chess.engine.Limit, optional
+            When an analysis is finished, defaults to depth 20
+        options : dict, optional
+            UCI options for the engine, (i.e. {"Threads": 4})
+        cache_size : int, default=4096
+            Number of positions kept
+        """
+        self.limit = limit or chess.engine.Limit(depth=20)
+        self.cache_size = cache_size
+
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+        self._finished = threading.Condition(self._lock)
+        self._key = None
+        self._task = None
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+        try:
+            self._engine = self._call(self._open(command, options or {}))
+        except BaseException:
+            self._stop_loop()
+            raise
+
+    def request(self, board: chess.Board) -> Optional[chess.engine.InfoDict]:
+        """
+        Starts analysing a position unless its analysis is finished.
+
+        Parameters
+        ----------
+        board : chess.Board
+            Position to analyse
+
+        Returns
+        -------
+        chess.engine.InfoDict
+            The deepest info known for the position, None if there is none
+        """
+        key = chess.polyglot.zobrist_hash(board)
+        with self._lock:
+            info, done = self._results.get(key, (None, False))
+            if key in self._results:
+                self._results.move_to_end(key)
+
+            if key == self._key:
+                return info
+            self._key = key
+
+            # Neither call blocks, they only schedule work on the loop
+            if self._task is not None:
+                self._task.cancel()
+                self._task = None
+
+            if not done and not board.is_game_over():
+                coroutine = self._analyse(key, board.copy())
+                self._task = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+        return info
+
+    def result(self, board: chess.Board) -> Optional[chess.engine.InfoDict]:
+        """
+        Returns the deepest info received for a position.
+
+        Parameters
+        ----------
+        board : chess.Board
+            Position that was requested
+
+        Returns
+        -------
+        chess.engine.InfoDict
+            The info, None if none has arrived
+        """
+        with self._lock:
+            info, _ = self._results.get(chess.polyglot.zobrist_hash(board), (None, 0))
+            return info
+
+    def done(self, board: chess.Board) -> bool:
+        """
+        Whether the analysis of a position reached the limit
+        """
+        with self._lock:
+            entry = self._results.get(chess.polyglot.zobrist_hash(board))
+            return entry is not None and entry[1]
+
+    def wait(
+        self, board: chess.Board, timeout: Optional[float] = None
+    ) -> Optional[chess.engine.InfoDict]:
+        """
+        Blocks until the analysis of a requested position is finished.
+
+        Parameters
+        ----------
+        board : chess.Board
+            Position that was requested
+        timeout : float, optional
+            Most seconds to wait
+
+        Returns
+        -------
+        chess.engine.InfoDict
+            The deepest info received
+        """
+        key = chess.polyglot.zobrist_hash(board)
+        with self._finished:
+            self._finished.wait_for(
+                lambda: self._results.get(key, (None, False))[1], timeout
+            )
+            return self._results.get(key, (None, False))[0]
+
+    def close(self):
+        """
+        Stops the analysis, quits the engine and stops the event loop
+        """
+        with self._lock:
+            if self._task is not None:
+                self._task.cancel()
+        try:
+            self._call(self._engine.quit(), timeout=5)
+        except (chess.engine.EngineError, asyncio.TimeoutError, TimeoutError):
+            pass
+        self._stop_loop()
+
+    def _call(self, coroutine, timeout: Optional[float] = None):
+        """
+        Runs a coroutine on the event loop and waits for its result
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(timeout)
+
+    def _stop_loop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    async def _open(self, command, options: dict):
+        _, engine = await chess.engine.popen_uci(command)
+        if options:
+            await engine.configure(options)
+        return engine
+
+    async def _analyse(self, key: int, board: chess.Board):
+        """
+        Stores the infos of an analysis as they arrive
+
+        Cancelling the task leaves the `with` block, which stops the search.
+        """
+        with await self._engine.analysis(board, self.limit) as analysis:
+            async for info in analysis:
+                if "score" in info and info.get("pv"):
+                    self._store(key, dict(info), False)
+
+        info = dict(analysis.info)
+        if "score" in info and info.get("pv"):
+            self._store(key, info, True)
+        else:
+            self._store(key, self.result(board), True)
+
+    def _store(self, key: int, info, done: bool):
+        with self._finished:
+            self._results[key] = (info, done)
+            self._results.move_to_end(key)
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+            if done:
+                self._finished.notify_all()
+
+
+class AnalysisOverlay:
+    r"""
+    Eval bar and best move arrow drawn from the info of an engine.
+
+    The bar is a narrow axes to the right of the board, white from the
+    bottom up to the expected score of white, and the best move is an arrow
+    on the board. The board axes gives up the room for the bar, so the bar
+    stays inside the figure even when the board fills it. `PGNViewer`
+    updates it from an `EngineAnalysis` as infos arrive.
+
+    Attributes
+    ----------
+    ax : plt.Axes
+        Axes with the board
+    bar_ax : plt.Axes
+        Axes with the eval bar
+    arrow : matplotlib.collections.PolyCollection
+        Arrow of the best move, empty without an info
+    bar : matplotlib.patches.Rectangle
+        White part of the eval bar
+    label : matplotlib.text.Text
+        Score above the eval bar
+    info : chess.engine.InfoDict
+        Info being shown, None if there is none
+    """
+
+    def __init__(self, ax, animated: bool = False, color: str = "tab:blue"):
+        """
+        Parameters
+        ----------
+        ax : plt.Axes
+            Axes with the board
+        animated : bool, default=False
+            Marks the artists as animated so they can be blitted
+        color : str, default=tab:blue
+            Color of the best move arrow
+        """
+        self.ax = ax
+        self.info = None
+
+        self.bar_ax = make_axes_locatable(ax).append_axes("right", "4%", pad=0.1)
+        self.bar_ax.set_xlim(0, 1)
+        self.bar_ax.set_ylim(0, 1)
+        self.bar_ax.set_xticks([])
+        self.bar_ax.set_yticks([])
+        self.bar_ax.set_facecolor("dimgray")
+
+        self.bar = Rectangle((0, 0), 1, 0.5, facecolor="white", animated=animated)
+        self.bar_ax.add_patch(self.bar)
+        self.label = self.bar_ax.text(
+            0.5, 1.01, "", ha="center", va="bottom", fontsize="small"
+        )
+        self.label.set_animated(animated)
+
+        self.arrow = PolyCollection(
+            [], facecolors=color, edgecolors="none", alpha=0.7, zorder=5
+        )
+        self.arrow.set_animated(animated)
+        self.attach()
+
+    def attach(self):
+        """
+        Adds the arrow to the board axes again after it was cleared
+        """
+        if self.arrow not in self.ax.collections:
+            self.ax.add_collection(self.arrow, autolim=False)
+
+    def set_info(self, board: chess.Board, info: Optional[chess.engine.InfoDict]):
+        """
+        Shows the info of a position, or clears the overlay for None.
+
+        Parameters
+        ----------
+        board : chess.Board
+            Position the info is about
+        info : chess.engine.InfoDict, optional
+            Info from the engine, with a score and a line
+        """
+        self.info = info
+        if info is None:
+            self.bar.set_height(0.5)
+            self.label.set_text("")
+            self.arrow.set_verts([])
+            return
+
+        score = info["score"].white()
+        self.bar.set_height(score.wdl().expectation())
+        if score.is_mate():
+            self.label.set_text(f"#{score.mate()}")
+        else:
+            self.label.set_text(f"{score.score() / 100:+.1f}")
+
+        move = info["pv"][0]
+        self.arrow.set_verts(
+            _arrow_polygons(
+                np.array([move.from_square]),
+                np.array([move.to_square]),
+                np.array([0.08]),
+            )
+        )
+
+    def draw(self):
+        """
+        Draws the animated artists
+        """
+        self.bar_ax.draw_artist(self.bar)
+        self.bar_ax.draw_artist(self.label)
+        self.ax.draw_artist(self.arrow)
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import chess
+
+from chessplotlib.plot import (
+    SYMBOLS,
+    make_checkers,
+    _setup_board,
+    _setup_ticks,
+    _piece_text,
+)
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
+
+class BoardArtist:
+    r"""
+    Persistent board that only updates the squares that change.
+
+    The grid, the checkers and one text slot per square are created once when
+    the artist is constructed. Calling `set_board` compares the new position
+    against the last one drawn and only touches the slots of squares whose
+    piece changed, so stepping through a game modifies a handful of artists
+    per move instead of rebuilding the whole board.
+
+    Attributes
+    ----------
+    ax : plt.Axes
+        Axes the board is drawn on
+    board : chess.Board
+        The last board drawn, None if no board has been set
+    grid : List[matplotlib.lines.Line2D]
+        The grid lines of the board
+    checkers : matplotlib.image.AxesImage
+        The checker background, None if checkers were disabled
+    squares : List[matplotlib.text.Text]
+        One text slot for each square, indexed by chess.Square
+
+    Examples
+    --------
+    >>> import chess
+    >>> from chessplotlib import BoardArtist
+    >>> import matplotlib.pyplot as plt
+    >>> board = chess.Board()
+    >>> artist = BoardArtist(plt.gca(), board)
+    >>> board.push_san("e4")
+    >>> changed = artist.set_board(board)
+    >>> len(changed)
+    2
+    """
+
+    def __init__(
+        self,
+        ax: plt.Axes,
+        board: Optional[chess.Board] = None,
+        checkers: bool = True,
+        animated: bool = False,
+    ):
+        """
+        Parameters
+        ----------
+        ax : plt.Axes
+            Axes to draw the board on
+        board : chess.Board, optional
+            Initial board to draw
+        checkers : bool, default=True
+            Whether or not to apply a checker pattern to the background.
+        animated : bool, default=False
+            Marks the piece slots as animated so they can be blitted
+        """
+        self.ax = ax
+        self.board = None
+
+        _setup_board(ax)
+        self.grid = []
+        for i in range(8):
+            self.grid.append(ax.axhline(i - 0.5, 0, 8, color="black"))
+            self.grid.append(ax.axvline(i - 0.5, 0, 8, color="black"))
+
+        _setup_ticks(ax)
+
+        self.checkers = None
+        if checkers:
+            self.checkers = make_checkers(ax)
+
+        self._pieces: Dict[chess.Square, str] = {}
+        self.squares = []
+        for square in chess.SQUARES:
+            x = chess.square_file(square)
+            y = 7 - chess.square_rank(square)
+            text = _piece_text(ax, x, y, "")
+            text.set_visible(False)
+            text.set_animated(animated)
+            self.squares.append(text)
+
+        if board is not None:
+            self.set_board(board)
+
+    def set_board(self, board: chess.Board) -> List[plt.Text]:
+        """
+        Draws a new position, only updating the squares that changed.
+
+        Parameters
+        ----------
+        board : chess.Board
+            Board to draw
+
+        Returns
+        -------
+        List[matplotlib.text.Text]
+            The slots that were modified
+        """
+        pieces = {square: piece.symbol() for square, piece in board.piece_map().items()}
+
+        changed = []
+        for square in self._pieces.keys() | pieces.keys():
+            symbol = pieces.get(square)
+            if symbol == self._pieces.get(square):
+                continue
+
+            text = self.squares[square]
+            if symbol is None:
+                text.set_visible(False)
+            else:
+                text.set_text(SYMBOLS[symbol])
+                text.set_visible(True)
+            changed.append(text)
+
+        self._pieces = pieces
+        self.board = board.copy(stack=False)
+        return changed
+
+    @property
+    def pieces(self) -> List[plt.Text]:
+        """
+        The slots that currently hold a piece
+        """
+        return [self.squares[square] for square in self._pieces]
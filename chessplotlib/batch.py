@@ -0,0 +1,180 @@
+import io
+import os
+import multiprocessing
+from typing import List, Optional, Sequence
+
+import chess
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from chessplotlib.plot import plot_board, plot_move
+from chessplotlib.cache import RenderCache, render_key
+
+# Figure, options and cache reused by every board rendered in the current
+# process
+_FIGURE = None
+_OPTIONS = None
+_CACHE = None
+
+
+def render_boards(
+    fens: Sequence[str],
+    out_dir: str,
+    moves: Optional[Sequence[str]] = None,
+    workers: int = 1,
+    chunksize: int = 64,
+    fmt: str = "png",
+    dpi: Optional[float] = None,
+    collections: bool = False,
+    cache_dir: Optional[str] = None,
+) -> List[str]:
+    r"""
+    Renders a list of positions to image files.
+
+    Positions are split into chunks and distributed across a pool of
+    processes. Each worker renders on the Agg backend and reuses a single
+    figure for all of its boards. Files are named after the position of the
+    board in `fens`, (i.e. board_0042.png), so the output order does not
+    depend on which worker rendered which board.
+
+    Parameters
+    ----------
+    fens: Sequence[str]
+        FEN strings of the boards to render.
+    out_dir: str
+        Directory to write the images to, created if missing.
+    moves: Sequence[str], optional
+        UCI moves to plot on top of each board, same length as `fens`. Empty
+        strings skip the move for that board.
+    workers: int, default=1
+        Number of processes, 1 renders in the current process.
+    chunksize: int, default=64
+        Number of boards sent to a worker at a time.
+    fmt: str, default=png
+        Image format passed to savefig.
+    dpi: float, optional
+        Resolution of the images, defaults to the figure dpi.
+    collections: bool, default=False
+        Whether or not to draw the grid and pieces as collections.
+    cache_dir: str, optional
+        Directory of a `RenderCache` disk tier shared by the workers. Boards
+        rendered before with the same options are copied from the cache.
+
+    Returns
+    -------
+    List[str]
+        Paths of the written images, in the same order as `fens`.
+
+    Examples
+    --------
+    >>> from chessplotlib.batch import render_boards
+    >>> fens = open("test/boards.txt").read().split("\n")[:-1]
+    >>> paths = render_boards(fens, "out", workers=4)
+    """
+    if moves is not None and len(moves) != len(fens):
+        raise ValueError("Expected one move per board")
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    width = len(str(max(len(fens) - 1, 0)))
+    tasks = [
+        (
+            fen,
+            None if moves is None else moves[i],
+            os.path.join(out_dir, f"board_{i:0{width}d}.{fmt}"),
+        )
+        for (i, fen) in enumerate(fens)
+    ]
+    options = (fmt, dpi, collections, cache_dir)
+
+    if workers == 1:
+        _init_worker(*options)
+        return [_render_task(task) for task in tasks]
+
+    with multiprocessing.Pool(workers, _init_worker, options) as pool:
+        return list(pool.imap(_render_task, tasks, chunksize=chunksize))
+
+
+def read_lines(path: str) -> List[str]:
+    """
+    Reads a file with one entry per line, (i.e. test/boards.txt)
+
+    Parameters
+    ----------
+    path: str
+        Path to the file
+
+    Returns
+    -------
+    List[str]
+        Stripped lines, skipping trailing empty lines
+    """
+    with open(path, "r") as f:
+        lines = [l.rstrip() for l in f.readlines()]
+
+    while lines and lines[-1] == "":
+        lines.pop()
+
+    return lines
+
+
+def _init_worker(
+    fmt: str, dpi: Optional[float], collections: bool, cache_dir: Optional[str]
+):
+    """
+    Creates the figure reused by every board rendered in this process
+    """
+    global _FIGURE, _OPTIONS, _CACHE
+
+    _FIGURE = Figure()
+    FigureCanvasAgg(_FIGURE)
+    _FIGURE.add_subplot(1, 1, 1)
+    _OPTIONS = (fmt, dpi, collections)
+
+    _CACHE = None
+    if cache_dir is not None:
+        _CACHE = RenderCache(max_bytes=16 * 2**20, directory=cache_dir)
+
+
+def _render_task(task) -> str:
+    """
+    Renders a single board with the figure of the current process
+    """
+    fen, uci, path = task
+
+    if _CACHE is None:
+        data = _render(fen, uci)
+    else:
+        fmt, dpi, collections = _OPTIONS
+        key = render_key(
+            fen,
+            uci,
+            fmt=fmt,
+            dpi=dpi or _FIGURE.dpi,
+            figsize=list(_FIGURE.get_size_inches()),
+            collections=collections,
+        )
+        data = _CACHE.get_or_render(key, lambda: _render(fen, uci))
+
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def _render(fen: str, uci: Optional[str]) -> bytes:
+    """
+    Renders a board to encoded image bytes
+    """
+    fmt, dpi, collections = _OPTIONS
+
+    ax = _FIGURE.axes[0]
+    ax.cla()
+
+    board = chess.Board(fen)
+    plot_board(ax, board, collections=collections)
+    if uci:
+        plot_move(ax, board, chess.Move.from_uci(uci))
+
+    buffer = io.BytesIO()
+    _FIGURE.savefig(buffer, format=fmt, dpi=dpi)
+    return buffer.getvalue()
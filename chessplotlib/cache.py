@@ -0,0 +1,372 @@
+import io
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional, Union
+
+import numpy as np
+import chess
+
+Value = Union[bytes, np.ndarray]
+
+# Fraction of max_disk_bytes the disk tier is trimmed to, so eviction and
+# its directory scan only run again after a tenth of the limit is written
+_DISK_LOW_WATER = 0.9
+
+
+def render_key(
+    fen: str,
+    move: Optional[Union[str, chess.Move]] = None,
+    marks: Iterable[str] = (),
+    **style,
+) -> str:
+    r"""
+    Builds the cache key for a rendered board.
+
+    Parameters
+    ----------
+    fen: str
+        FEN of the board
+    move: str or chess.Move, optional
+        Move drawn on the board
+    marks: Iterable[str]
+        Marked squares, order does not matter
+    **style
+        Anything else that changes the output, (i.e. figsize, dpi, fmt).
+        Values must be JSON serializable.
+
+    Returns
+    -------
+    str
+        Hex digest identifying the render
+
+    Examples
+    --------
+    >>> import chess
+    >>> from chessplotlib.cache import render_key
+    >>> key = render_key(chess.STARTING_FEN, "e2e4", dpi=100, fmt="png")
+    """
+    if isinstance(move, chess.Move):
+        move = move.uci()
+
+    description = {
+        "fen": fen,
+        "move": move or None,
+        "marks": sorted(str(m) for m in marks),
+        "style": style,
+    }
+    encoded = json.dumps(description, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class RenderCache:
+    r"""
+    Two tier cache of rendered boards.
+
+    Values are either encoded image bytes or pixel arrays. The memory tier is
+    an LRU bounded by the total size of its values. The optional disk tier
+    stores one file per key under `directory` and evicts the least recently
+    used files once it grows past `max_disk_bytes`. Disk hits are promoted
+    into memory. The cache is safe to share between threads, and the disk
+    tier can be shared between processes.
+
+    Attributes
+    ----------
+    max_bytes : int
+        Size limit of the memory tier
+    directory : str
+        Directory of the disk tier, None if it is disabled
+    max_disk_bytes : int
+        Size limit of the disk tier
+    hits : int
+        Lookups found in memory or on disk
+    disk_hits : int
+        Lookups found on disk
+    misses : int
+        Lookups not found in either tier
+
+    Examples
+    --------
+    >>> import chess
+    >>> from chessplotlib.cache import RenderCache, render_key
+    >>> from chessplotlib.raster import render_array
+    >>> cache = RenderCache(max_bytes=2**26, directory="~/.cache/chessplotlib")
+    >>> key = render_key(chess.STARTING_FEN, square_size=45)
+    >>> image = cache.get_or_render(key, lambda: render_array(chess.Board()))
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 2**20,
+        directory: Optional[str] = None,
+        max_disk_bytes: int = 2**30,
+    ):
+        """
+        Parameters
+        ----------
+        max_bytes: int, default=64MiB
+            Size limit of the memory tier
+        directory: str, optional
+            Directory of the disk tier, disabled if not given
+        max_disk_bytes: int, default=1GiB
+            Size limit of the disk tier
+        """
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.directory = None
+        self._disk_bytes = 0
+        if directory is not None:
+            self.directory = os.path.expanduser(directory)
+            os.makedirs(self.directory, exist_ok=True)
+            self._disk_bytes = sum(size for (_, size, _) in self._disk_files())
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Fraction of lookups that were hits
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def memory_bytes(self) -> int:
+        """
+        Total size of the values held in memory
+        """
+        return self._memory_bytes
+
+    def stats(self) -> dict:
+        """
+        Returns the hit counts and sizes of the cache
+        """
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+        }
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Whether a key is in the memory tier, without counting a lookup
+        """
+        with self._lock:
+            return key in self._memory
+
+    def get(self, key: str) -> Optional[Value]:
+        """
+        Looks a key up in memory, then on disk.
+
+        Parameters
+        ----------
+        key: str
+            Key from `render_key`
+
+        Returns
+        -------
+        bytes or np.ndarray
+            The cached value, None on a miss
+        """
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = self._read(key)
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, value)
+            return value
+
+    def put(self, key: str, value: Value):
+        """
+        Stores a value in memory, and on disk if enabled.
+
+        Parameters
+        ----------
+        key: str
+            Key from `render_key`
+        value: bytes or np.ndarray
+            Encoded image or pixel array
+        """
+        with self._lock:
+            self._remember(key, value)
+
+        self._write(key, value)
+
+    def get_or_render(self, key: str, render: Callable[[], Value]) -> Value:
+        """
+        Returns the cached value, rendering and storing it on a miss.
+
+        Parameters
+        ----------
+        key: str
+            Key from `render_key`
+        render: Callable[[], bytes or np.ndarray]
+            Called without arguments to produce the value on a miss
+
+        Returns
+        -------
+        bytes or np.ndarray
+            The cached or rendered value
+        """
+        value = self.get(key)
+        if value is None:
+            value = render()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """
+        Empties the memory tier and resets the counters
+        """
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self.hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+
+    def _remember(self, key: str, value: Value):
+        """
+        Adds a value to the memory tier, evicting old ones, lock must be held
+        """
+        size = _size(value)
+        if size > self.max_bytes:
+            return
+
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= _size(old)
+
+        self._memory[key] = value
+        self._memory_bytes += size
+
+        while self._memory_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= _size(evicted)
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, key[:2], key + suffix)
+
+    def _read(self, key: str) -> Optional[Value]:
+        if self.directory is None:
+            return None
+
+        for suffix in (".bin", ".npy"):
+            path = self._path(key, suffix)
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except OSError:
+                continue
+
+            # Reads count as use for the least recently used eviction
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+            if suffix == ".npy":
+                return np.load(io.BytesIO(data))
+            return data
+
+        return None
+
+    def _write(self, key: str, value: Value):
+        if self.directory is None:
+            return
+
+        if isinstance(value, np.ndarray):
+            path = self._path(key, ".npy")
+            buffer = io.BytesIO()
+            np.save(buffer, value)
+            data = buffer.getvalue()
+        else:
+            path = self._path(key, ".bin")
+            data = bytes(value)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # An overwritten file no longer counts towards the size
+        try:
+            replaced = os.stat(path).st_size
+        except OSError:
+            replaced = 0
+
+        # Write then rename, so other processes never read a partial file
+        temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp, "wb") as f:
+            f.write(data)
+        os.replace(temp, path)
+
+        with self._lock:
+            self._disk_bytes += len(data) - replaced
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _disk_files(self):
+        """
+        Lists the (mtime, size, path) of every file in the disk tier
+        """
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _evict_disk(self):
+        """
+        Removes the least recently used files until the disk tier is below
+        its low-water mark.
+
+        The running size only counts writes from this process, so the
+        directory is rescanned to account for other processes sharing it.
+        """
+        files = self._disk_files()
+        total = sum(size for (_, size, _) in files)
+        target = int(self.max_disk_bytes * _DISK_LOW_WATER)
+
+        for _, size, path in sorted(files):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+        self._disk_bytes = total
+
+
+def _size(value: Value) -> int:
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    return len(value)
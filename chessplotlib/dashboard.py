@@ -0,0 +1,443 @@
+import os
+import re
+import time
+import codecs
+from typing import Dict, List, Optional, Sequence
+
+import chess
+import numpy as np
+from matplotlib import rcParams
+from matplotlib.backend_bases import TimerBase
+from matplotlib.collections import PolyCollection
+from matplotlib.transforms import Bbox
+
+from chessplotlib.artist import BoardArtist
+from chessplotlib.plot import _GLYPH_SCALE, _arrow_polygons
+
+# Tokens of PGN text, whitespace between them is skipped
+_TOKEN = re.compile(
+    r'(?P<header>\[\s*(?P<name>[A-Za-z0-9_]+)\s+"(?P<value>.*)"\s*\])'
+    r"|(?P<comment>\{)"
+    r"|(?P<line>;.*|^%.*)"
+    r"|(?P<open>\()"
+    r"|(?P<close>\))"
+    r"|(?P<result>1-0|0-1|1/2-1/2|\*)"
+    r"|(?P<skip>\$\d+|\d+\.+|[?!]+)"
+    r"|(?P<san>[^\s{}();\[\]]+)",
+    re.MULTILINE,
+)
+
+
+class PGNTail:
+    r"""
+    Follows a PGN file that is being appended to, (i.e. a live broadcast).
+
+    Each call to `update` reads only the bytes added since the last call and
+    plays the new main line moves on `board`. Text at the end of the file
+    that may be incomplete, (i.e. half of a move or of a header line), is
+    held back until more of it arrives. If the file stops growing and the
+    held back text is a legal move or a result, it is shown, and taken back
+    if the token turns out to continue. Variations and comments are
+    skipped. A header after the moves starts a new game, and a file that
+    shrinks was rewritten, so it is read again from the start.
+
+    Attributes
+    ----------
+    path : str
+        Path to the PGN file
+    board : chess.Board
+        Position after the last move read
+    headers : Dict[str, str]
+        Headers of the current game
+    result : str
+        Result of the current game, "*" while it is in progress
+    errors : List[Exception]
+        Moves that could not be played, like `chess.pgn.Game.errors`
+    offset : int
+        Number of bytes of the file read so far
+
+    Examples
+    --------
+    >>> from chessplotlib.dashboard import PGNTail
+    >>> tail = PGNTail("round1/board1.pgn")
+    >>> if tail.update():
+    ...     print(tail.board.fen())
+    """
+
+    def __init__(self, path: str):
+        """
+        Parameters
+        ----------
+        path : str
+            Path to the PGN file, which may not exist yet
+        """
+        self.path = path
+        self._reset()
+
+    def update(self) -> bool:
+        """
+        Reads what was appended to the file since the last update.
+
+        Returns
+        -------
+        bool
+            Whether the board, headers or result changed
+        """
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return False
+
+        changed = False
+        if size < self.offset:
+            self._reset()
+            changed = True
+
+        if size == self.offset:
+            return self._flush() or changed
+
+        # The held back token is read again with the bytes that follow it
+        changed = self._unflush() or changed
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        self.offset += len(data)
+
+        text = self._pending + self._decoder.decode(data)
+
+        # The last line may still be written, only read it up to its last
+        # space, and wait for headers and line comments to be complete
+        start = text.rfind("\n") + 1
+        line = text[start:]
+        if line.lstrip().startswith(("[", "%")) or ";" in line:
+            end = start
+        else:
+            end = start + max(line.rfind(" "), line.rfind("\t")) + 1
+
+        self._pending = text[end:]
+        return self._consume(text[:end]) or changed
+
+    def _reset(self):
+        self.offset = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._pending = ""
+        self._in_comment = False
+        self._flushed = None
+        self._new_game()
+
+    def _new_game(self):
+        self.board = chess.Board()
+        self.headers: Dict[str, str] = {}
+        self.result = "*"
+        self.errors: List[Exception] = []
+        self._in_movetext = False
+        self._depth = 0
+
+    def _flush(self) -> bool:
+        """
+        Applies a complete move or result that is held back at the end of
+        a file that stopped growing, (i.e. a final move without a newline)
+        """
+        token = self._pending.strip()
+        if not token or self._flushed is not None or self._in_comment:
+            return False
+        if self._depth > 0:
+            return False
+
+        match = _TOKEN.fullmatch(token)
+        if match is None or match.lastgroup not in ("result", "san"):
+            return False
+
+        if match.lastgroup == "result":
+            self._flushed = (self.result, self._in_movetext)
+            self.result = token
+        else:
+            try:
+                self.board.push_san(token.rstrip("?!"))
+            except ValueError:
+                return False
+            self._flushed = (None, self._in_movetext)
+
+        self._in_movetext = True
+        return True
+
+    def _unflush(self) -> bool:
+        """
+        Takes back what `_flush` applied, the token is still pending
+        """
+        if self._flushed is None:
+            return False
+
+        result, self._in_movetext = self._flushed
+        if result is None:
+            self.board.pop()
+        else:
+            self.result = result
+        self._flushed = None
+        return True
+
+    def _consume(self, text: str) -> bool:
+        """
+        Applies complete PGN text to the current game
+        """
+        changed = False
+        pos = 0
+        while pos < len(text):
+            if self._in_comment:
+                end = text.find("}", pos)
+                if end < 0:
+                    break
+                self._in_comment = False
+                pos = end + 1
+                continue
+
+            match = _TOKEN.search(text, pos)
+            if match is None:
+                break
+            pos = match.end()
+            kind = match.lastgroup
+
+            if kind == "header":
+                if self._in_movetext:
+                    self._new_game()
+                name, value = match.group("name", "value")
+                self.headers[name] = value
+                if name == "FEN":
+                    try:
+                        self.board = chess.Board(value)
+                    except ValueError as error:
+                        self.errors.append(error)
+                changed = True
+
+            elif kind == "comment":
+                self._in_comment = True
+
+            elif kind == "open":
+                self._depth += 1
+
+            elif kind == "close":
+                self._depth = max(self._depth - 1, 0)
+
+            elif kind in ("result", "san"):
+                self._in_movetext = True
+                if self._depth > 0:
+                    continue
+
+                if kind == "result":
+                    self.result = match.group()
+                    changed = True
+                    continue
+
+                try:
+                    self.board.push_san(match.group().rstrip("?!"))
+                    changed = True
+                except ValueError as error:
+                    self.errors.append(error)
+
+        return changed
+
+
+class Dashboard:
+    r"""
+    Live grid of boards following PGN files that are being appended to.
+
+    Every file gets a subplot with a `BoardArtist`, the last move as an
+    arrow and the players and result as a title. The files are followed by
+    `PGNTail`, so each poll only reads the bytes that were appended. The
+    pieces, arrows and titles are animated artists drawn over a cached
+    background of each cell, and only the cells whose game changed are
+    redrawn and blitted. Polls run from a canvas timer at most `fps` times
+    a second, and a poll where no file grew costs one `os.stat` per file.
+
+    Canvases without an event loop are not polled, call `update` instead.
+
+    Attributes
+    ----------
+    fig : plt.Figure
+        Figure holding the boards
+    tails : List[PGNTail]
+        Followed file of each cell
+    axes : List[plt.Axes]
+        Axes of each cell
+    board_artists : List[BoardArtist]
+        Board of each cell
+    frame_time : float
+        Seconds taken by the last update that drew something
+
+    Examples
+    --------
+    >>> import glob
+    >>> import matplotlib.pyplot as plt
+    >>> from chessplotlib.dashboard import Dashboard
+    >>> fig = plt.figure(figsize=(16, 16))
+    >>> dashboard = Dashboard(fig, sorted(glob.glob("round1/*.pgn")))
+    >>> plt.show()
+    """
+
+    def __init__(
+        self,
+        fig,
+        paths: Sequence[str],
+        ncols: Optional[int] = None,
+        fps: float = 4.0,
+        checkers: bool = True,
+        color: str = "red",
+    ):
+        """
+        Parameters
+        ----------
+        fig : plt.Figure
+            Figure to add the boards to
+        paths : Sequence[str]
+            PGN files to follow, one board each
+        ncols : int, optional
+            Number of boards per row, defaults to a square grid
+        fps : float, default=4.0
+            Most polls and redraws per second
+        checkers : bool, default=True
+            Whether or not to apply a checker pattern to the background.
+        color : str, default=red
+            Color of the last move
+        """
+        self.fig = fig
+        self.tails = [PGNTail(path) for path in paths]
+        self.frame_time = 0.0
+
+        n = len(self.tails)
+        ncols = ncols or max(1, int(np.ceil(np.sqrt(n))))
+        nrows = max(1, -(-n // ncols))
+
+        self.axes = []
+        self.board_artists = []
+        self._arrows = []
+        for i in range(n):
+            ax = fig.add_subplot(nrows, ncols, i + 1)
+            artist = BoardArtist(ax, checkers=checkers, animated=True)
+            ax.set_xticks([])
+            ax.set_yticks([])
+
+            arrow = PolyCollection(
+                [], facecolors=color, edgecolors="none", zorder=4, animated=True
+            )
+            ax.add_collection(arrow, autolim=False)
+            ax.set_title("", fontsize="small").set_animated(True)
+
+            self.axes.append(ax)
+            self.board_artists.append(artist)
+            self._arrows.append(arrow)
+
+        self._regions: List[Optional[Bbox]] = [None] * n
+        self._backgrounds: list = [None] * n
+        for i in self._poll():
+            self._set_cell(i)
+
+        fig.canvas.mpl_connect("draw_event", self._on_draw)
+
+        # Canvases without an event loop cannot run the timer
+        self._timer = fig.canvas.new_timer(interval=1000 / fps)
+        if type(self._timer) is TimerBase:
+            self._timer = None
+        else:
+            self._timer.add_callback(self.update)
+            self._timer.start()
+            fig.canvas.mpl_connect("close_event", self._on_close)
+
+    def update(self) -> List[int]:
+        """
+        Reads the files and redraws the boards whose game changed.
+
+        Returns
+        -------
+        List[int]
+            Indices of the redrawn boards
+        """
+        dirty = self._poll()
+        if not dirty:
+            return dirty
+
+        start = time.perf_counter()
+        for i in dirty:
+            self._set_cell(i)
+
+        canvas = self.fig.canvas
+        if any(background is None for background in self._backgrounds):
+            canvas.draw()
+        else:
+            for i in dirty:
+                canvas.restore_region(self._backgrounds[i])
+                self._draw_cell(i)
+                canvas.blit(self._regions[i])
+            canvas.flush_events()
+
+        self.frame_time = time.perf_counter() - start
+        return dirty
+
+    def _poll(self) -> List[int]:
+        return [i for (i, tail) in enumerate(self.tails) if tail.update()]
+
+    def _set_cell(self, i: int):
+        """
+        Points the animated artists of a cell at the game of its file
+        """
+        tail = self.tails[i]
+        board = tail.board
+        self.board_artists[i].set_board(board)
+
+        polygons = np.zeros((0, 7, 2))
+        if board.move_stack:
+            move = board.peek()
+            polygons = _arrow_polygons(
+                np.array([move.from_square]),
+                np.array([move.to_square]),
+                np.array([0.1]),
+            )
+        self._arrows[i].set_verts(polygons)
+
+        white = tail.headers.get("White", "?")
+        black = tail.headers.get("Black", "?")
+        title = f"{white} - {black}"
+        if tail.result != "*":
+            title += f"  {tail.result}"
+        self.axes[i].title.set_text(title)
+
+    def _draw_cell(self, i: int):
+        ax = self.axes[i]
+        artists = self.board_artists[i].pieces + [self._arrows[i], ax.title]
+        for artist in sorted(artists, key=lambda a: a.get_zorder()):
+            ax.draw_artist(artist)
+
+    def _on_draw(self, event):
+        """
+        Recaptures the background of every cell after a full draw
+        """
+        canvas = self.fig.canvas
+        for i, ax in enumerate(self.axes):
+            # Pieces are sized to the squares, which change with the figure
+            square = ax.bbox.height / 8 * 72 / self.fig.dpi
+            for text in self.board_artists[i].squares:
+                text.set_fontsize(_GLYPH_SCALE * square)
+
+            # The cell reaches up over the title, which is clipped to it
+            title = ax.title
+            top = ax.bbox.y1 + (
+                (rcParams["axes.titlepad"] + 2 * title.get_fontsize())
+                * self.fig.dpi
+                / 72
+            )
+            # Whole pixels, so the clipped edge of the title is the same
+            # after each blit
+            x0, y0, x1, _ = ax.bbox.extents
+            y1 = min(top, self.fig.bbox.y1)
+            region = Bbox.from_extents(
+                np.floor(x0), np.floor(y0), np.ceil(x1), np.ceil(y1)
+            )
+            title.set_clip_box(region)
+            title.set_clip_on(True)
+
+            self._regions[i] = region
+            self._backgrounds[i] = canvas.copy_from_bbox(region)
+            self._draw_cell(i)
+
+    def _on_close(self, event):
+        self._timer.stop()
@@ -0,0 +1,415 @@
+import io
+import os
+import re
+import json
+import mmap
+import codecs
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import chess.pgn
+
+# Version of the sidecar index format
+INDEX_VERSION = 3
+
+# Headers kept in the index, the Seven Tag Roster
+INDEX_COLUMNS = ("Event", "Site", "Date", "Round", "White", "Black", "Result")
+
+_HEADER = re.compile(rb'^\[([A-Za-z0-9_]+)\s+"(.*)"\]\s*$')
+
+
+class PGNDatabase:
+    r"""
+    Indexed, memory-mapped access to the games of a PGN file.
+
+    The first time a file is opened, a single streaming pass records the byte
+    offset where each game starts along with the headers in `columns`. The
+    index is saved beside the PGN, (i.e. games.pgn.idx), and reused as long
+    as the PGN has not changed. Games are parsed from the memory-mapped file
+    only when they are requested.
+
+    Attributes
+    ----------
+    path : str
+        Path to the PGN file
+    offsets : np.ndarray
+        Byte offset of the start of each game, followed by the file size
+    headers : HeaderTable
+        Indexed headers of each game
+
+    Examples
+    --------
+    >>> from chessplotlib.database import PGNDatabase
+    >>> db = PGNDatabase("games.pgn")
+    >>> len(db)
+    >>> game = db[db.filter(player="Carlsen")[0]]
+    """
+
+    def __init__(
+        self,
+        path: str,
+        index_path: Optional[str] = None,
+        columns: Sequence = INDEX_COLUMNS,
+    ):
+        """
+        Parameters
+        ----------
+        path : str
+            Path to the PGN file
+        index_path : str, optional
+            Path of the sidecar index, defaults to the PGN path plus ".idx"
+        columns : Sequence[str], default=INDEX_COLUMNS
+            Headers to index, only these can be filtered on
+        """
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+
+        stat = os.stat(path)
+        index = _load_index(self.index_path, stat, tuple(columns))
+        if index is None:
+            offsets, headers = build_index(path, columns)
+            _save_index(self.index_path, stat, offsets, headers)
+        else:
+            offsets, headers = index
+
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.headers = headers
+
+        self._file = open(path, "rb")
+        self._map = None
+        if stat.st_size > 0:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self.headers)
+
+    def __getitem__(self, index: int) -> chess.pgn.Game:
+        """
+        Parses a single game from the file
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("game index out of range")
+
+        return chess.pgn.read_game(io.StringIO(self.text(index)))
+
+    def text(self, index: int) -> str:
+        """
+        Returns the PGN source of a game.
+
+        Parameters
+        ----------
+        index : int
+            Index of the game
+
+        Returns
+        -------
+        str
+            PGN text of the game
+        """
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self._map[start:end].decode("utf-8", errors="replace")
+
+    def filter(self, player: Optional[str] = None, **headers: str) -> List[int]:
+        """
+        Finds the games whose headers contain the given values.
+
+        Matching is a case insensitive substring search over the distinct
+        values of each indexed header, so no game is parsed and the work per
+        game is a lookup in a NumPy array.
+
+        Parameters
+        ----------
+        player : str, optional
+            Matches either the White or the Black header
+        **headers : str
+            Values to match by header name, (i.e. Event="World Championship"),
+            the headers must be indexed
+
+        Returns
+        -------
+        List[int]
+            Indices of the matching games
+        """
+        matches = np.ones(len(self), dtype=bool)
+        if player is not None:
+            matches &= self.headers.match("White", player) | self.headers.match(
+                "Black", player
+            )
+
+        for name, value in headers.items():
+            matches &= self.headers.match(name, value)
+
+        return np.flatnonzero(matches).tolist()
+
+    def close(self):
+        """
+        Closes the memory-mapped file
+        """
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def build_index(
+    path: str, columns: Sequence = INDEX_COLUMNS
+) -> Tuple[np.ndarray, "HeaderTable"]:
+    """
+    Finds the start of every game in a PGN file in one streaming pass.
+
+    Parameters
+    ----------
+    path : str
+        Path to the PGN file
+    columns : Sequence[str], default=INDEX_COLUMNS
+        Headers to keep
+
+    Returns
+    -------
+    Tuple[np.ndarray, HeaderTable]
+        Byte offset of each game followed by the file size, and the indexed
+        headers of each game
+    """
+    offsets = array("q")
+    categories = {name: {} for name in columns}
+    codes = {name: array("i") for name in columns}
+    for offset, game_headers in iter_games(path):
+        offsets.append(offset)
+        for name in columns:
+            value = game_headers.get(name, "")
+            codes[name].append(
+                categories[name].setdefault(value, len(categories[name]))
+            )
+
+    offsets.append(os.path.getsize(path))
+    table = HeaderTable(
+        {name: list(categories[name]) for name in columns},
+        {name: np.frombuffer(codes[name], dtype=np.int32) for name in columns},
+    )
+    return np.frombuffer(offsets, dtype=np.int64), table
+
+
+class HeaderTable(Sequence):
+    r"""
+    Indexed headers of the games of a PGN file, stored by column.
+
+    Every column keeps the distinct values of one header, and the code of
+    the value of each game in a NumPy array. The values are also kept in
+    lower case, so case insensitive matching only searches the distinct
+    values once and selects the games with a vectorized lookup. A game
+    without a header has the empty string.
+
+    Attributes
+    ----------
+    columns : Tuple[str, ...]
+        Names of the indexed headers
+    values : Dict[str, np.ndarray]
+        Distinct values of each header
+    codes : Dict[str, np.ndarray]
+        (N,) index into `values` of each game, per header
+    """
+
+    def __init__(
+        self, values: Dict[str, list], codes: Dict[str, np.ndarray], lower=None
+    ):
+        """
+        Parameters
+        ----------
+        values : Dict[str, list]
+            Distinct values of each header
+        codes : Dict[str, np.ndarray]
+            Index of the value of each game, per header
+        lower : Dict[str, np.ndarray], optional
+            Values in lower case, computed if not given
+        """
+        self.columns = tuple(values)
+        self.values = {k: np.array(v, dtype=str) for (k, v) in values.items()}
+        self.codes = codes
+        if lower is None:
+            lower = {k: np.char.lower(v) for (k, v) in self.values.items()}
+        self._lower = lower
+
+    def __len__(self) -> int:
+        return len(self.codes[self.columns[0]]) if self.columns else 0
+
+    def __getitem__(self, index: int) -> Dict[str, str]:
+        """
+        Indexed headers of one game, without the missing ones
+        """
+        headers = {}
+        for name in self.columns:
+            value = str(self.values[name][self.codes[name][index]])
+            if value:
+                headers[name] = value
+        return headers
+
+    def match(self, name: str, pattern: str) -> np.ndarray:
+        """
+        Finds the games whose header contains a value, ignoring case.
+
+        Parameters
+        ----------
+        name : str
+            Name of an indexed header
+        pattern : str
+            Value to search for
+
+        Returns
+        -------
+        np.ndarray
+            (N,) bool, True for the matching games
+        """
+        if name not in self.codes:
+            raise ValueError(f"Header {name!r} is not indexed")
+
+        hits = np.char.find(self._lower[name], pattern.lower()) >= 0
+        return hits[self.codes[name]]
+
+
+def iter_games(path: str) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """
+    Yields the byte offset and headers of each game while streaming the file.
+
+    A game starts at the first header line after movetext, or at the first
+    line of the file if it has no headers. Brace comments are tracked so
+    that a comment line starting with "[" is not mistaken for a header. A
+    byte order mark at the start of the file is ignored. Only the headers of
+    the current game are held in memory.
+
+    Parameters
+    ----------
+    path : str
+        Path to the PGN file
+
+    Yields
+    ------
+    Tuple[int, Dict[str, str]]
+        Byte offset where a game starts, and its headers
+    """
+    game = None
+
+    offset = 0
+    in_movetext = True
+    in_comment = False
+
+    with open(path, "rb") as f:
+        for line in f:
+            stripped = line.strip()
+            if offset == 0 and stripped.startswith(codecs.BOM_UTF8):
+                stripped = stripped[len(codecs.BOM_UTF8) :].strip()
+
+            if in_comment:
+                in_comment = _ends_in_comment(stripped, True)
+
+            elif stripped.startswith(b"["):
+                if in_movetext:
+                    if game is not None:
+                        yield game
+                    game = (offset, {})
+                    in_movetext = False
+
+                match = _HEADER.match(stripped)
+                if match is not None:
+                    name, value = match.groups()
+                    game[1][name.decode()] = value.decode("utf-8", "replace")
+
+            elif stripped and not stripped.startswith((b"%", b";")):
+                if game is None:
+                    game = (offset, {})
+
+                in_movetext = True
+                in_comment = _ends_in_comment(stripped, False)
+
+            offset += len(line)
+
+    if game is not None:
+        yield game
+
+
+def _ends_in_comment(line: bytes, in_comment: bool) -> bool:
+    """
+    Whether a line of movetext leaves a brace comment open
+    """
+    pos = 0
+    while True:
+        if in_comment:
+            end = line.find(b"}", pos)
+            if end < 0:
+                return True
+            pos = end + 1
+            in_comment = False
+        else:
+            start = line.find(b"{", pos)
+            if start < 0:
+                return False
+            rest = line.find(b";", pos)
+            if 0 <= rest < start:
+                return False
+            pos = start + 1
+            in_comment = True
+
+
+def _load_index(index_path: str, stat: os.stat_result, columns: Tuple[str, ...]):
+    """
+    Loads a sidecar index, None if it is missing or out of date
+    """
+    try:
+        with np.load(index_path, allow_pickle=False) as index:
+            meta = json.loads(str(index["meta"]))
+            if (
+                meta.get("version") != INDEX_VERSION
+                or meta.get("size") != stat.st_size
+                or meta.get("mtime_ns") != stat.st_mtime_ns
+                or tuple(meta.get("columns", ())) != columns
+            ):
+                return None
+
+            table = HeaderTable(
+                {name: index[f"{name}.values"] for name in columns},
+                {name: index[f"{name}.codes"] for name in columns},
+                {name: index[f"{name}.lower"] for name in columns},
+            )
+            return index["offsets"], table
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _save_index(index_path: str, stat: os.stat_result, offsets, headers):
+    """
+    Writes a sidecar index, skipped if the directory is not writable
+
+    The index is an uncompressed .npz of the offsets and of the values,
+    lower case values and codes of each column, written to a temporary file
+    and renamed so a reader never sees a partial index.
+    """
+    meta = {
+        "version": INDEX_VERSION,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "columns": list(headers.columns),
+    }
+    arrays = {"meta": np.array(json.dumps(meta)), "offsets": offsets}
+    for name in headers.columns:
+        arrays[f"{name}.values"] = headers.values[name]
+        arrays[f"{name}.lower"] = headers._lower[name]
+        arrays[f"{name}.codes"] = headers.codes[name]
+
+    temp = f"{index_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(temp, index_path)
+    except OSError:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
@@ -0,0 +1,447 @@
+from __future__ import annotations
+
+import os
+import json
+import multiprocessing
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
+
+import chess
+import chess.pgn
+import chess.polyglot
+import numpy as np
+
+from chessplotlib.aggregate import _game_ranges, _read_range
+from chessplotlib.database import PGNDatabase
+from chessplotlib.plot import plot_moves
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import PolyCollection
+
+# Version of the sidecar table format
+EXPLORER_VERSION = 1
+
+# Columns of the counts of a continuation
+EXPLORER_COLUMNS = ("games", "white", "draws", "black")
+
+# Row of counts added by a game, indexed by its result code
+_RESULT_ROWS = np.array(
+    [[1, 1, 0, 0], [1, 0, 1, 0], [1, 0, 0, 1], [1, 0, 0, 0]], dtype=np.uint32
+)
+_RESULT_CODES = {"1-0": 0, "1/2-1/2": 1, "0-1": 2}
+
+# Size in bytes of the header of the sidecar table, padded with spaces
+_HEADER_SIZE = 256
+
+
+class OpeningExplorer:
+    r"""
+    Continuations and results of every position in a PGN file.
+
+    The first time a file is opened, every main line move of every game up
+    to `max_plies` is counted by the `chess.polyglot.zobrist_hash` of the
+    position it was played from, along with the result of the game. The
+    counts are sorted by hash and saved beside the PGN, (i.e.
+    games.pgn.explorer), and memory-mapped when the PGN has not changed, so
+    a lookup is a binary search that takes a few microseconds and the table
+    is never read into memory as a whole.
+
+    Building streams the file once. It is split into chunks of `chunksize`
+    games by byte offset, which are counted by a pool of processes and
+    merged into the table as they finish.
+
+    Attributes
+    ----------
+    path : str
+        Path to the PGN file
+    keys : np.ndarray
+        (N,) sorted uint64 Zobrist hashes, one per position and move
+    moves : np.ndarray
+        (N,) uint16 moves, packed by `encode_move`
+    counts : np.ndarray
+        (N, 4) uint32 counts of each position and move, with the columns of
+        `EXPLORER_COLUMNS`
+
+    Examples
+    --------
+    >>> import chess
+    >>> from chessplotlib.explorer import OpeningExplorer
+    >>> explorer = OpeningExplorer("games.pgn", workers=4)
+    >>> moves, counts = explorer.lookup(chess.Board())
+    >>> moves[0], counts[0]
+    (Move.from_uci('e2e4'), array([5120, 2010, 1320, 1790], dtype=uint32))
+    """
+
+    def __init__(
+        self,
+        path: str,
+        index_path: Optional[str] = None,
+        max_plies: int = 40,
+        workers: int = 1,
+        chunksize: int = 256,
+        database: Optional[PGNDatabase] = None,
+    ):
+        """
+        Parameters
+        ----------
+        path : str
+            Path to the PGN file
+        index_path : str, optional
+            Path of the sidecar table, defaults to the PGN path plus
+            ".explorer"
+        max_plies : int, default=40
+            Number of moves counted from the start of each game
+        workers : int, default=1
+            Number of processes used to build the table
+        chunksize : int, default=256
+            Number of games sent to a worker at a time
+        database : PGNDatabase, optional
+            Index of the same file, to skip the scan for game offsets
+        """
+        self.path = path
+        self.index_path = index_path or path + ".explorer"
+        self.max_plies = max_plies
+
+        stat = os.stat(path)
+        table = _load_table(self.index_path, stat, max_plies)
+        if table is None:
+            table = build_explorer(path, max_plies, workers, chunksize, database)
+            _save_table(self.index_path, stat, max_plies, *table)
+
+        # Plain arrays over the same memory skip the overhead of np.memmap
+        self.keys, self.moves, self.counts = (a.view(np.ndarray) for a in table)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def lookup(
+        self, position: Union[chess.Board, int]
+    ) -> Tuple[List[chess.Move], np.ndarray]:
+        """
+        Finds the moves played from a position.
+
+        Parameters
+        ----------
+        position : chess.Board or int
+            Position, or its `chess.polyglot.zobrist_hash`
+
+        Returns
+        -------
+        Tuple[List[chess.Move], np.ndarray]
+            The moves, most played first, and their (M, 4) counts with the
+            columns of `EXPLORER_COLUMNS`
+        """
+        if isinstance(position, chess.Board):
+            position = chess.polyglot.zobrist_hash(position)
+
+        key = np.uint64(position)
+        start = self.keys.searchsorted(key, side="left")
+        end = self.keys.searchsorted(key, side="right")
+
+        counts = self.counts[start:end]
+        order = np.argsort(-counts[:, 0].astype(np.int64), kind="stable")
+        moves = [decode_move(code) for code in self.moves[start:end][order].tolist()]
+        return moves, counts[order]
+
+
+def plot_continuations(
+    ax: plt.Axes,
+    board: chess.Board,
+    explorer: OpeningExplorer,
+    top: int = 5,
+    cmap: str = "Blues",
+    **kwargs,
+) -> PolyCollection:
+    r"""
+    Draws the most played moves of a position as weighted arrows.
+
+    Parameters
+    ----------
+    ax: plt.Axes
+        Axes containing the state of the board
+    board: chess.Board
+        Position to look up
+    explorer: OpeningExplorer
+        Explorer built over a PGN file
+    top: int, default=5
+        Number of moves to draw
+    cmap: str, default=Blues
+        Colormap for the number of games
+    **kwargs
+        Passed on to `plot_moves`
+
+    Returns
+    -------
+    matplotlib.collections.PolyCollection
+        The arrows, weighted by the number of games of each move
+
+    Examples
+    --------
+    >>> import chess
+    >>> import matplotlib.pyplot as plt
+    >>> from chessplotlib import plot_board
+    >>> from chessplotlib.explorer import OpeningExplorer, plot_continuations
+    >>> explorer = OpeningExplorer("games.pgn")
+    >>> board = chess.Board()
+    >>> ax = plt.gca()
+    >>> plot_board(ax, board)
+    >>> plot_continuations(ax, board, explorer)
+    >>> plt.show()
+    """
+    moves, counts = explorer.lookup(board)
+    return plot_moves(
+        ax, board, moves[:top], weights=counts[:top, 0], cmap=cmap, **kwargs
+    )
+
+
+def build_explorer(
+    path: str,
+    max_plies: int = 40,
+    workers: int = 1,
+    chunksize: int = 256,
+    database: Optional[PGNDatabase] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Counts the moves played from every position of a PGN file.
+
+    Parameters
+    ----------
+    path : str
+        Path to the PGN file
+    max_plies : int, default=40
+        Number of moves counted from the start of each game
+    workers : int, default=1
+        Number of processes, 1 counts in the current process
+    chunksize : int, default=256
+        Number of games sent to a worker at a time
+    database : PGNDatabase, optional
+        Index of the same file, to skip the scan for game offsets
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        The keys, moves and counts of `OpeningExplorer`
+    """
+    tasks = (task + (max_plies,) for task in _game_ranges(path, chunksize, database))
+
+    if workers == 1:
+        return _fold(map(_count_moves, tasks))
+
+    with multiprocessing.Pool(workers) as pool:
+        return _fold(pool.imap_unordered(_count_moves, tasks))
+
+
+def encode_move(move: chess.Move) -> int:
+    """
+    Packs a move into 16 bits, the from and to squares and the promotion
+
+    Parameters
+    ----------
+    move : chess.Move
+        Move to pack
+
+    Returns
+    -------
+    int
+        The packed move
+    """
+    return move.from_square | move.to_square << 6 | (move.promotion or 0) << 12
+
+
+def decode_move(code: int) -> chess.Move:
+    """
+    Unpacks a move packed by `encode_move`
+
+    Parameters
+    ----------
+    code : int
+        The packed move
+
+    Returns
+    -------
+    chess.Move
+        The move
+    """
+    return chess.Move(code & 63, code >> 6 & 63, code >> 12 or None)
+
+
+class _MoveVisitor(chess.pgn.BaseVisitor):
+    """
+    Records the hash and move of every main line ply of a game up to a limit
+    """
+
+    def __init__(self, max_plies: int):
+        self.max_plies = max_plies
+        self.keys: List[int] = []
+        self.moves: List[int] = []
+        self.codes: List[int] = []
+
+    def begin_game(self):
+        self._plies = 0
+        self._result = None
+
+    def visit_header(self, tagname: str, tagvalue: str):
+        if tagname == "Result":
+            self._result = tagvalue
+
+    def begin_variation(self):
+        return chess.pgn.SKIP
+
+    def visit_move(self, board: chess.Board, move: chess.Move):
+        if self._plies < self.max_plies:
+            self.keys.append(chess.polyglot.zobrist_hash(board))
+            self.moves.append(encode_move(move))
+            self._plies += 1
+
+    def visit_result(self, result: str):
+        if self._result is None:
+            self._result = result
+
+    def end_game(self):
+        code = _RESULT_CODES.get(self._result, 3)
+        self.codes += [code] * (len(self.keys) - len(self.codes))
+
+    def result(self):
+        return True
+
+
+def _count_moves(task: Tuple[str, int, Optional[int], int]):
+    """
+    Counts the moves of the games in a byte range of a PGN file
+    """
+    path, start, end, max_plies = task
+    handle = _read_range(path, start, end)
+    visitor = _MoveVisitor(max_plies)
+    while chess.pgn.read_game(handle, Visitor=lambda: visitor) is not None:
+        pass
+
+    return _merge(
+        np.array(visitor.keys, dtype=np.uint64),
+        np.array(visitor.moves, dtype=np.uint16),
+        _RESULT_ROWS[np.array(visitor.codes, dtype=np.intp)],
+    )
+
+
+def _merge(keys: np.ndarray, moves: np.ndarray, counts: np.ndarray):
+    """
+    Sorts records by hash and move, summing the counts of repeated pairs
+    """
+    order = np.lexsort((moves, keys))
+    keys = keys[order]
+    moves = moves[order]
+    counts = counts[order]
+
+    if len(keys) == 0:
+        return keys, moves, counts.reshape(0, 4)
+
+    starts = np.flatnonzero(
+        np.concatenate([[True], (keys[1:] != keys[:-1]) | (moves[1:] != moves[:-1])])
+    )
+    return keys[starts], moves[starts], np.add.reduceat(counts, starts, axis=0)
+
+
+def _fold(partials):
+    """
+    Merges partial tables as they arrive, like the levels of an LSM tree
+
+    The sorted runs are kept on a stack, and a new run is merged with the
+    one below it while that one is no larger. Each record is then merged
+    about log2(chunks) times, so building stays near linear in the number
+    of chunks, and the runs held at once add up to at most about twice the
+    final table.
+    """
+    runs = []
+    for partial in partials:
+        runs.append(partial)
+        while len(runs) > 1 and len(runs[-2][0]) <= len(runs[-1][0]):
+            top = runs.pop()
+            runs[-1] = _merge(*(np.concatenate(a) for a in zip(runs[-1], top)))
+
+    if not runs:
+        return _empty()
+    return _merge(*(np.concatenate(a) for a in zip(*runs)))
+
+
+def _empty():
+    """
+    A table without any records
+    """
+    return (
+        np.zeros(0, dtype=np.uint64),
+        np.zeros(0, dtype=np.uint16),
+        np.zeros((0, 4), dtype=np.uint32),
+    )
+
+
+def _load_table(index_path: str, stat: os.stat_result, max_plies: int):
+    """
+    Memory-maps a sidecar table, None if it is missing or out of date
+    """
+    try:
+        with open(index_path, "rb") as f:
+            header = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+
+    if (
+        header.get("version") != EXPLORER_VERSION
+        or header.get("size") != stat.st_size
+        or header.get("mtime_ns") != stat.st_mtime_ns
+        or header.get("max_plies") != max_plies
+    ):
+        return None
+
+    # A table cut short, (i.e. by an interrupted write), is rebuilt
+    count = header["count"]
+    if os.path.getsize(index_path) != _HEADER_SIZE + 26 * count:
+        return None
+    if count == 0:
+        return _empty()
+
+    # The counts come before the moves to keep every array aligned
+    keys = _HEADER_SIZE
+    counts = keys + 8 * count
+    moves = counts + 16 * count
+    return (
+        np.memmap(index_path, "<u8", "r", offset=keys, shape=(count,)),
+        np.memmap(index_path, "<u2", "r", offset=moves, shape=(count,)),
+        np.memmap(index_path, "<u4", "r", offset=counts, shape=(count, 4)),
+    )
+
+
+def _save_table(
+    index_path: str,
+    stat: os.stat_result,
+    max_plies: int,
+    keys: np.ndarray,
+    moves: np.ndarray,
+    counts: np.ndarray,
+):
+    """
+    Writes a sidecar table, skipped if the directory is not writable
+
+    The table is a line of JSON padded to `_HEADER_SIZE` bytes, followed by
+    the raw little-endian keys, counts and moves. It is written to a
+    temporary file and renamed, so a reader never sees a partial table.
+    """
+    header = {
+        "version": EXPLORER_VERSION,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "max_plies": max_plies,
+        "count": len(keys),
+    }
+
+    temp = f"{index_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp, "wb") as f:
+            f.write(json.dumps(header).encode().ljust(_HEADER_SIZE - 1) + b"\n")
+            f.write(keys.astype("<u8").tobytes())
+            f.write(counts.astype("<u4").tobytes())
+            f.write(moves.astype("<u2").tobytes())
+        os.replace(temp, index_path)
+    except OSError:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
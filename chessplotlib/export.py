@@ -0,0 +1,154 @@
+import os
+import shutil
+import subprocess
+from typing import Iterable, Optional
+
+import numpy as np
+from PIL import Image, GifImagePlugin
+
+# Formats encoded by piping raw frames into ffmpeg
+VIDEO_FORMATS = (".mp4", ".webm", ".mkv", ".mov")
+
+
+def write_animation(
+    frames: Iterable[np.ndarray], path: str, fps: float = 2.0, loop: bool = True
+) -> int:
+    r"""
+    Encodes frames into an animated GIF or a video while they are produced.
+
+    Each frame is written to the encoder before the next one is requested,
+    so memory does not grow with the number of frames and the frames may be
+    views into a buffer that is reused, (i.e. the canvas of a figure). GIFs
+    are written by Pillow with a palette per frame. Videos are encoded by an
+    ffmpeg process that reads the raw RGBA pixels from a pipe, which requires
+    ffmpeg on the PATH. No GIF is left behind if no frame was written.
+
+    Parameters
+    ----------
+    frames: Iterable[np.ndarray]
+        (H, W, 4) uint8 RGBA frames, all the same size
+    path: str
+        Output file, the extension picks the format, (i.e. game.gif)
+    fps: float, default=2.0
+        Frames per second
+    loop: bool, default=True
+        Whether a GIF repeats forever, videos never loop
+
+    Returns
+    -------
+    int
+        Number of frames written
+
+    Examples
+    --------
+    >>> from chessplotlib.export import write_animation
+    >>> write_animation(viewer.frames(), "game.gif", fps=2)
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".gif":
+        writer = _GifWriter(path, fps, loop)
+    elif extension in VIDEO_FORMATS:
+        writer = _FFmpegWriter(path, fps)
+    else:
+        raise ValueError(f"Unsupported animation format: {extension!r}")
+
+    count = 0
+    try:
+        for frame in frames:
+            writer.write(frame)
+            count += 1
+    finally:
+        writer.close()
+
+    return count
+
+
+class _GifWriter:
+    """
+    Appends frames to a GIF file one at a time
+    """
+
+    def __init__(self, path: str, fps: float, loop: bool):
+        self.duration = round(1000 / fps)
+        self.loop = loop
+        self.path = path
+        self._file = open(path, "wb")
+        self._started = False
+
+    def write(self, frame: np.ndarray):
+        image = Image.fromarray(np.ascontiguousarray(frame[..., :3]))
+
+        # Every frame gets its own palette, so colors that first appear late
+        # in the game, (i.e. a capture), are kept
+        indexed = image.quantize(256, dither=Image.Dither.NONE)
+
+        if not self._started:
+            info = {"loop": 0} if self.loop else {}
+            header, _ = GifImagePlugin.getheader(indexed, info=info)
+            self._file.writelines(header)
+            self._started = True
+
+        data = GifImagePlugin.getdata(
+            indexed, duration=self.duration, include_color_table=True
+        )
+        self._file.writelines(data)
+
+    def close(self):
+        # Without a frame there is no header, and a trailer alone is not a GIF
+        if self._started:
+            self._file.write(b";")
+        self._file.close()
+        if not self._started:
+            os.remove(self.path)
+
+
+class _FFmpegWriter:
+    """
+    Pipes raw frames into an ffmpeg process
+    """
+
+    def __init__(self, path: str, fps: float):
+        self.path = path
+        self.fps = fps
+        self._process: Optional[subprocess.Popen] = None
+
+        self._ffmpeg = shutil.which("ffmpeg")
+        if self._ffmpeg is None:
+            raise RuntimeError(f"ffmpeg is required to export {path}, use .gif")
+
+    def write(self, frame: np.ndarray):
+        if self._process is None:
+            height, width = frame.shape[:2]
+            command = [
+                self._ffmpeg,
+                "-y",
+                "-loglevel",
+                "error",
+                "-f",
+                "rawvideo",
+                "-pix_fmt",
+                "rgba",
+                "-s",
+                f"{width}x{height}",
+                "-r",
+                str(self.fps),
+                "-i",
+                "-",
+                # Most players need even dimensions and 4:2:0 chroma
+                "-vf",
+                "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+                "-pix_fmt",
+                "yuv420p",
+                self.path,
+            ]
+            self._process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+        self._process.stdin.write(np.ascontiguousarray(frame).data)
+
+    def close(self):
+        if self._process is None:
+            return
+
+        self._process.stdin.close()
+        if self._process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed to encode {self.path}")
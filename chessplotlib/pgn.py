@@ -1,9 +1,173 @@
-import copy
+import time
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Iterator, List, Optional
 
 import numpy as np
 import chess.pgn
+from matplotlib.figure import Figure
+from matplotlib.backend_bases import TimerBase
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 
 from chessplotlib import plot_board, plot_move
+from chessplotlib.artist import BoardArtist
+from chessplotlib.cache import RenderCache, render_key
+
+
+class NodeBoards(Sequence):
+    r"""
+    Sequence of the boards along one line of a game tree, computed on demand.
+
+    The line is a list of `chess.pgn.GameNode`, starting at the game and
+    following one child at each step. Recently used boards are cached per
+    node in a bounded LRU cache, which a line created with `branch` shares.
+    A board is computed by replaying moves from the nearest cached node
+    before it, so after switching to a sibling variation only the moves
+    after the branch point are replayed. A replay also keeps every
+    `checkpoint`-th board it passes apart from the LRU cache, where it is
+    never evicted, so once a line has been replayed any ply costs at most
+    `checkpoint` pushes.
+
+    Boards are copied without their move stack, so the `move_stack` of a
+    returned board only holds the moves since the node it was replayed
+    from. The full history of the board at `index` is `moves[:index]`.
+
+    Attributes
+    ----------
+    nodes : List[chess.pgn.GameNode]
+        Nodes of the line, the game first
+    moves : List[chess.Move]
+        Moves leading to each node after the first
+    checkpoint : int
+        Number of plies between boards cached during a replay
+    cache_size : int
+        Number of boards kept
+
+    Examples
+    --------
+    >>> import chess.pgn
+    >>> from chessplotlib.pgn import NodeBoards
+    >>> game = chess.pgn.read_game(open("example.pgn", "r"))
+    >>> boards = NodeBoards([game] + list(game.mainline()))
+    >>> sideline = boards.branch(3, game.next().next().next().variations[1])
+    """
+
+    def __init__(
+        self,
+        nodes: List[chess.pgn.GameNode],
+        checkpoint: int = 32,
+        cache_size: int = 256,
+        cache: Optional[OrderedDict] = None,
+        checkpoints: Optional[dict] = None,
+    ):
+        """
+        Parameters
+        ----------
+        nodes : List[chess.pgn.GameNode]
+            Nodes of the line, the game first
+        checkpoint : int, default=32
+            Number of plies between boards cached during a replay
+        cache_size : int, default=256
+            Number of boards kept
+        cache : OrderedDict, optional
+            Cache of another line of the same game to share
+        checkpoints : dict, optional
+            Checkpoint boards of another line of the same game to share
+        """
+        self.nodes = nodes
+        self.moves = [node.move for node in nodes[1:]]
+        self.checkpoint = checkpoint
+        self.cache_size = cache_size
+        self._cache = OrderedDict() if cache is None else cache
+        self._checkpoints = {} if checkpoints is None else checkpoints
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("board index out of range")
+
+        node = self.nodes[index]
+        board = self._cache.get(node)
+        if board is not None:
+            self._cache.move_to_end(node)
+            return board
+
+        board = self._checkpoints.get(node)
+        if board is not None:
+            return board
+
+        return self._replay(index)
+
+    def branch(self, index: int, node: chess.pgn.GameNode) -> "NodeBoards":
+        """
+        Returns the line that follows `node` after the first `index` nodes.
+
+        Parameters
+        ----------
+        index : int
+            Number of nodes kept from this line, `node` must be a child of
+            the last one
+        node : chess.pgn.GameNode
+            Node the new line continues with, followed by its main line
+
+        Returns
+        -------
+        NodeBoards
+            The new line, sharing the caches of this one
+        """
+        nodes = self.nodes[:index] + [node] + list(node.mainline())
+        return NodeBoards(
+            nodes, self.checkpoint, self.cache_size, self._cache, self._checkpoints
+        )
+
+    def _replay(self, index: int) -> chess.Board:
+        """
+        Replays the moves from the nearest cached node, caching the result
+        """
+        start = index
+        while start > 0 and self._find(self.nodes[start]) is None:
+            start -= 1
+
+        board = self._find(self.nodes[start])
+        if board is None:
+            board = self.nodes[0].board()
+            self._checkpoints[self.nodes[0]] = board
+        if start == index:
+            return board
+
+        board = board.copy(stack=False)
+        for ply in range(start + 1, index):
+            board.push(self.moves[ply - 1])
+            if ply % self.checkpoint == 0 and self.nodes[ply] not in self._checkpoints:
+                self._checkpoints[self.nodes[ply]] = board.copy(stack=False)
+
+        board.push(self.moves[index - 1])
+        if index % self.checkpoint == 0:
+            self._checkpoints[self.nodes[index]] = board
+        else:
+            self._remember(self.nodes[index], board)
+        return board
+
+    def _find(self, node: chess.pgn.GameNode) -> Optional[chess.Board]:
+        """
+        Looks a node up in both caches without counting it as a use
+        """
+        board = self._cache.get(node)
+        return self._checkpoints.get(node) if board is None else board
+
+    def _remember(self, node: chess.pgn.GameNode, board: chess.Board):
+        self._cache[node] = board
+        self._cache.move_to_end(node)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
 
 
 class PGNViewer:
@@ -12,21 +176,62 @@ class PGNViewer:
 
     This class wraps a figure with key bindings to move between the moves in
     the game. Left and right arrows will increment the current move number, q
-    will exit. This class can easily be inherited to create new visualizers by
-    overloading the render function.
+    will exit. Up and down switch the next move to the previous or next
+    variation played from the current position, and the viewer then follows
+    the main line of that variation. This class can easily be inherited to
+    create new visualizers by overloading the render function.
+
+    With `blit=True` the grid, checkers and tick labels are drawn once and
+    cached as a background image. On each key press only the artists created
+    by `render`, plus the pieces of the board, are redrawn on top of that
+    background. Overloaded render functions work in both modes.
+
+    In blit mode a `RenderCache` can be passed to keep the pixels of each
+    rendered move. Revisited moves are then drawn from the cache with a
+    single image blit, skipping render entirely. Cached frames are keyed by
+    the board, move, viewer class and axes size, so a render override that
+    depends on anything else should not be used with a cache.
+
+    Key presses only move the target move number, and the figure is redrawn
+    from a zero delay timer, so a burst of presses from a held key collapses
+    into a single draw of the latest move. Canvases without an event loop
+    redraw on every press. With `prefetch`, a background thread renders the
+    moves around the current one off screen into the cache, so that
+    stepping to a neighbouring move is a single blit. The off screen frames
+    are drawn by a plain `PGNViewer`, so prefetching requires the default
+    render function.
+
+    With an `EngineAnalysis`, each move the viewer lands on is sent to the
+    engine, which runs in the background and cancels the analysis of the
+    previous move. An eval bar beside the board and the best move arrow
+    are updated from a timer as the engine reports deeper results, and
+    revisited positions are shown from the cache of the analysis at once.
+    The overlay is not part of the cached frames or exports.
 
     Attributes
     ----------
-    boards : List[chess.Board]
-        List of all the boards in the game.
+    boards : NodeBoards
+        Sequence of the boards along the current line, computed when accessed.
     moves : List[chess.Move]
-        List of all the moves in the game.
+        List of the moves along the current line.
     move_num : int
         Current Move number
     ax : plt.Axes
         Axes being plotted on
     fig : plt.Figure
         Figure being plotted on
+    blit : bool
+        Whether the viewer redraws with blitting
+    board_artist : BoardArtist
+        Persistent board used in blit mode, None otherwise
+    cache : RenderCache
+        Cache of rendered frames, None if disabled
+    frame_time : float
+        Seconds taken by the last redraw
+    analysis : EngineAnalysis
+        Engine analysing the current move, None if disabled
+    overlay : AnalysisOverlay
+        Eval bar and best move drawn from the analysis, None if disabled
 
     Examples
     ---------
@@ -39,7 +244,17 @@ class PGNViewer:
     >>> plt.show()
     """
 
-    def __init__(self, fig, ax, game):
+    def __init__(
+        self,
+        fig,
+        ax,
+        game,
+        blit=False,
+        cache=None,
+        prefetch=0,
+        show_frame_time=False,
+        analysis=None,
+    ):
         """
         Parameters
         ----------
@@ -49,23 +264,147 @@ class PGNViewer:
             Current axis
         game : chess.pgn.Game
             A loaded PGN game file
+        blit : bool, default=False
+            Redraw only the pieces and moves on top of a cached background
+        cache : RenderCache, optional
+            Cache for the pixels of rendered moves, requires blit
+        prefetch : int, default=0
+            Number of moves on each side of the current one to render ahead
+            of time, requires blit and creates a cache if none is given
+        show_frame_time : bool, default=False
+            Write the time of the last redraw in the corner of the figure
+        analysis : EngineAnalysis, optional
+            Engine to show an eval bar and the best move from
         """
-
-        board = game.board()
-        boards = [copy.copy(board)]
-        self.moves = list(game.mainline_moves())
-        for move in self.moves:
-            board.push(move)
-            boards.append(copy.copy(board))
+        if cache is not None and not blit:
+            raise ValueError("A render cache requires blit=True")
+        if prefetch and not blit:
+            raise ValueError("Prefetching requires blit=True")
+        if prefetch and type(self).render is not PGNViewer.render:
+            raise ValueError("Prefetching requires the default render")
+        if prefetch and cache is None:
+            cache = RenderCache()
 
         self.fig = fig
         self.ax = ax
-        self.boards = boards
-        self.move_num = 0
+        self._load(game)
+        self.blit = blit
+        self.cache = cache
+
+        self.board_artist = None
+        self._background = None
+        self._dynamic = []
+        self._frame = None
+        self._stale = False
+        self.frame_time = 0.0
+
+        self._frame_time_text = None
+        if show_frame_time:
+            self._frame_time_text = self.fig.text(
+                0.01, 0.01, "", fontsize="small", animated=blit
+            )
+
+        # Redraws wait for the event loop so that repeated presses coalesce,
+        # unless the canvas has no event loop to run a timer
+        self._redraw_pending = False
+        self._timer = self.fig.canvas.new_timer(interval=0)
+        if type(self._timer) is TimerBase:
+            self._timer = None
+        else:
+            self._timer.single_shot = True
+            self._timer.add_callback(self._on_timer)
+
+        self.analysis = analysis
+        self.overlay = None
+        self._analysis_timer = None
+        if analysis is not None:
+            # Deferred, chess.engine and asyncio are only needed with an engine
+            from chessplotlib.analysis import AnalysisOverlay
+
+            self.overlay = AnalysisOverlay(self.ax, animated=blit)
+            self._request_analysis()
+
+            # Results arrive on the thread of the engine, they are picked up
+            # by a timer since matplotlib must only be used from this one
+            timer = self.fig.canvas.new_timer(interval=100)
+            if type(timer) is not TimerBase:
+                self._analysis_timer = timer
+                timer.add_callback(self._on_analysis_timer)
+                timer.start()
+
+        self._prefetcher = None
+        if prefetch:
+            self._prefetcher = _Prefetcher(self, prefetch)
+            self._prefetcher.start()
+
+        if self._prefetcher is not None or self._analysis_timer is not None:
+            self.fig.canvas.mpl_connect("close_event", self._on_close)
+
+        if self.blit:
+            self.board_artist = BoardArtist(self.ax, animated=True)
+            self._frame = self.fig.figimage(
+                np.zeros((1, 1, 4), dtype=np.uint8), animated=True, zorder=10
+            )
+            self._render_dynamic()
+            self.fig.canvas.mpl_connect("draw_event", self._on_draw)
+        else:
+            self.render(self.ax, self.move_num, self.boards, self.moves)
 
-        self.render(self.ax, self.move_num, self.boards, self.moves)
         self.fig.canvas.mpl_connect("key_press_event", self._press)
 
+    def set_game(self, game):
+        """
+        Switches the viewer to a different game, starting at its first move.
+
+        Parameters
+        ----------
+        game : chess.pgn.Game
+            A loaded PGN game file
+        """
+        self._load(game)
+        self._redraw()
+
+    def _load(self, game):
+        self.game = game
+        self.boards = NodeBoards([game] + list(game.mainline()))
+        self.moves = self.boards.moves
+        self.move_num = 0
+
+    def _set_line(self, nodes: List[chess.pgn.GameNode]):
+        """
+        Follows another line of the current game, keeping the cached boards
+        """
+        if list(nodes) == self.boards.nodes:
+            return
+
+        boards = self.boards
+        self.boards = NodeBoards(
+            list(nodes),
+            boards.checkpoint,
+            boards.cache_size,
+            boards._cache,
+            boards._checkpoints,
+        )
+        self.moves = self.boards.moves
+
+    def _switch_variation(self, step: int) -> bool:
+        """
+        Replaces the next move with a sibling variation, True if it changed
+        """
+        nodes = self.boards.nodes
+        if self.move_num + 1 >= len(nodes):
+            return False
+
+        variations = nodes[self.move_num].variations
+        current = variations.index(nodes[self.move_num + 1])
+        index = min(max(current + step, 0), len(variations) - 1)
+        if index == current:
+            return False
+
+        self.boards = self.boards.branch(self.move_num + 1, variations[index])
+        self.moves = self.boards.moves
+        return True
+
     def render(self, ax, move_num, boards, moves):
         """
         Updates the plot for the next move.
@@ -85,9 +424,70 @@ class PGNViewer:
         moves : List[chess.Moves]
             List of total moves
         """
-        plot_board(ax, boards[move_num], checkers=True)
+        if self.board_artist is not None:
+            self.board_artist.set_board(boards[move_num])
+        else:
+            plot_board(ax, boards[move_num], checkers=True)
         plot_move(ax, boards[move_num], moves[move_num], piece_alpha=0.5)
 
+    def frames(self) -> Iterator[np.ndarray]:
+        """
+        Steps through every move, yielding the pixels of the figure.
+
+        The viewer must be in blit mode. Each step only redraws the pieces
+        that changed and the move on top of the background, and the frame is
+        a view of the canvas that is overwritten by the next step.
+
+        Yields
+        ------
+        np.ndarray
+            (H, W, 4) uint8 RGBA pixels of the figure
+        """
+        if not self.blit:
+            raise ValueError("Frames require blit=True")
+
+        canvas = self.fig.canvas
+        canvas.draw()
+        for move_num in range(len(self.moves)):
+            self.move_num = move_num
+            self._render_dynamic()
+            canvas.restore_region(self._background)
+            self._draw_animated()
+            yield np.asarray(canvas.buffer_rgba())
+
+    def export(self, path: str, fps: float = 2.0, dpi: Optional[float] = None):
+        """
+        Writes the game to an animated GIF or a video, one frame per move.
+
+        Frames are rendered off screen by a plain blit mode `PGNViewer`,
+        which draws the board and the move of the current line, and are
+        streamed to the encoder as they are drawn. Overrides of `render`
+        only apply on screen. See `write_animation` for the formats.
+
+        Parameters
+        ----------
+        path : str
+            Output file, (i.e. game.gif or game.mp4)
+        fps : float, default=2.0
+            Moves per second
+        dpi : float, optional
+            Resolution of the frames, defaults to the dpi of the figure
+
+        Returns
+        -------
+        int
+            Number of frames written
+        """
+        size = tuple(self.fig.get_size_inches())
+        position = tuple(self.ax.get_position().bounds)
+        viewer = _offscreen_viewer(self.game, size, dpi or self.fig.dpi, position)
+        viewer._set_line(self.boards.nodes)
+
+        # Pillow is only needed when exporting
+        from chessplotlib.export import write_animation
+
+        return write_animation(viewer.frames(), path, fps=fps)
+
     def _press(self, event):
         if event.key == "left":
             self.move_num -= 1
@@ -95,13 +495,341 @@ class PGNViewer:
         elif event.key == "right":
             self.move_num += 1
 
+        elif event.key in ("up", "down"):
+            if not self._switch_variation(-1 if event.key == "up" else 1):
+                return
+
         elif event.key == "q":
             exit()
 
         # Don't go out of the list range
         self.move_num = np.clip(self.move_num, 0, len(self.moves) - 1)
 
+        self._request_redraw()
+
+    def _request_redraw(self):
+        if self._timer is None:
+            self._redraw()
+        elif not self._redraw_pending:
+            self._redraw_pending = True
+            self._timer.start()
+
+    def _on_timer(self):
+        self._redraw_pending = False
+        self._redraw()
+
+    def update_analysis(self) -> bool:
+        """
+        Shows the latest result of the analysis of the current move.
+
+        Called from a timer on canvases with an event loop, and may be
+        called directly on other canvases.
+
+        Returns
+        -------
+        bool
+            Whether the overlay changed
+        """
+        board = self.boards[self.move_num]
+        info = self.analysis.result(board)
+        if info is self.overlay.info:
+            return False
+
+        self.overlay.set_info(board, info)
+        if not self.blit:
+            self.fig.canvas.draw_idle()
+        elif self._background is not None:
+            # The artists are behind when the last move came from the cache
+            if self._stale:
+                self._render_dynamic()
+            self._blit()
+        return True
+
+    def _request_analysis(self):
+        board = self.boards[self.move_num]
+        self.overlay.set_info(board, self.analysis.request(board))
+
+    def _on_analysis_timer(self):
+        self.update_analysis()
+
+    def _on_close(self, event):
+        if self._prefetcher is not None:
+            self._prefetcher.stop()
+        if self._analysis_timer is not None:
+            self._analysis_timer.stop()
+
+    def _redraw(self):
+        if self.analysis is not None:
+            self._request_analysis()
+
+        start = time.perf_counter()
+        self._draw_move()
+        self.frame_time = time.perf_counter() - start
+
+        if self._prefetcher is not None and self._background is not None:
+            self._prefetcher.request(self.game, self.boards.nodes, self.move_num)
+
+    def _draw_move(self):
+        if self._frame_time_text is not None:
+            self._frame_time_text.set_text(f"{self.frame_time * 1000:.1f} ms")
+
+        if self.blit:
+            key = None
+            if self.cache is not None and self._background is not None:
+                key = self._frame_key()
+                frame = self.cache.get(key)
+                if frame is not None:
+                    self._blit_frame(frame)
+                    return
+
+            self._render_dynamic()
+            self._blit(cache_key=key)
+            return
+
         self.ax.clear()
         self.render(self.ax, self.move_num, self.boards, self.moves)
+        if self.overlay is not None:
+            self.overlay.attach()
         self.fig.canvas.flush_events()
         self.fig.canvas.draw()
+
+    def _render_dynamic(self):
+        """
+        Replaces the artists created by the last render with new ones.
+
+        Every artist that render adds to the axis is marked as animated, so it
+        is left out of the cached background and drawn on each blit instead.
+        """
+        self._stale = False
+        for artist in self._dynamic:
+            artist.remove()
+
+        before = set(self.ax.get_children())
+        self.render(self.ax, self.move_num, self.boards, self.moves)
+        self._dynamic = [a for a in self.ax.get_children() if a not in before]
+
+        for artist in self._dynamic:
+            artist.set_animated(True)
+
+    def _draw_animated(self):
+        artists = self.board_artist.pieces + self._dynamic
+        for artist in sorted(artists, key=lambda a: a.get_zorder()):
+            self.ax.draw_artist(artist)
+        self._draw_frame_time()
+
+    def _draw_overlay(self):
+        if self.overlay is not None:
+            self.overlay.draw()
+
+    def _draw_frame_time(self):
+        if self._frame_time_text is not None:
+            self.fig.draw_artist(self._frame_time_text)
+
+    def _on_draw(self, event):
+        """
+        Recaptures the background after a full draw (i.e. after a resize)
+        """
+        canvas = self.fig.canvas
+        self._background = canvas.copy_from_bbox(self.fig.bbox)
+
+        # The artists are behind when the last move came from the cache
+        if self._stale:
+            self._render_dynamic()
+        self._draw_animated()
+        self._draw_overlay()
+
+        if self._prefetcher is not None:
+            self._prefetcher.request(self.game, self.boards.nodes, self.move_num)
+
+    def _frame_key(self) -> str:
+        """
+        Cache key of the pixels of the current move
+        """
+        move = None
+        if self.move_num < len(self.moves):
+            move = self.moves[self.move_num]
+
+        # Keyed by the render function, so a subclass that keeps the default
+        # render shares the frames drawn off screen by a plain viewer
+        render = type(self).render
+        return render_key(
+            self.boards[self.move_num].fen(),
+            move,
+            viewer=f"{render.__module__}.{render.__qualname__}",
+            bbox=[round(v) for v in self.ax.bbox.bounds],
+            dpi=self.fig.dpi,
+        )
+
+    def _frame_bounds(self):
+        """
+        Integer pixel bounds of the axes, (x0, y0, x1, y1) from the bottom left
+        """
+        x0, y0, x1, y1 = self.ax.bbox.extents
+        return int(np.floor(x0)), int(np.floor(y0)), int(np.ceil(x1)), int(np.ceil(y1))
+
+    def _grab_frame(self) -> np.ndarray:
+        """
+        Copies the rendered pixels of the axes
+        """
+        buffer = np.asarray(self.fig.canvas.buffer_rgba())
+        height = buffer.shape[0]
+        x0, y0, x1, y1 = self._frame_bounds()
+        return buffer[height - y1 : height - y0, x0:x1].copy()
+
+    def _blit_frame(self, frame: np.ndarray):
+        """
+        Draws cached pixels over the background with a single blit
+        """
+        canvas = self.fig.canvas
+        x0, y0, _, _ = self._frame_bounds()
+
+        self._frame.set_data(frame)
+        self._frame.ox = x0
+        self._frame.oy = y0
+
+        canvas.restore_region(self._background)
+        self.fig.draw_artist(self._frame)
+        self._draw_overlay()
+        self._draw_frame_time()
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+        self._stale = True
+
+    def _blit(self, cache_key: Optional[str] = None):
+        canvas = self.fig.canvas
+        if self._background is None:
+            canvas.draw()
+            return
+
+        canvas.restore_region(self._background)
+        self._draw_animated()
+
+        # Cached before the analysis, which changes as results arrive
+        if cache_key is not None:
+            self.cache.put(cache_key, self._grab_frame())
+        self._draw_overlay()
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+
+
+class _Prefetcher(threading.Thread):
+    """
+    Renders the moves around the current one into the cache of a viewer.
+
+    Frames are drawn by a plain blit mode `PGNViewer` on a private Agg
+    figure with the same size, dpi and axes position, so their cache keys
+    and pixels match the ones the viewer would produce. The class of the
+    viewer is never instantiated on this thread. The nearest moves are
+    rendered first, and a new request abandons the rest of the old one.
+    """
+
+    def __init__(self, viewer: PGNViewer, plies: int):
+        super().__init__(daemon=True)
+        self.viewer = viewer
+        self.plies = plies
+        self.rendered = 0
+
+        self._condition = threading.Condition()
+        self._request = None
+        self._stopped = False
+        self._idle = threading.Event()
+        self._idle.set()
+
+        self._offscreen = None
+        self._layout = None
+
+    def request(self, game, nodes, move_num: int):
+        """
+        Starts prefetching around a move, replacing any earlier request
+        """
+        with self._condition:
+            self._request = (game, nodes, int(move_num), self._current_layout())
+            self._idle.clear()
+            self._condition.notify()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until every requested move is cached, False on a timeout
+        """
+        return self._idle.wait(timeout)
+
+    def run(self):
+        while True:
+            with self._condition:
+                while self._request is None and not self._stopped:
+                    self._idle.set()
+                    self._condition.wait()
+                if self._stopped:
+                    self._idle.set()
+                    return
+                game, nodes, center, layout = self._request
+                self._request = None
+
+            viewer = self._prepare(game, layout)
+            viewer._set_line(nodes)
+            for move_num in self._order(center, len(viewer.moves)):
+                if self._request is not None or self._stopped:
+                    break
+                self._render(viewer, move_num)
+
+    def _order(self, center: int, n: int) -> List[int]:
+        """
+        Moves within `plies` of the center, nearest first
+        """
+        order = []
+        for distance in range(1, self.plies + 1):
+            for move_num in (center + distance, center - distance):
+                if 0 <= move_num < n:
+                    order.append(move_num)
+        return order
+
+    def _current_layout(self):
+        fig = self.viewer.fig
+        return (
+            tuple(fig.get_size_inches()),
+            fig.dpi,
+            tuple(self.viewer.ax.get_position().bounds),
+        )
+
+    def _prepare(self, game, layout) -> PGNViewer:
+        """
+        Returns the off screen viewer, rebuilt if the game or layout changed
+        """
+        if self._offscreen is None or self._offscreen.game is not game:
+            self._layout = None
+
+        if layout != self._layout:
+            self._offscreen = _offscreen_viewer(game, *layout)
+            self._offscreen.fig.canvas.draw()
+            self._layout = layout
+
+        return self._offscreen
+
+    def _render(self, viewer: PGNViewer, move_num: int):
+        viewer.move_num = move_num
+        key = viewer._frame_key()
+        if key in self.viewer.cache:
+            return
+
+        viewer._render_dynamic()
+        viewer.fig.canvas.restore_region(viewer._background)
+        viewer._draw_animated()
+        self.viewer.cache.put(key, viewer._grab_frame())
+        self.rendered += 1
+
+
+def _offscreen_viewer(game, size, dpi: float, position) -> PGNViewer:
+    """
+    Plain blit mode viewer on a private Agg figure with the given layout
+
+    Agg canvases have no event loop, so the viewer starts no timers.
+    """
+    fig = Figure(figsize=size, dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes(position)
+    return PGNViewer(fig, ax, game, blit=True)
@@ -1,11 +1,30 @@
+from __future__ import annotations
+
 import copy
-from typing import Tuple
+import threading
+from typing import TYPE_CHECKING, Iterable, Optional, Sequence, Tuple, Union
 
 import chess
-import matplotlib.pyplot as plt
 import numpy as np
 
 import matplotlib.patches as patches
+from matplotlib import colormaps, rcParams
+from matplotlib.collections import LineCollection, PathCollection, PolyCollection
+from matplotlib.image import AxesImage
+from matplotlib.colors import Normalize, to_rgba
+from matplotlib.font_manager import FontProperties
+from matplotlib.path import Path
+from matplotlib.textpath import TextPath
+from matplotlib.transforms import (
+    Affine2D,
+    AffineDeltaTransform,
+    IdentityTransform,
+    ScaledTranslation,
+)
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import Colormap
 
 SYMBOLS = {
     "K": "♔",
@@ -22,11 +41,35 @@ SYMBOLS = {
     "p": "♟︎",
 }
 
+# Font size, in points, of the piece glyphs
+_FONTSIZE = 32
+
+# Font size of a glyph relative to the square, matches plot_board at its
+# default figure size
+_GLYPH_SCALE = 0.96
+
+# Grid location of every square, indexed by chess.Square
+_GRID_X = np.arange(64) % 8
+_GRID_Y = 7 - np.arange(64) // 8
+_SQUARE_INDEX = {name: square for (square, name) in enumerate(chess.SQUARE_NAMES)}
 
-def plot_board(ax: plt.Axes, board: chess.Board, checkers: bool = True):
+Square = Union[str, chess.Square]
+
+
+def plot_board(
+    ax: plt.Axes, board: chess.Board, checkers: bool = True, collections: bool = False
+):
     r"""
     Creates a board image on the specified axis.
 
+    By default every grid line and every piece is its own artist. With
+    `collections=True` the grid is drawn as a single `LineCollection` and the
+    pieces as a single `PathCollection` built from cached glyph outlines, so
+    the board is a constant handful of artists no matter how many pieces are
+    on it. The outlines are filled paths rather than hinted text, so the
+    pieces can differ from the default mode by a few anti-aliased pixels
+    along their edges.
+
     Parameters
     ----------
     ax: plt.Axes
@@ -35,6 +78,8 @@ def plot_board(ax: plt.Axes, board: chess.Board, checkers: bool = True):
         Board object to plot.
     checkers: bool, default=True
         Whether or not to apply a checker pattern to the background.
+    collections: bool, default=False
+        Whether or not to draw the grid and pieces as collections.
 
     Examples
     --------
@@ -48,25 +93,22 @@ def plot_board(ax: plt.Axes, board: chess.Board, checkers: bool = True):
 
     .. image:: ../../examples/starting_board.png
     """
-    ax.set_xlim([-0.5, 7.5])
-    ax.set_ylim([7.5, -0.5])
-    for i in range(8):
-        ax.axhline(i - 0.5, 0, 8, color="black")
-        ax.axvline(i - 0.5, 0, 8, color="black")
-
-    ax.tick_params(labeltop=True, labelright=True, length=0)
-
-    ax.set_yticks(list(reversed(list(range(8)))))
-    ax.set_xticks(list(range(8)))
+    _setup_board(ax)
+    if collections:
+        _add_grid_collection(ax)
+    else:
+        for i in range(8):
+            ax.axhline(i - 0.5, 0, 8, color="black")
+            ax.axvline(i - 0.5, 0, 8, color="black")
 
-    ax.set_yticklabels(("1", "2", "3", "4", "5", "6", "7", "8"))
-    ax.set_xticklabels(("a", "b", "c", "d", "e", "f", "g", "h"))
+    _setup_ticks(ax)
 
     if checkers:
         make_checkers(ax)
 
-    X, Y = np.meshgrid(np.arange(8), np.arange(8))
-    locs = np.stack([X.flatten(), Y.flatten()], axis=1)
+    if collections:
+        _add_piece_collection(ax, board)
+        return
 
     for square in chess.SQUARES_180:
         piece = board.piece_at(square)
@@ -74,6 +116,150 @@ def plot_board(ax: plt.Axes, board: chess.Board, checkers: bool = True):
             add_piece(ax, chess.SQUARE_NAMES[square], piece.symbol())
 
 
+def plot_board_grid(
+    fig: plt.Figure,
+    boards: Sequence[chess.Board],
+    moves: Optional[Sequence[Optional[chess.Move]]] = None,
+    ncols: Optional[int] = None,
+    titles: Optional[Sequence[str]] = None,
+    gap: int = 1,
+    checkers: bool = True,
+    linewidth: float = 0.5,
+    color: str = "red",
+) -> plt.Axes:
+    r"""
+    Draws many boards in a grid on a single axes, (i.e. a contact sheet).
+
+    Instead of one `plot_board` per subplot, the checkers of every board are
+    a single image, the grid lines of every board a single `LineCollection`,
+    all of the pieces a single `PathCollection` and all of the moves a single
+    `PolyCollection`. The number of artists does not depend on the number of
+    boards, so building the figure stays fast for hundreds of positions.
+    The pieces scale with the axes when the figure is resized.
+
+    Parameters
+    ----------
+    fig: plt.Figure
+        Figure to add the axes to
+    boards: Sequence[chess.Board]
+        Boards to plot, filled in row by row
+    moves: Sequence[chess.Move], optional
+        Move to draw on each board, same length as `boards`. None skips the
+        move for that board.
+    ncols: int, optional
+        Number of boards per row, defaults to a square grid
+    titles: Sequence[str], optional
+        Text drawn under each board, in a band one square high
+    gap: int, default=1
+        Space between boards, in squares
+    checkers: bool, default=True
+        Whether or not to apply a checker pattern to the background
+    linewidth: float, default=0.5
+        Width of the grid lines
+    color: str, default=red
+        Color of the moves
+
+    Returns
+    -------
+    plt.Axes
+        The axes holding every board, with the ticks turned off
+
+    Examples
+    --------
+    >>> import chess
+    >>> from chessplotlib import plot_board_grid
+    >>> import matplotlib.pyplot as plt
+    >>> boards = [chess.Board(fen) for fen in open("puzzles.txt")]
+    >>> fig = plt.figure(figsize=(12, 12))
+    >>> ax = plot_board_grid(fig, boards, ncols=10)
+    >>> plt.show()
+    """
+    n = len(boards)
+    if moves is not None and len(moves) != n:
+        raise ValueError("moves must have one entry per board")
+
+    ncols = ncols or max(1, int(np.ceil(np.sqrt(n))))
+    nrows = max(1, -(-n // ncols))
+    # Every row of boards gets a band of one square for the titles, so they
+    # never run into the next row however small the gap is
+    band = 0 if titles is None else 1
+    pitch = np.array([8 + gap, 8 + band + gap])
+    width = ncols * pitch[0] - gap
+    height = nrows * pitch[1] - gap
+
+    # Top left corner of each board, in squares
+    index = np.arange(n)
+    corners = np.stack([index % ncols, index // ncols], axis=-1) * pitch
+
+    ax = fig.add_subplot(1, 1, 1)
+    ax.set_axis_off()
+
+    background = np.full((height, width), np.nan)
+    if checkers:
+        X, Y = np.meshgrid(np.arange(8), np.arange(8))
+        checker = (((X + Y) % 2) + 0.3) / 2
+        for x, y in corners:
+            background[y : y + 8, x : x + 8] = checker
+    ax.imshow(background, cmap="Greys", vmax=1.0, vmin=0.0)
+
+    ax.set_xlim([-0.5, width - 0.5])
+    ax.set_ylim([height - 0.5, -0.5])
+
+    edges = np.arange(9) - 0.5
+    lines = [
+        segment
+        for (x, y) in corners
+        for e in edges
+        for segment in (
+            [(x - 0.5, y + e), (x + 7.5, y + e)],
+            [(x + e, y - 0.5), (x + e, y + 7.5)],
+        )
+    ]
+    grid = LineCollection(
+        lines, colors="black", linewidths=linewidth, capstyle="projecting", zorder=2
+    )
+    # The outer lines sit on the edge of the axes
+    grid.set_clip_on(False)
+    ax.add_collection(grid, autolim=False)
+
+    paths = []
+    offsets = []
+    for board, (x, y) in zip(boards, corners):
+        for square, piece in board.piece_map().items():
+            paths.append(GLYPH_CACHE.get(piece.symbol()))
+            offsets.append((x + _GRID_X[square], y + _GRID_Y[square] + 0.05))
+
+    # Glyphs are scaled in data units, flipped since the y axis points down
+    pieces = PathCollection(
+        paths,
+        offsets=np.reshape(offsets, (-1, 2)),
+        offset_transform=ax.transData,
+        transform=(
+            Affine2D().scale(_GLYPH_SCALE, -_GLYPH_SCALE)
+            + AffineDeltaTransform(ax.transData)
+        ),
+        facecolors="black",
+        edgecolors="none",
+        zorder=3,
+    )
+    ax.add_collection(pieces, autolim=False)
+
+    if moves is not None:
+        drawn = [i for (i, move) in enumerate(moves) if move]
+        from_squares = np.array([moves[i].from_square for i in drawn], dtype=np.int64)
+        to_squares = np.array([moves[i].to_square for i in drawn], dtype=np.int64)
+        shafts = np.full(len(drawn), 0.1)
+        polygons = _arrow_polygons(from_squares, to_squares, shafts)
+        polygons += corners[drawn][:, None, :]
+        arrows = PolyCollection(polygons, facecolors=color, edgecolors="none", zorder=4)
+        ax.add_collection(arrows, autolim=False)
+
+    for title, (x, y) in zip(titles or [], corners):
+        ax.text(x + 3.5, y + 8, title, ha="center", va="center", fontsize="small")
+
+    return ax
+
+
 def plot_move(
     ax: plt.Axes,
     board: chess.Board,
@@ -113,8 +299,7 @@ def plot_move(
     from_square = _from_square(move)
     to_square, promotion = _to_square(move)
 
-    square = chess.SQUARE_NAMES.index(from_square)
-    from_piece = board.piece_at(square)
+    from_piece = board.piece_at(move.from_square)
 
     if promotion == "":
         to_piece = from_piece
@@ -125,7 +310,94 @@ def plot_move(
     add_piece(ax, to_square, to_piece.symbol(), alpha=piece_alpha, color=piece_color)
 
 
-def mark_square(ax: plt.Axes, square: str):
+def plot_moves(
+    ax: plt.Axes,
+    board: chess.Board,
+    moves: Optional[Iterable[chess.Move]] = None,
+    weights: Optional[Iterable[float]] = None,
+    cmap: Union[str, Colormap] = "Reds",
+    color: str = "red",
+    alpha: float = 1.0,
+    width: float = 0.05,
+) -> PolyCollection:
+    r"""
+    Draws many moves at once as a single collection of arrows.
+
+    The outline of every arrow is computed at once with NumPy and added as
+    one `PolyCollection`, so drawing all of the legal moves costs about as
+    much as drawing one. With `weights`, (i.e. an engine policy), each arrow
+    gets its color from `cmap`, and its width and alpha grow with its weight.
+
+    Parameters
+    ----------
+    ax: plt.Axes
+        Axes containing the state of the board
+    board: chess.Board
+        Board the moves are played on
+    moves: Iterable[chess.Move], optional
+        Moves to draw, defaults to every legal move on the board
+    weights: Iterable[float], optional
+        One value per move, scaled from min(0, weights) to max(weights)
+    cmap: str or Colormap, default=Reds
+        Colormap for the weights
+    color: str, default=red
+        Color of every arrow when there are no weights
+    alpha: float, default=1.0
+        Alpha of the arrow with the largest weight
+    width: float, default=0.05
+        Shaft width, in squares, of the arrow with the largest weight
+
+    Returns
+    -------
+    matplotlib.collections.PolyCollection
+        The arrows
+
+    Examples
+    --------
+    >>> import chess
+    >>> from chessplotlib import plot_board, plot_moves
+    >>> import matplotlib.pyplot as plt
+    >>> board = chess.Board()
+    >>> ax = plt.gca()
+    >>> plot_board(ax, board)
+    >>> plot_moves(ax, board)
+    >>> plt.show()
+    """
+    if moves is None:
+        moves = board.legal_moves
+    moves = list(moves)
+
+    from_squares = np.array([m.from_square for m in moves], dtype=np.int64)
+    to_squares = np.array([m.to_square for m in moves], dtype=np.int64)
+
+    scale = np.ones(len(moves))
+    colors = [to_rgba(color, alpha)]
+    if weights is not None:
+        weights = np.asarray(list(weights), dtype=float)
+        if weights.shape != (len(moves),):
+            raise ValueError("weights must have one value per move")
+        if len(moves) and weights.max() > min(weights.min(), 0):
+            scale = Normalize(min(weights.min(), 0), weights.max())(weights)
+
+        # Weaker moves are fainter, but never invisible
+        # get_cmap takes names and Colormap objects, like plt.get_cmap
+        colors = colormaps.get_cmap(cmap)(scale)
+        colors[:, 3] = alpha * (0.2 + 0.8 * scale)
+
+    # Weaker moves are also thinner
+    shaft = width * (0.3 + 0.7 * scale)
+
+    arrows = PolyCollection(
+        _arrow_polygons(from_squares, to_squares, shaft),
+        facecolors=colors,
+        edgecolors="none",
+        zorder=4,
+    )
+    ax.add_collection(arrows, autolim=False)
+    return arrows
+
+
+def mark_square(ax: plt.Axes, square: Square):
     r"""
     Highlights a square in red.
 
@@ -133,8 +405,8 @@ def mark_square(ax: plt.Axes, square: str):
     ----------
     ax: plt.Axes
         Axes containing the state of the board
-    square: str
-        String name for square, (i.e. e1)
+    square: str or chess.Square
+        Name or index of the square, (i.e. "e1" or chess.E1)
 
     Examples
     --------
@@ -165,6 +437,115 @@ def mark_square(ax: plt.Axes, square: str):
     ax.add_patch(rect)
 
 
+def mark_squares(
+    ax: plt.Axes,
+    squares: Union[chess.SquareSet, int, np.ndarray, Iterable[Square]],
+    color: str = "r",
+    linewidth: float = 2,
+) -> PolyCollection:
+    r"""
+    Highlights a set of squares as a single collection.
+
+    Parameters
+    ----------
+    ax: plt.Axes
+        Axes containing the state of the board
+    squares: chess.SquareSet, int, np.ndarray or Iterable[str]
+        A square set, (i.e. board.attacks(chess.E4)), an integer bitboard, a
+        boolean mask of 64 values indexed by chess.Square, or an iterable of
+        square names or indices
+    color: str, default=r
+        Color of the outlines
+    linewidth: float, default=2
+        Width of the outlines
+
+    Returns
+    -------
+    matplotlib.collections.PolyCollection
+        The outlines
+
+    Examples
+    --------
+    >>> import chess
+    >>> from chessplotlib import plot_board, mark_squares
+    >>> import matplotlib.pyplot as plt
+    >>> board = chess.Board()
+    >>> ax = plt.gca()
+    >>> plot_board(ax, board)
+    >>> mark_squares(ax, board.attacks(chess.G1))
+    >>> plt.show()
+    """
+    indices = np.flatnonzero(_square_mask(squares))
+    x = _GRID_X[indices][:, None] + np.array([-0.5, 0.5, 0.5, -0.5])
+    y = _GRID_Y[indices][:, None] + np.array([-0.5, -0.5, 0.5, 0.5])
+
+    outlines = PolyCollection(
+        np.stack([x, y], axis=-1),
+        linewidths=linewidth,
+        edgecolors=color,
+        facecolors="none",
+        zorder=3,
+    )
+    ax.add_collection(outlines, autolim=False)
+    return outlines
+
+
+def plot_heatmap(
+    ax: plt.Axes,
+    values: np.ndarray,
+    cmap: str = "viridis",
+    alpha: float = 0.6,
+    vmin: Optional[float] = None,
+    vmax: Optional[float] = None,
+) -> AxesImage:
+    r"""
+    Shades every square by a value, underneath the pieces.
+
+    The 64 values are drawn as one image above the checkers and below the
+    grid and pieces. NaN values leave their square unshaded.
+
+    Parameters
+    ----------
+    ax: plt.Axes
+        Axes containing the state of the board
+    values: np.ndarray
+        64 values indexed by chess.Square, (i.e. attack counts or evals)
+    cmap: str, default=viridis
+        Colormap for the values
+    alpha: float, default=0.6
+        Alpha of the shading
+    vmin: float, optional
+        Value at the bottom of the colormap, defaults to the minimum
+    vmax: float, optional
+        Value at the top of the colormap, defaults to the maximum
+
+    Returns
+    -------
+    matplotlib.image.AxesImage
+        The heatmap, which can be passed to `plt.colorbar`
+
+    Examples
+    --------
+    >>> import chess
+    >>> import numpy as np
+    >>> from chessplotlib import plot_board, plot_heatmap
+    >>> import matplotlib.pyplot as plt
+    >>> board = chess.Board()
+    >>> attackers = [len(board.attackers(chess.WHITE, s)) for s in chess.SQUARES]
+    >>> ax = plt.gca()
+    >>> plot_board(ax, board)
+    >>> plot_heatmap(ax, np.array(attackers), cmap="Reds")
+    >>> plt.show()
+    """
+    values = np.asarray(values, dtype=float)
+    if values.shape != (64,):
+        raise ValueError("values must have one value per square")
+
+    # Rows of the image run from the eighth rank down to the first
+    grid = values.reshape(8, 8)[::-1]
+    return ax.imshow(grid, cmap=cmap, alpha=alpha, vmin=vmin, vmax=vmax, zorder=1)
+
+
 def mark_move(ax: plt.Axes, move: chess.Move):
     """
     Marks the two squares used in a move
@@ -191,14 +572,24 @@ def make_checkers(ax: plt.Axes):
     ----------
     ax: plt.Axes
         Axes to add checkers to
+
+    Returns
+    -------
+    matplotlib.image.AxesImage
+        The checker image
     """
     X, Y = np.meshgrid(np.arange(8), np.arange(8))
     checker = (((X + Y) % 2) + 0.3) / 2
-    ax.imshow(checker, cmap="Greys", vmax=1.0, vmin=0.0)
+    return ax.imshow(checker, cmap="Greys", vmax=1.0, vmin=0.0)
 
 
 def add_piece(
-    ax: plt.Axes, square: str, piece: str, alpha: float = 1.0, color: str = "black"
+    ax: plt.Axes,
+    square: Square,
+    piece: str,
+    alpha: float = 1.0,
+    color: str = "black",
+    glyph: bool = False,
 ):
     """
     Adds a pieces to the board.
@@ -209,32 +600,47 @@ def add_piece(
     ----------
     ax: plt.Axes
         Axes containing board
-    square: str
-        String representing the square (i.e. "e1")
+    square: str or chess.Square
+        Name or index of the square (i.e. "e1" or chess.E1)
     piece: str
         String symbol for the piece (i.e. "P")
     alpha: float
         Alpha for the piece, controls piece visibility
     color: str
         black or white, controls the color of the piece
+    glyph: bool, default=False
+        Draw the piece as a patch from `GLYPH_CACHE` instead of as text
+
+    Returns
+    -------
+    matplotlib.text.Text or matplotlib.patches.PathPatch
+        The artist drawing the piece
     """
     x, y = _square_to_grid(square)
-    ax.text(
-        x,
-        y + 0.05,
-        SYMBOLS[piece],
-        fontsize=32,
-        ha="center",
-        va="center",
+    if not glyph:
+        return _piece_text(ax, x, y, SYMBOLS[piece], alpha=alpha, color=color)
+
+    transform = (
+        Affine2D().scale(_FONTSIZE / 72)
+        + ax.figure.dpi_scale_trans
+        + ScaledTranslation(x, y + 0.05, ax.transData)
+    )
+    patch = patches.PathPatch(
+        GLYPH_CACHE.get(piece),
+        transform=transform,
+        facecolor=color,
+        edgecolor="none",
         alpha=alpha,
-        color=color,
+        zorder=3,
     )
+    ax.add_patch(patch)
+    return patch
 
 
 def add_arrow(
     ax: plt.Axes,
-    from_square: str,
-    to_square: str,
+    from_square: Square,
+    to_square: Square,
     alpha=1.0,
     color="black",
 ):
@@ -273,6 +679,234 @@ def add_arrow(
     )
 
 
+def _arrow_polygons(
+    from_squares: np.ndarray, to_squares: np.ndarray, shaft: np.ndarray
+) -> np.ndarray:
+    """
+    Outlines of straight arrows between squares, as an (N, 7, 2) array
+
+    The head is three times as wide as the shaft and half again as long as
+    it is wide, like the arrows of `add_arrow`, and is shortened for arrows
+    shorter than their head.
+    """
+    start = np.stack([_GRID_X[from_squares], _GRID_Y[from_squares]], axis=-1)
+    end = np.stack([_GRID_X[to_squares], _GRID_Y[to_squares]], axis=-1)
+    start = start.astype(float)
+    end = end.astype(float)
+
+    length = np.hypot(*(end - start).T)[:, None]
+    direction = (end - start) / np.maximum(length, 1e-9)
+    normal = direction[:, ::-1] * (-1, 1)
+
+    half_shaft = (shaft / 2)[:, None] * normal
+    half_head = 3 * half_shaft
+    head_length = np.minimum(1.5 * 3 * shaft[:, None], length)
+    neck = end - direction * head_length
+
+    return np.stack(
+        [
+            start + half_shaft,
+            neck + half_shaft,
+            neck + half_head,
+            end,
+            neck - half_head,
+            neck - half_shaft,
+            start - half_shaft,
+        ],
+        axis=1,
+    )
+
+
+def _setup_board(ax: plt.Axes):
+    """
+    Sets the axis limits so that each square is a unit cell
+    """
+    ax.set_xlim([-0.5, 7.5])
+    ax.set_ylim([7.5, -0.5])
+
+
+def _setup_ticks(ax: plt.Axes):
+    """
+    Labels the ranks and files along the edges of the board
+    """
+    ax.tick_params(labeltop=True, labelright=True, length=0)
+
+    ax.set_yticks(list(reversed(list(range(8)))))
+    ax.set_xticks(list(range(8)))
+
+    ax.set_yticklabels(("1", "2", "3", "4", "5", "6", "7", "8"))
+    ax.set_xticklabels(("a", "b", "c", "d", "e", "f", "g", "h"))
+
+
+def _piece_text(
+    ax: plt.Axes, x: float, y: float, text: str, alpha: float = 1.0, color="black"
+):
+    """
+    Draws a piece glyph centered on the grid location (x, y)
+    """
+    return ax.text(
+        x,
+        y + 0.05,
+        text,
+        fontsize=_FONTSIZE,
+        ha="center",
+        va="center",
+        alpha=alpha,
+        color=color,
+    )
+
+
+def _add_grid_collection(ax: plt.Axes) -> LineCollection:
+    """
+    Draws all of the grid lines as a single collection
+    """
+    edges = np.arange(9) - 0.5
+    horizontal = [[(-0.5, e), (7.5, e)] for e in edges[:-1]]
+    vertical = [[(e, -0.5), (e, 7.5)] for e in edges[:-1]]
+
+    grid = LineCollection(
+        horizontal + vertical,
+        colors="black",
+        linewidths=rcParams["lines.linewidth"],
+        capstyle="projecting",
+        zorder=2,
+    )
+    ax.add_collection(grid, autolim=False)
+    return grid
+
+
+def _add_piece_collection(
+    ax: plt.Axes, board: chess.Board, alpha: float = 1.0, color: str = "black"
+) -> PathCollection:
+    """
+    Draws all of the pieces on the board as a single collection
+    """
+    piece_map = board.piece_map()
+    squares = list(piece_map.keys())
+
+    paths = [GLYPH_CACHE.get(piece_map[square].symbol()) for square in squares]
+    index = np.array(squares, dtype=np.int64)
+    offsets = np.stack([_GRID_X[index], _GRID_Y[index] + 0.05], axis=-1)
+
+    pieces = PathCollection(
+        paths,
+        sizes=[_FONTSIZE**2],
+        offsets=offsets,
+        offset_transform=ax.transData,
+        transform=IdentityTransform(),
+        facecolors=color,
+        edgecolors="none",
+        alpha=alpha,
+        zorder=3,
+    )
+    ax.add_collection(pieces, autolim=False)
+    return pieces
+
+
+class GlyphCache:
+    r"""
+    Cache of the piece glyphs as outlines.
+
+    Each entry of `SYMBOLS` is converted into a `Path` the first time it is
+    requested and reused afterwards, which skips the font lookup and text
+    layout `ax.text` would otherwise repeat for every piece. Paths are
+    normalized so that one unit is the font size and the glyph is centered
+    on the origin the same way `add_piece` centers its text, so they fit in
+    the unit square and can be scaled to a marker size or a square. Lookups
+    are safe from multiple threads.
+
+    Attributes
+    ----------
+    hits : int
+        Number of lookups answered from the cache
+    misses : int
+        Number of lookups that had to build an outline
+
+    Examples
+    --------
+    >>> from chessplotlib.plot import GLYPH_CACHE
+    >>> path = GLYPH_CACHE.get("K")
+    >>> GLYPH_CACHE.misses
+    1
+    """
+
+    def __init__(self, fontsize: float = _FONTSIZE):
+        """
+        Parameters
+        ----------
+        fontsize: float, default=32
+            Font size used to measure the glyph layout
+        """
+        self.fontsize = fontsize
+        self.hits = 0
+        self.misses = 0
+        self._paths = {}
+        self._lock = threading.Lock()
+
+    def get(self, piece: str) -> Path:
+        """
+        Returns the unit outline of a piece.
+
+        Parameters
+        ----------
+        piece: str
+            String symbol for the piece (i.e. "P")
+
+        Returns
+        -------
+        matplotlib.path.Path
+            Outline of the glyph, centered on the origin
+        """
+        with self._lock:
+            path = self._paths.get(piece)
+            if path is not None:
+                self.hits += 1
+                return path
+
+            self.misses += 1
+            path = self._build(piece)
+            self._paths[piece] = path
+            return path
+
+    def clear(self):
+        """
+        Empties the cache and resets the counters
+        """
+        with self._lock:
+            self._paths.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _build(self, piece: str) -> Path:
+        """
+        Converts a symbol into an outline, centered the same way as ax.text
+
+        The vertical offset mirrors the layout ax.text uses for
+        va="center", where the text box is at least as tall as the line
+        height of the font.
+        """
+        from matplotlib.backends.backend_agg import RendererAgg
+
+        prop = FontProperties(size=self.fontsize)
+        renderer = RendererAgg(1, 1, 72)
+        text = SYMBOLS[piece]
+
+        _, h, d = renderer.get_text_width_height_descent(text, prop, ismath=False)
+        _, lp_h, lp_d = renderer.get_text_width_height_descent("lp", prop, False)
+        h = max(h, lp_h)
+        d = max(d, lp_d)
+
+        path = TextPath((0, 0), text, prop=prop)
+        extents = path.get_extents()
+        x = -(extents.x0 + extents.x1) / 2
+        y = d - h / 2
+        vertices = (path.vertices + (x, y)) / self.fontsize
+        return Path(vertices, path.codes)
+
+
+GLYPH_CACHE = GlyphCache()
+
+
 def _from_square(move: chess.Move) -> str:
     """
     Converts a move into the from location
@@ -292,12 +926,31 @@ def _to_square(move: chess.Move) -> Tuple[str, str]:
     return (chess.SQUARE_NAMES[move.to_square], promotion)
 
 
-def _square_to_grid(square: str) -> Tuple[int, int]:
+def _square_to_grid(square: Square) -> Tuple[int, int]:
+    """
+    Converts the name or index of a square into the grid location
+    """
+    if isinstance(square, str):
+        square = _SQUARE_INDEX[square]
+    return int(_GRID_X[square]), int(_GRID_Y[square])
+
+
+def _square_mask(squares) -> np.ndarray:
     """
-    Converts the string name of the square into the grid location
+    Converts a square set, bitboard, mask or iterable of squares into a mask
     """
-    row_val = square[0]
-    col_val = square[1]
-    col = ["8", "7", "6", "5", "4", "3", "2", "1"].index(col_val)
-    row = ["a", "b", "c", "d", "e", "f", "g", "h"].index(row_val)
-    return row, col
+    if isinstance(squares, (chess.SquareSet, int, np.integer)):
+        bits = np.array([int(squares)], dtype=">u8").view(np.uint8)
+        return np.unpackbits(bits, bitorder="big")[::-1].astype(bool)
+
+    if isinstance(squares, np.ndarray) and squares.dtype == bool:
+        if squares.shape != (64,):
+            raise ValueError("A square mask must have 64 values")
+        return squares
+
+    mask = np.zeros(64, dtype=bool)
+    for square in squares:
+        if isinstance(square, str):
+            square = _SQUARE_INDEX[square]
+        mask[square] = True
+    return mask
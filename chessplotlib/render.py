@@ -0,0 +1,80 @@
+import io
+from typing import Iterable, Optional, Union
+
+import chess
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from chessplotlib.plot import plot_board, plot_move, mark_square
+
+
+def render_board(
+    board: chess.Board,
+    move: Optional[chess.Move] = None,
+    marks: Iterable[str] = (),
+    size: int = 400,
+    fmt: str = "png",
+    dpi: float = 100,
+    checkers: bool = True,
+    collections: bool = False,
+) -> Union[bytes, np.ndarray]:
+    r"""
+    Renders a board without pyplot.
+
+    Every call builds a private `Figure` on a `FigureCanvasAgg`, so no
+    global pyplot state or GUI backend is involved and the function can be
+    called from several threads at once.
+
+    Parameters
+    ----------
+    board: chess.Board
+        Board object to plot.
+    move: chess.Move, optional
+        Move to draw on the board, like `plot_move`.
+    marks: Iterable[str]
+        Squares to highlight, (i.e. ["e2", "e4"]), like `mark_square`.
+    size: int, default=400
+        Width and height of the image in pixels.
+    fmt: str, default=png
+        "rgba" for the pixels of the canvas, or any format savefig supports.
+    dpi: float, default=100
+        Resolution of the figure, controls the size of the pieces and labels
+        relative to the image.
+    checkers: bool, default=True
+        Whether or not to apply a checker pattern to the background.
+    collections: bool, default=False
+        Whether or not to draw the grid and pieces as collections.
+
+    Returns
+    -------
+    bytes or np.ndarray
+        The encoded image, or for "rgba" a (size, size, 4) uint8 view of the
+        canvas buffer that is not copied.
+
+    Examples
+    --------
+    >>> import chess
+    >>> from concurrent.futures import ThreadPoolExecutor
+    >>> from chessplotlib.render import render_board
+    >>> boards = [chess.Board()] * 8
+    >>> with ThreadPoolExecutor(4) as pool:
+    ...     pngs = list(pool.map(render_board, boards))
+    """
+    fig = Figure(figsize=(size / dpi, size / dpi), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
+
+    plot_board(ax, board, checkers=checkers, collections=collections)
+    if move is not None:
+        plot_move(ax, board, move)
+    for square in marks:
+        mark_square(ax, square)
+
+    if fmt == "rgba":
+        canvas.draw()
+        return np.asarray(canvas.buffer_rgba())
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt, dpi=dpi)
+    return buffer.getvalue()
@@ -0,0 +1,310 @@
+import json
+import time
+import asyncio
+import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import chess
+import numpy as np
+
+from chessplotlib.cache import RenderCache, render_key
+from chessplotlib.render import render_board
+
+_REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class BoardServer:
+    r"""
+    Small asyncio HTTP server for board images.
+
+    Serves `/board.png?fen=...&move=e2e4&marks=e2,e4&size=400`, rendered
+    with `render_board` in a bounded process pool so the event loop never
+    blocks on matplotlib. Identical requests that arrive while a board is
+    being rendered share that render, recent images are kept in a
+    `RenderCache`, and every image has an ETag so clients can revalidate
+    with If-None-Match and get a 304 without a render.
+
+    `/metrics` returns JSON with latency percentiles over the last requests,
+    the number of renders in flight and waiting for a worker, and the cache
+    hit rate. A render that fails in a worker is answered with a 500 and
+    counted in "errors".
+
+    Attributes
+    ----------
+    cache : RenderCache
+        Cache of recently rendered images
+    max_queue : int
+        Renders allowed in flight before answering 503
+
+    Examples
+    --------
+    >>> from chessplotlib.server import BoardServer
+    >>> server = BoardServer(port=8000, workers=4)
+    >>> asyncio.run(server.serve_forever())
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        workers: int = 2,
+        max_queue: int = 64,
+        cache: Optional[RenderCache] = None,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Parameters
+        ----------
+        host : str, default=127.0.0.1
+            Address to listen on
+        port : int, default=8000
+            Port to listen on, 0 picks a free port
+        workers : int, default=2
+            Number of render processes
+        max_queue : int, default=64
+            Renders allowed in flight before answering 503
+        cache : RenderCache, optional
+            Cache of rendered images, defaults to a 64MiB memory cache
+        executor : concurrent.futures.Executor, optional
+            Pool to render in, defaults to a process pool of `workers`
+        """
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.max_queue = max_queue
+        self.cache = cache or RenderCache()
+
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._latencies = deque(maxlen=1000)
+        self._requests = 0
+        self._errors = 0
+        self._coalesced = 0
+        self._server = None
+
+    async def start(self):
+        """
+        Starts listening, returns once the socket is bound
+        """
+        if self._executor is None:
+            # Forking a process that already runs threads can deadlock the
+            # workers, so they start from a clean interpreter instead
+            method = "forkserver"
+            if method not in multiprocessing.get_all_start_methods():
+                method = "spawn"
+            context = multiprocessing.get_context(method)
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=context)
+
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self._server
+
+    async def close(self):
+        """
+        Stops listening and shuts down the render pool
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def serve_forever(self):
+        """
+        Starts the server and handles requests until cancelled
+        """
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Renders waiting for a free worker
+        """
+        return max(0, len(self._inflight) - self.workers)
+
+    def metrics(self) -> dict:
+        """
+        Returns the latency percentiles, queue depth and cache statistics
+        """
+        latencies = np.array(self._latencies) * 1000
+        percentiles = {}
+        if len(latencies):
+            for p in (50, 90, 99):
+                percentiles[f"p{p}_ms"] = float(np.percentile(latencies, p))
+
+        return {
+            "requests": self._requests,
+            "errors": self._errors,
+            "coalesced": self._coalesced,
+            "queue_depth": self.queue_depth,
+            "inflight": len(self._inflight),
+            "latency": percentiles,
+            "cache": self.cache.stats(),
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer):
+        start = time.perf_counter()
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            writer.close()
+            return
+
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, _ = (lines[0].split(" ") + ["", ""])[:3]
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        try:
+            status, content_type, body, extra = await self._respond(
+                method, target, headers
+            )
+
+            response = [
+                f"HTTP/1.1 {status} {_REASONS[status]}",
+                f"Content-Type: {content_type}",
+                f"Content-Length: {len(body)}",
+                "Connection: close",
+            ]
+            response += [f"{k}: {v}" for (k, v) in extra.items()]
+            head = ("\r\n".join(response) + "\r\n\r\n").encode("latin-1")
+            writer.write(head + body)
+            await writer.drain()
+        finally:
+            writer.close()
+            self._requests += 1
+            self._latencies.append(time.perf_counter() - start)
+
+    async def _respond(
+        self, method: str, target: str, headers: Dict[str, str]
+    ) -> Tuple[int, str, bytes, Dict[str, str]]:
+        """
+        Returns the (status, content type, body, headers) of a request
+        """
+        if method != "GET":
+            return 405, "text/plain", b"Only GET is supported\n", {}
+
+        url = urlsplit(target)
+        if url.path == "/metrics":
+            body = json.dumps(self.metrics()).encode()
+            return 200, "application/json", body, {}
+
+        if url.path != "/board.png":
+            return 404, "text/plain", b"Not found\n", {}
+
+        try:
+            args = _parse_board_query(url.query)
+        except ValueError as e:
+            return 400, "text/plain", f"{e}\n".encode(), {}
+
+        fen, uci, marks, size = args
+        key = render_key(fen, uci, marks, size=size, fmt="png")
+        etag = f'"{key[:32]}"'
+        extra = {"ETag": etag, "Cache-Control": "max-age=3600"}
+
+        if headers.get("if-none-match") == etag:
+            return 304, "image/png", b"", extra
+
+        png = self.cache.get(key)
+        if png is None:
+            if len(self._inflight) >= self.max_queue and key not in self._inflight:
+                return 503, "text/plain", b"Too many queued renders\n", {}
+            try:
+                png = await self._render(key, args)
+            except Exception as e:
+                self._errors += 1
+                return 500, "text/plain", f"Render failed: {e}\n".encode(), {}
+
+        return 200, "image/png", png, extra
+
+    async def _render(self, key: str, args) -> bytes:
+        """
+        Renders in the pool, sharing the result with identical requests
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            self._coalesced += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, _render_png, *args)
+        self._inflight[key] = future
+        try:
+            png = await asyncio.shield(future)
+        finally:
+            del self._inflight[key]
+
+        self.cache.put(key, png)
+        return png
+
+
+def _parse_board_query(query: str):
+    """
+    Validates the query of a board request, raises ValueError if invalid
+    """
+    params = parse_qs(query)
+
+    fen = params.get("fen", [chess.STARTING_FEN])[0]
+    board = chess.Board(fen)
+
+    uci = params.get("move", [""])[0] or None
+    if uci is not None:
+        move = chess.Move.from_uci(uci)
+        if board.piece_at(move.from_square) is None:
+            raise ValueError(f"No piece on {chess.SQUARE_NAMES[move.from_square]}")
+
+    marks = []
+    for value in params.get("marks", []):
+        marks += [m for m in value.split(",") if m]
+    for mark in marks:
+        if mark not in chess.SQUARE_NAMES:
+            raise ValueError(f"Invalid square: {mark!r}")
+
+    size = int(params.get("size", ["400"])[0])
+    if not 64 <= size <= 2048:
+        raise ValueError("size must be between 64 and 2048")
+
+    return board.fen(), uci, tuple(sorted(marks)), size
+
+
+def _render_png(fen: str, uci: Optional[str], marks, size: int) -> bytes:
+    """
+    Renders a board in a worker process
+    """
+    move = None if uci is None else chess.Move.from_uci(uci)
+    return render_board(chess.Board(fen), move, marks, size=size, fmt="png")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serves board images over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on.")
+    parser.add_argument(
+        "--workers", type=int, default=2, help="Number of render processes."
+    )
+    args = parser.parse_args()
+
+    server = BoardServer(args.host, args.port, workers=args.workers)
+    asyncio.run(server.serve_forever())
@@ -0,0 +1,268 @@
+import functools
+from typing import Iterable, Optional
+
+import chess
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.colors import to_hex
+from matplotlib.path import Path
+
+from chessplotlib.plot import (
+    GLYPH_CACHE,
+    Square,
+    _GLYPH_SCALE,
+    _GRID_X,
+    _GRID_Y,
+    _arrow_polygons,
+    _square_to_grid,
+)
+
+# Colors of the light and dark squares, the values make_checkers draws
+_CHECKERS = (to_hex(colormaps["Greys"](0.15)), to_hex(colormaps["Greys"](0.65)))
+
+# Width of the grid lines and of the marks, relative to a square
+_LINE_WIDTH = 1 / 30
+_MARK_WIDTH = 1 / 22
+
+# Size of a square in the units of the glyph definitions
+_GLYPH_UNITS = 200
+
+# Relative path commands of each matplotlib path code
+_COMMANDS = {Path.MOVETO: "m", Path.LINETO: "l", Path.CURVE3: "q", Path.CURVE4: "c"}
+
+# Width of the shaft of a move arrow, in squares, plot_move's head width
+_SHAFT = 0.05
+
+
+def render_svg(
+    board: chess.Board,
+    move: Optional[chess.Move] = None,
+    marks: Iterable[Square] = (),
+    square_size: int = 45,
+    checkers: bool = True,
+    coordinates: bool = True,
+    color: str = "red",
+) -> str:
+    r"""
+    Renders a board to an SVG document without a matplotlib figure.
+
+    The document is assembled from strings. Each glyph on the board is
+    written once as a path in `<defs>` and every piece is a `<use>` of it,
+    the checkers are a single `<pattern>` and the grid, the marks and the
+    move are one path each. A board is about a fifth of the size of
+    `savefig(format="svg")` and takes well under a millisecond once the
+    glyph outlines are cached, hundreds of times faster than a figure.
+
+    The ids of the definitions only depend on the piece and the square
+    size, so many documents can be inlined in the same HTML page.
+
+    Parameters
+    ----------
+    board : chess.Board
+        Board to render
+    move : chess.Move, optional
+        Move to draw on the board, like `plot_move`
+    marks : Iterable[str or chess.Square]
+        Squares to highlight, like `mark_square`
+    square_size : int, default=45
+        Size of a square in SVG user units, (i.e. pixels)
+    checkers : bool, default=True
+        Whether or not to apply a checker pattern to the background.
+    coordinates : bool, default=True
+        Whether or not to label the ranks and files around the board
+    color : str, default=red
+        Color of the move and the marks
+
+    Returns
+    -------
+    str
+        The SVG document
+
+    Examples
+    --------
+    >>> import chess
+    >>> from chessplotlib.svg import render_svg
+    >>> svg = render_svg(chess.Board(), move=chess.Move.from_uci("e2e4"))
+    >>> with open("board.svg", "w") as f:
+    ...     f.write(svg)
+    """
+    S = square_size
+    margin = S / 2 if coordinates else 0
+    size = 8 * S + 2 * margin
+    color = to_hex(color)
+
+    pieces = {square: piece.symbol() for (square, piece) in board.piece_map().items()}
+    if move is not None:
+        piece = board.piece_at(move.from_square)
+        if move.promotion is not None:
+            piece = chess.Piece(move.promotion, piece.color)
+        moved = (move.to_square, piece.symbol())
+
+    parts = [
+        '<svg xmlns="http://www.w3.org/2000/svg" '
+        f'width="{_number(size)}" height="{_number(size)}" '
+        f'viewBox="{_number(-margin)} {_number(-margin)} '
+        f'{_number(size)} {_number(size)}">',
+        "<defs>",
+    ]
+
+    scale = f"{S / _GLYPH_UNITS:g}"
+    used = set(pieces.values())
+    if move is not None:
+        used.add(moved[1])
+    for piece in sorted(used):
+        parts.append(
+            f'<path id="{_id(piece, S)}" transform="scale({scale})" '
+            f'd="{_glyph_data(piece)}"/>'
+        )
+
+    if checkers:
+        parts.append(
+            f'<pattern id="checkers-{S}" width="{2 * S}" height="{2 * S}" '
+            'patternUnits="userSpaceOnUse">'
+            f'<path d="M{S} 0h{S}v{S}h{-S}zM0 {S}h{S}v{S}h{-S}z" '
+            f'fill="{_CHECKERS[1]}"/></pattern>'
+        )
+    parts.append("</defs>")
+
+    if checkers:
+        parts.append(
+            f'<rect width="{8 * S}" height="{8 * S}" fill="{_CHECKERS[0]}"/>'
+            f'<rect width="{8 * S}" height="{8 * S}" fill="url(#checkers-{S})"/>'
+        )
+
+    parts.append(
+        f'<path d="{_grid_data(S)}" stroke="black" fill="none" '
+        f'stroke-width="{_number(_LINE_WIDTH * S)}" stroke-linecap="square"/>'
+    )
+
+    if coordinates:
+        parts.append(_coordinates(S))
+
+    marks = list(marks)
+    if marks:
+        rects = "".join(
+            f"M{x * S} {y * S}h{S}v{S}h{-S}z" for (x, y) in map(_square_to_grid, marks)
+        )
+        parts.append(
+            f'<path d="{rects}" stroke="{color}" fill="none" '
+            f'stroke-width="{_number(_MARK_WIDTH * S)}"/>'
+        )
+
+    parts.append("<g>")
+    for square, piece in pieces.items():
+        parts.append(_use(square, piece, S))
+    parts.append("</g>")
+
+    if move is not None:
+        (outline,) = _arrow_polygons(
+            np.array([move.from_square]),
+            np.array([move.to_square]),
+            np.array([_SHAFT]),
+        )
+        points = (outline + 0.5) * S
+        data = "M" + "L".join(f"{_number(x)} {_number(y)}" for (x, y) in points)
+        parts.append(f'<path d="{data}z" fill="{color}"/>')
+        parts.append(_use(*moved, S))
+
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def _use(square: chess.Square, piece: str, S: int) -> str:
+    """
+    References the glyph of a piece on a square
+    """
+    return (
+        f'<use href="#{_id(piece, S)}" x="{_GRID_X[square] * S}" '
+        f'y="{_GRID_Y[square] * S}"/>'
+    )
+
+
+def _id(piece: str, S: int) -> str:
+    """
+    Id of the definition of a glyph at a square size
+    """
+    return f"{piece}{S}"
+
+
+@functools.lru_cache(maxsize=None)
+def _glyph_data(piece: str) -> str:
+    """
+    Path data of a glyph filling a square of `_GLYPH_UNITS` with its corner
+    at the origin
+
+    The glyph is placed the way `SpriteAtlas` places it, scaled by
+    `_GLYPH_SCALE` and moved down by 0.05 of a square like `add_piece`.
+    Points are rounded to whole units and written relative to the previous
+    point, which keeps almost every number to one or two digits.
+    """
+    scale = _GLYPH_SCALE * _GLYPH_UNITS
+    center = (_GLYPH_UNITS / 2, 0.55 * _GLYPH_UNITS)
+
+    data = []
+    command = None
+    pen = start = np.zeros(2, dtype=np.int64)
+    path = GLYPH_CACHE.get(piece)
+    for vertices, code in path.iter_segments(simplify=False, curves=True):
+        if code == Path.CLOSEPOLY:
+            data.append("z")
+            command = "z"
+            pen = start
+            continue
+
+        points = np.rint(vertices.reshape(-1, 2) * (scale, -scale) + center)
+        points = points.astype(np.int64)
+        numbers = (points - pen).ravel().tolist()
+        pen = points[-1]
+        if code == Path.MOVETO:
+            start = pen
+
+        text = "".join(f"{n}" if n < 0 else f" {n}" for n in numbers)
+        if _COMMANDS[code] != command or code == Path.MOVETO:
+            command = _COMMANDS[code]
+            text = command + text.lstrip()
+        data.append(text)
+
+    return "".join(data)
+
+
+@functools.lru_cache(maxsize=None)
+def _grid_data(S: int) -> str:
+    """
+    Path data of every grid line
+    """
+    rows = "".join(f"M0 {i * S}H{8 * S}" for i in range(9))
+    cols = "".join(f"M{i * S} 0V{8 * S}" for i in range(9))
+    return rows + cols
+
+
+@functools.lru_cache(maxsize=None)
+def _coordinates(S: int) -> str:
+    """
+    Rank and file labels on every side of the board, like `_setup_ticks`
+    """
+    # One element per side, with a position for every character
+    centers = " ".join(_number((i + 0.5) * S) for i in range(8))
+    near = _number(-S / 4)
+    far = _number(8.25 * S)
+    files = "".join(chess.FILE_NAMES)
+    ranks = "".join(reversed(chess.RANK_NAMES))
+
+    return (
+        f'<g font-family="sans-serif" font-size="{_number(S / 4)}" '
+        'text-anchor="middle" dominant-baseline="central">'
+        f'<text x="{centers}" y="{near}">{files}</text>'
+        f'<text x="{centers}" y="{far}">{files}</text>'
+        f'<text x="{near}" y="{centers}">{ranks}</text>'
+        f'<text x="{far}" y="{centers}">{ranks}</text>'
+        "</g>"
+    )
+
+
+def _number(value: float) -> str:
+    """
+    Formats a coordinate with at most two decimals and no trailing zeros
+    """
+    text = f"{value:.2f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
@@ -8,7 +8,7 @@ setuptools.setup(
     description="Chess plots with matplotlib",
     long_description=long_description,
     long_description_content_type="text/markdown",
-    scripts=["bin/pgn-viewer"],
+    scripts=["bin/pgn-viewer", "bin/pgn-dashboard", "bin/render-boards"],
     version="1.0.2",
     packages=["chessplotlib"],
     python_requires=">=3",
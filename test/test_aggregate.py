@@ -0,0 +1,74 @@
+import io
+
+import chess
+import chess.pgn
+import numpy as np
+import pytest
+from chessplotlib.aggregate import OCCUPANCY_PIECES, count_positions, occupancy
+from chessplotlib.database import PGNDatabase
+
+PGN = """[Event "Casual Game"]
+[White "Anderssen, Adolf"]
+[Black "Kieseritzky, Lionel"]
+[Result "1-0"]
+
+1. e4 e5 2. f4 exf4 { a comment
+[that looks like a header] } 3. Bc4 (3. Nf3 g5) 3... Qh4+ 1-0
+
+[Event "Casual Game"]
+[White "Morphy, Paul"]
+[Black "Duke Karl"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 d6 3. d4 Bg4 4. dxe5 Bxf3 1-0
+
+[Event "Endgame"]
+[FEN "8/8/4k3/8/8/4K3/4P3/8 w - - 0 1"]
+[SetUp "1"]
+[Result "*"]
+
+1. Kd3 Kd5 *
+"""
+
+
+def _expected(text):
+    counts = np.zeros((12, 64), dtype=np.int64)
+    handle = io.StringIO(text)
+    while (game := chess.pgn.read_game(handle)) is not None:
+        for node in [game] + list(game.mainline()):
+            for square, piece in node.board().piece_map().items():
+                counts[OCCUPANCY_PIECES.index(piece.symbol()), square] += 1
+    return counts
+
+
+@pytest.fixture
+def pgn_path(tmp_path):
+    path = tmp_path / "games.pgn"
+    path.write_text(PGN)
+    return str(path)
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 256])
+def test_occupancy_matches_replay(pgn_path, chunksize):
+    counts = occupancy(pgn_path, chunksize=chunksize)
+    assert (counts == _expected(PGN)).all()
+
+    # One white king per position, variations are not counted
+    assert counts[OCCUPANCY_PIECES.index("K")].sum() == 7 + 9 + 3
+
+
+def test_occupancy_workers_and_database(pgn_path):
+    expected = _expected(PGN)
+    with PGNDatabase(pgn_path) as db:
+        assert (occupancy(pgn_path, chunksize=1, database=db) == expected).all()
+    assert (occupancy(pgn_path, workers=2, chunksize=1) == expected).all()
+
+
+def test_count_positions():
+    board = chess.Board()
+    counts = count_positions([board, board])
+
+    assert counts.shape == (12, 64)
+    assert counts[OCCUPANCY_PIECES.index("N"), chess.G1] == 2
+    assert counts[OCCUPANCY_PIECES.index("k"), chess.E8] == 2
+    assert counts.sum() == 64
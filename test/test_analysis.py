@@ -0,0 +1,124 @@
+import sys
+import time
+
+import chess
+import chess.engine
+import chess.pgn
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from chessplotlib.analysis import AnalysisOverlay, EngineAnalysis
+from chessplotlib.pgn import PGNViewer
+
+ENGINE = [sys.executable, "test/uci_stub.py"]
+
+
+@pytest.fixture
+def analysis():
+    analysis = EngineAnalysis(ENGINE, limit=chess.engine.Limit(depth=3))
+    yield analysis
+    analysis.close()
+
+
+def _until(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def _game(*sans):
+    game = chess.pgn.Game()
+    node = game
+    board = chess.Board()
+    for san in sans:
+        move = board.push_san(san)
+        node = node.add_variation(move)
+    return game
+
+
+def test_analysis_is_cached(analysis):
+    board = chess.Board()
+    assert analysis.request(board) is None
+
+    info = analysis.wait(board, timeout=10)
+    assert info["depth"] == 3
+    assert info["score"].white() == chess.engine.Cp(0)
+    assert info["pv"][0] == chess.Move.from_uci("a2a3")
+    assert analysis.done(board)
+
+    # A finished position is answered without asking the engine again
+    other = chess.Board()
+    other.push_san("e4")
+    analysis.request(other)
+    assert analysis.request(board) is info
+    assert analysis._task is None
+
+
+def test_stale_analysis_is_cancelled():
+    analysis = EngineAnalysis(ENGINE, limit=chess.engine.Limit(depth=1000))
+    try:
+        first = chess.Board()
+        analysis.request(first)
+        _until(lambda: analysis.result(first) is not None)
+
+        second = chess.Board("4k3/8/8/8/8/8/3Q4/4K3 w - - 0 1")
+        analysis.request(second)
+        _until(lambda: analysis.result(second) is not None)
+        assert not analysis.done(first)
+
+        # The engine moved on to the new position and keeps going deeper
+        info = analysis.result(second)
+        assert info["score"].white() == chess.engine.Cp(900)
+        _until(lambda: analysis.result(second)["depth"] > info["depth"])
+
+        depth = analysis.result(first)["depth"]
+        time.sleep(0.1)
+        assert analysis.result(first)["depth"] == depth
+    finally:
+        analysis.close()
+
+
+@pytest.mark.parametrize("blit", [False, True])
+def test_viewer_overlay(analysis, blit):
+    fig = Figure()
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
+    game = _game("e4", "d5", "exd5", "Qxd5")
+    viewer = PGNViewer(fig, ax, game, blit=blit, analysis=analysis)
+    canvas.draw()
+
+    analysis.wait(viewer.boards[0], timeout=10)
+    before = np.asarray(canvas.buffer_rgba()).copy()
+    assert viewer.update_analysis()
+    if blit:
+        assert (np.asarray(canvas.buffer_rgba()) != before).any()
+    assert not viewer.update_analysis()
+    assert len(viewer.overlay.arrow.get_paths()) == 1
+    assert viewer.overlay.label.get_text() == "+0.0"
+
+    # Moving on clears the overlay until the engine answers, white is a
+    # pawn up after 2. exd5
+    viewer.move_num = 3
+    viewer._redraw()
+    assert viewer.overlay.info is None
+    assert len(viewer.overlay.arrow.get_paths()) == 0
+
+    analysis.wait(viewer.boards[3], timeout=10)
+    assert viewer.update_analysis()
+    assert viewer.overlay.label.get_text() == "+1.0"
+    assert viewer.overlay.bar.get_height() > 0.5
+
+
+def test_overlay_fits_in_figure():
+    fig = Figure()
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1])
+    overlay = AnalysisOverlay(ax)
+    canvas.draw()
+
+    # The board gives up room for the bar instead of pushing it off the figure
+    bar = overlay.bar_ax.get_window_extent()
+    board = ax.get_window_extent()
+    assert fig.bbox.x0 <= board.x1 < bar.x0 < bar.x1 <= fig.bbox.x1
@@ -0,0 +1,45 @@
+import chess
+import pytest
+from matplotlib import image
+import matplotlib.pyplot as plt
+from chessplotlib import plot_board, BoardArtist
+
+with open("test/boards.txt", "r") as bf:
+    BOARD_FENS = [l.rstrip() for l in bf.readlines()]
+
+
+@pytest.mark.parametrize("i,board_fen", list(enumerate(BOARD_FENS)))
+def test_board_artist_matches_plot_board(i, board_fen):
+    board = chess.Board(board_fen)
+
+    plt.cla()
+    plot_board(plt.gca(), board)
+    plt.savefig(f"./test/temp.png")
+    expected = image.imread(f"./test/temp.png")
+
+    plt.cla()
+    artist = BoardArtist(plt.gca(), chess.Board(BOARD_FENS[i - 1]))
+    artist.set_board(board)
+    plt.savefig(f"./test/temp.png")
+    new = image.imread(f"./test/temp.png")
+
+    assert (new == expected).all()
+
+
+def test_board_artist_only_updates_changed_squares():
+    plt.cla()
+    board = chess.Board()
+    artist = BoardArtist(plt.gca(), board)
+    assert len(artist.pieces) == 32
+
+    board.push_san("e4")
+    changed = artist.set_board(board)
+    assert len(changed) == 2
+
+    board.push_san("d5")
+    board.push_san("exd5")
+    changed = artist.set_board(board)
+    assert len(changed) == 3
+    assert len(artist.pieces) == 31
+
+    assert artist.set_board(board) == []
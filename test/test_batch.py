@@ -0,0 +1,44 @@
+import os
+
+import chess
+from matplotlib import image
+import matplotlib.pyplot as plt
+from chessplotlib import plot_board, plot_move
+from chessplotlib.batch import render_boards, read_lines
+
+BOARD_FENS = read_lines("test/boards.txt")
+MOVE_UCIS = read_lines("test/moves.txt")
+
+
+def test_render_boards_matches_plot(tmp_path):
+    paths = render_boards(BOARD_FENS[:3], str(tmp_path), moves=MOVE_UCIS[:3])
+    assert [os.path.basename(p) for p in paths] == [
+        "board_0.png",
+        "board_1.png",
+        "board_2.png",
+    ]
+
+    for path, fen, uci in zip(paths, BOARD_FENS, MOVE_UCIS):
+        plt.cla()
+        board = chess.Board(fen)
+        ax = plt.gca()
+        plot_board(ax, board)
+        plot_move(ax, board, chess.Move.from_uci(uci))
+        plt.savefig(f"./test/temp.png")
+
+        expected = image.imread(f"./test/temp.png")
+        assert (image.imread(path) == expected).all()
+
+
+def test_render_boards_workers(tmp_path):
+    serial = render_boards(BOARD_FENS, str(tmp_path / "serial"))
+    parallel = render_boards(
+        BOARD_FENS, str(tmp_path / "parallel"), workers=2, chunksize=3
+    )
+    assert [os.path.basename(p) for p in serial] == [
+        os.path.basename(p) for p in parallel
+    ]
+    assert serial[-1].endswith("board_10.png")
+
+    for a, b in zip(serial, parallel):
+        assert (image.imread(a) == image.imread(b)).all()
@@ -0,0 +1,80 @@
+import os
+
+import chess
+import numpy as np
+from chessplotlib.cache import RenderCache, render_key
+from chessplotlib.batch import render_boards, read_lines
+
+BOARD_FENS = read_lines("test/boards.txt")
+
+
+def test_render_key():
+    key = render_key(BOARD_FENS[0], chess.Move.from_uci("e2e4"), ["e4", "e2"], dpi=100)
+    assert key == render_key(BOARD_FENS[0], "e2e4", ["e2", "e4"], dpi=100)
+    assert key != render_key(BOARD_FENS[0], "e2e4", ["e2", "e4"], dpi=200)
+    assert key != render_key(BOARD_FENS[1], "e2e4", ["e2", "e4"], dpi=100)
+
+
+def test_memory_tier_is_bounded():
+    cache = RenderCache(max_bytes=250)
+    for i in range(5):
+        cache.put(str(i), bytes(100))
+
+    assert cache.memory_bytes == 200
+    assert cache.get("0") is None
+    assert cache.get("4") == bytes(100)
+    assert cache.stats()["entries"] == 2
+    assert cache.hit_rate == 0.5
+
+
+def test_disk_tier(tmp_path):
+    directory = str(tmp_path / "cache")
+    cache = RenderCache(max_bytes=1000, directory=directory, max_disk_bytes=2000)
+    image = np.arange(12, dtype=np.uint8).reshape(2, 2, 3)
+    cache.put("a" * 64, b"png")
+    cache.put("b" * 64, image)
+
+    other = RenderCache(directory=directory)
+    assert other.get("a" * 64) == b"png"
+    assert (other.get("b" * 64) == image).all()
+    assert other.disk_hits == 2
+
+    for i in range(10):
+        cache.put(f"{i:064d}", bytes(500))
+
+    sizes = [
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(directory)
+        for name in names
+    ]
+    assert sum(sizes) <= 2000
+    assert cache.get(f"{9:064d}") is not None
+
+
+def test_disk_eviction_is_amortized(tmp_path, monkeypatch):
+    directory = str(tmp_path / "cache")
+    cache = RenderCache(max_bytes=0, directory=directory, max_disk_bytes=10000)
+
+    for _ in range(5):
+        cache.put("a" * 64, bytes(100))
+    assert cache._disk_bytes == 100
+
+    scans = []
+    disk_files = cache._disk_files
+    monkeypatch.setattr(cache, "_disk_files", lambda: scans.append(1) or disk_files())
+    for i in range(400):
+        cache.put(f"{i:064d}", bytes(100))
+
+    assert len(scans) <= 40
+    assert cache._disk_bytes <= 10000
+
+
+def test_render_boards_cache(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    first = render_boards(BOARD_FENS[:3], str(tmp_path / "a"), cache_dir=cache_dir)
+    second = render_boards(BOARD_FENS[:3], str(tmp_path / "b"), cache_dir=cache_dir)
+
+    assert len(os.listdir(cache_dir)) > 0
+    for a, b in zip(first, second):
+        with open(a, "rb") as fa, open(b, "rb") as fb:
+            assert fa.read() == fb.read()
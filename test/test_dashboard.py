@@ -0,0 +1,141 @@
+import chess
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from chessplotlib.dashboard import Dashboard, PGNTail
+
+HEADERS = """[Event "Broadcast"]
+[White "Anderssen, Adolf"]
+[Black "Kieseritzky, Lionel"]
+[Result "*"]
+
+"""
+
+
+def _append(path, text):
+    with open(path, "a") as f:
+        f.write(text)
+
+
+def _sans(tail):
+    board = chess.Board()
+    sans = []
+    for move in tail.board.move_stack:
+        sans.append(board.san(move))
+        board.push(move)
+    return sans
+
+
+def test_tail_reads_appended_moves(tmp_path):
+    path = tmp_path / "game.pgn"
+    tail = PGNTail(str(path))
+    assert not tail.update()
+
+    _append(path, HEADERS + "1. e4 e5 2. N")
+    assert tail.update()
+    assert tail.headers["White"] == "Anderssen, Adolf"
+    assert _sans(tail) == ["e4", "e5"]
+
+    # Nothing new, the half written move is still held back
+    assert not tail.update()
+
+    _append(path, "f3 { 2. d4 is\nalso } (2. f4 exf4) Nc6 3")
+    assert tail.update()
+    assert _sans(tail) == ["e4", "e5", "Nf3", "Nc6"]
+    assert tail.offset == path.stat().st_size
+
+    _append(path, ". Bb5 $1 a6!? 1-0\n")
+    assert tail.update()
+    assert _sans(tail)[-2:] == ["Bb5", "a6"]
+    assert tail.result == "1-0"
+    assert tail.errors == []
+
+
+def test_tail_shows_a_final_move_without_whitespace(tmp_path):
+    path = tmp_path / "game.pgn"
+    path.write_text(HEADERS + "1. e4 e5 2. Qh5 Nc6 3. Bc4 Nf6 4. Qxf7")
+    tail = PGNTail(str(path))
+    assert tail.update()
+    assert _sans(tail)[-1] == "Nf6"
+
+    # The file stopped growing, so the last token is complete
+    assert tail.update()
+    assert _sans(tail)[-1] == "Qxf7#"
+    assert not tail.update()
+
+    # It was only the start of a longer token
+    _append(path, "# 1-0")
+    assert tail.update()
+    assert _sans(tail)[-1] == "Qxf7#"
+    assert tail.result == "*"
+    assert tail.update()
+    assert tail.result == "1-0"
+    assert tail.errors == []
+
+    # A token that is not a legal move is still held back
+    path.write_text(HEADERS + "1. e4 e5 2. Qh")
+    tail = PGNTail(str(path))
+    tail.update()
+    assert not tail.update()
+    assert _sans(tail) == ["e4", "e5"]
+
+
+def test_tail_starts_over(tmp_path):
+    path = tmp_path / "game.pgn"
+    path.write_text(HEADERS + "1. e4 e5 *\n\n")
+    tail = PGNTail(str(path))
+    tail.update()
+
+    # A second game in the same file
+    _append(path, '[White "Morphy, Paul"]\n[FEN "8/8/4k3/8/8/4K3/4P3/8 w - - 0 1"]\n')
+    assert tail.update()
+    assert tail.headers == {
+        "White": "Morphy, Paul",
+        "FEN": "8/8/4k3/8/8/4K3/4P3/8 w - - 0 1",
+    }
+    _append(path, "\n1. Kd3 ")
+    assert tail.update()
+    assert tail.board.piece_at(chess.D3) == chess.Piece.from_symbol("K")
+
+    # A rewritten file is read from the start
+    path.write_text(HEADERS + "1. d4 ")
+    assert tail.update()
+    assert _sans(tail) == ["d4"]
+    assert tail.headers["White"] == "Anderssen, Adolf"
+
+
+def test_dashboard_blits_changed_boards(tmp_path):
+    paths = [tmp_path / f"board{i}.pgn" for i in range(4)]
+    for path in paths:
+        path.write_text(HEADERS + "1. e4 ")
+
+    fig = Figure(figsize=(6, 6), dpi=50)
+    canvas = FigureCanvasAgg(fig)
+    dashboard = Dashboard(fig, [str(path) for path in paths])
+    canvas.draw()
+    before = np.asarray(canvas.buffer_rgba()).copy()
+
+    assert dashboard.update() == []
+
+    _append(paths[2], "c5 ")
+    assert dashboard.update() == [2]
+    assert (
+        dashboard.board_artists[2].board.fen()
+        == chess.Board(
+            "rnbqkbnr/pp1ppppp/8/2p5/4P3/8/PPPP1PPP/RNBQKBNR w KQkq c6 0 2"
+        ).fen()
+    )
+    after = np.asarray(canvas.buffer_rgba())
+
+    # Only the cell of the third board changed
+    changed = (before != after).any(-1)
+    rows, cols = np.nonzero(changed)
+    height = after.shape[0]
+    x0, y0, x1, y1 = dashboard.axes[2].bbox.extents
+    assert changed.any()
+    assert cols.min() >= x0 - 1 and cols.max() <= x1 + 1
+    assert rows.min() >= height - y1 - 1 and rows.max() <= height - y0 + 1
+
+    # A redraw from scratch matches the blitted pixels
+    canvas.draw()
+    np.testing.assert_array_equal(np.asarray(canvas.buffer_rgba()), after)
@@ -0,0 +1,97 @@
+import os
+
+import pytest
+from chessplotlib.database import PGNDatabase, build_index
+
+PGN = """[Event "Casual Game"]
+[White "Anderssen, Adolf"]
+[Black "Kieseritzky, Lionel"]
+[Result "1-0"]
+
+1. e4 e5 2. f4 exf4 { a comment
+[that looks like a header] } 3. Bc4 1-0
+
+[Event "Casual Game"]
+[White "Morphy, Paul"]
+[Black "Duke Karl"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 d6 1-0
+
+[Event "Championship"]
+[White "Kieseritzky, Lionel"]
+[Black "Morphy, Paul"]
+[Result "*"]
+
+1. d4 *
+"""
+
+
+@pytest.fixture
+def pgn_path(tmp_path):
+    path = tmp_path / "games.pgn"
+    path.write_text(PGN)
+    return str(path)
+
+
+def test_build_index(pgn_path):
+    offsets, headers = build_index(pgn_path)
+    assert len(headers) == 3
+    assert offsets[-1] == os.path.getsize(pgn_path)
+    assert headers[1]["White"] == "Morphy, Paul"
+
+
+def test_database_loads_games(pgn_path):
+    with PGNDatabase(pgn_path) as db:
+        assert len(db) == 3
+        assert os.path.exists(pgn_path + ".idx")
+
+        game = db[0]
+        assert game.headers["Black"] == "Kieseritzky, Lionel"
+        assert len(list(game.mainline_moves())) == 5
+        assert db[-1].headers["Event"] == "Championship"
+
+    # The sidecar index is reused, and rebuilt once the file changes
+    with PGNDatabase(pgn_path) as db:
+        assert len(db) == 3
+
+    with open(pgn_path, "a") as f:
+        f.write('\n[Event "Extra"]\n\n1. c4 *\n')
+
+    with PGNDatabase(pgn_path) as db:
+        assert len(db) == 4
+        assert db[3].headers["Event"] == "Extra"
+
+
+def test_database_filter(pgn_path):
+    with PGNDatabase(pgn_path) as db:
+        assert db.filter(player="morphy") == [1, 2]
+        assert db.filter(White="Kieseritzky") == [2]
+        assert db.filter(player="morphy", Event="casual") == [1]
+        assert db.filter(Event="Olympiad") == []
+        assert db.filter(Result="*") == [2]
+        with pytest.raises(ValueError):
+            db.filter(ECO="C33")
+
+    # Only the indexed headers are kept, and the index is reused
+    with PGNDatabase(pgn_path, columns=("White",)) as db:
+        assert db.headers[1] == {"White": "Morphy, Paul"}
+        assert db.filter(White="MORPHY") == [1]
+    with PGNDatabase(pgn_path, columns=("White",)) as db:
+        assert list(db.headers.values["White"])[:2] == [
+            "Anderssen, Adolf",
+            "Morphy, Paul",
+        ]
+
+
+def test_build_index_skips_byte_order_mark(tmp_path):
+    path = tmp_path / "bom.pgn"
+    path.write_bytes(b"\xef\xbb\xbf" + PGN.encode())
+
+    offsets, headers = build_index(str(path))
+    assert len(headers) == 3
+    assert offsets[0] == 0
+    assert headers[0]["Event"] == "Casual Game"
+
+    with PGNDatabase(str(path)) as db:
+        assert db[0].headers["Event"] == "Casual Game"
@@ -0,0 +1,175 @@
+import os
+
+import chess
+import chess.pgn
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+from chessplotlib import plot_board
+from chessplotlib import explorer as explorer_module
+from chessplotlib.explorer import (
+    OpeningExplorer,
+    build_explorer,
+    decode_move,
+    encode_move,
+    plot_continuations,
+)
+
+PGN = """[Event "Casual Game"]
+[White "Anderssen, Adolf"]
+[Black "Kieseritzky, Lionel"]
+[Result "1-0"]
+
+1. e4 e5 2. f4 exf4 3. Bc4 (3. Nf3 g5) 3... Qh4+ 1-0
+
+[Event "Casual Game"]
+[White "Morphy, Paul"]
+[Black "Duke Karl"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 d6 3. d4 Bg4 1-0
+
+[Event "Transposition"]
+[Result "1/2-1/2"]
+
+1. Nf3 d6 2. e4 e5 3. d4 exd4 1/2-1/2
+
+[Event "Queen's Pawn"]
+[Result "0-1"]
+
+1. d4 d5 0-1
+"""
+
+
+@pytest.fixture
+def pgn_path(tmp_path):
+    path = tmp_path / "games.pgn"
+    path.write_text(PGN)
+    return str(path)
+
+
+def _board(*sans):
+    board = chess.Board()
+    for san in sans:
+        board.push_san(san)
+    return board
+
+
+def _table(explorer, *sans):
+    board = _board(*sans)
+    moves, counts = explorer.lookup(board)
+    return {board.san(move): count.tolist() for (move, count) in zip(moves, counts)}
+
+
+def test_lookup_counts_results(pgn_path):
+    explorer = OpeningExplorer(pgn_path)
+
+    moves, counts = explorer.lookup(chess.Board())
+    assert moves == [chess.Move.from_uci(uci) for uci in ("e2e4", "g1f3", "d2d4")]
+    assert counts.tolist() == [[2, 2, 0, 0], [1, 0, 1, 0], [1, 0, 0, 1]]
+
+    assert _table(explorer, "e4", "e5") == {"f4": [1, 1, 0, 0], "Nf3": [1, 1, 0, 0]}
+
+    # Both move orders reach the position after 1. e4 e5 2. Nf3 d6
+    assert _table(explorer, "e4", "e5", "Nf3", "d6") == {"d4": [2, 1, 1, 0]}
+
+    # Variations are not counted
+    assert _table(explorer, "e4", "e5", "f4", "exf4") == {"Bc4": [1, 1, 0, 0]}
+
+    moves, counts = explorer.lookup(_board("a3"))
+    assert moves == []
+    assert counts.shape == (0, 4)
+
+
+def test_max_plies_and_workers(pgn_path):
+    full = OpeningExplorer(pgn_path, index_path=pgn_path + ".a")
+    short = OpeningExplorer(pgn_path, index_path=pgn_path + ".b", max_plies=2)
+    assert len(short) < len(full)
+    assert _table(short, "e4", "e5") == {}
+
+    parallel = OpeningExplorer(
+        pgn_path, index_path=pgn_path + ".c", workers=2, chunksize=1
+    )
+    np.testing.assert_array_equal(parallel.keys, full.keys)
+    np.testing.assert_array_equal(parallel.moves, full.moves)
+    np.testing.assert_array_equal(parallel.counts, full.counts)
+
+
+def _random_games(n, plies=8, seed=0):
+    random = np.random.default_rng(seed)
+    games = []
+    for _ in range(n):
+        board = chess.Board()
+        for _ in range(plies):
+            moves = list(board.legal_moves)
+            board.push(moves[random.integers(len(moves))])
+        games.append(str(chess.pgn.Game.from_board(board)))
+    return "\n\n".join(games)
+
+
+def test_partials_are_merged_in_levels(tmp_path, monkeypatch):
+    merged = []
+    merge = explorer_module._merge
+    monkeypatch.setattr(
+        explorer_module, "_merge", lambda *a: merged.append(len(a[0])) or merge(*a)
+    )
+
+    # Records merged per record counted, for chunks of one game each
+    work = []
+    for n in (64, 512):
+        path = tmp_path / f"{n}.pgn"
+        path.write_text(_random_games(n))
+        merged.clear()
+        keys, _, counts = build_explorer(str(path), chunksize=1)
+        assert counts[:, 0].sum() == 8 * n
+        work.append(sum(merged) / (8 * n))
+
+    # Each record is merged about log2(chunks) times, not chunks / constant
+    assert work[1] < work[0] + 5
+
+
+def test_table_is_reused(pgn_path, monkeypatch):
+    built = OpeningExplorer(pgn_path)
+
+    def fail(*args):
+        raise AssertionError("table was rebuilt")
+
+    monkeypatch.setattr(explorer_module, "build_explorer", fail)
+    loaded = OpeningExplorer(pgn_path)
+    assert isinstance(loaded.keys.base, np.memmap)
+    np.testing.assert_array_equal(loaded.counts, built.counts)
+    assert _table(loaded, "e4") == {"e5": [2, 2, 0, 0]}
+
+    # A different limit needs a different table
+    with pytest.raises(AssertionError):
+        OpeningExplorer(pgn_path, max_plies=2)
+
+
+def test_truncated_table_is_rebuilt(pgn_path):
+    built = OpeningExplorer(pgn_path)
+    counts = built.counts.copy()
+    with open(built.index_path, "r+b") as f:
+        f.truncate(os.path.getsize(built.index_path) - 10)
+
+    rebuilt = OpeningExplorer(pgn_path)
+    np.testing.assert_array_equal(rebuilt.counts, counts)
+    assert sorted(os.listdir(os.path.dirname(pgn_path))) == [
+        "games.pgn",
+        "games.pgn.explorer",
+    ]
+
+
+def test_encode_move():
+    for uci in ("e2e4", "a7a8q", "h2h1n", "e1g1"):
+        move = chess.Move.from_uci(uci)
+        assert decode_move(encode_move(move)) == move
+
+
+def test_plot_continuations(pgn_path):
+    explorer = OpeningExplorer(pgn_path)
+    ax = Figure().add_subplot(1, 1, 1)
+    board = chess.Board()
+    plot_board(ax, board, collections=True)
+
+    arrows = plot_continuations(ax, board, explorer, top=2)
+    assert len(arrows.get_paths()) == 2
@@ -0,0 +1,66 @@
+import os
+import stat
+
+import numpy as np
+import pytest
+from PIL import Image
+from chessplotlib.export import write_animation
+
+
+def _frames(n, height=24, width=32):
+    frame = np.zeros((height, width, 4), dtype=np.uint8)
+    frame[..., 3] = 255
+    for i in range(n):
+        # The same buffer is reused, like the canvas of a figure
+        frame[..., 0] = 255 * (i % 2)
+        yield frame
+
+
+def test_write_gif(tmp_path):
+    path = str(tmp_path / "frames.gif")
+    assert write_animation(_frames(5), path, fps=4) == 5
+
+    image = Image.open(path)
+    assert image.n_frames == 5
+    assert image.size == (32, 24)
+    assert image.info["duration"] == 250
+
+    image.seek(1)
+    assert image.convert("RGB").getpixel((0, 0)) == (255, 0, 0)
+    image.seek(2)
+    assert image.convert("RGB").getpixel((0, 0)) == (0, 0, 0)
+
+
+def test_write_gif_without_frames(tmp_path):
+    path = tmp_path / "empty.gif"
+    assert write_animation(_frames(0), str(path)) == 0
+    assert not path.exists()
+
+    def failing():
+        raise RuntimeError("no frame")
+        yield
+
+    with pytest.raises(RuntimeError):
+        write_animation(failing(), str(path))
+    assert not path.exists()
+
+
+def test_write_video_pipes_raw_frames(tmp_path, monkeypatch):
+    # Stand-in for ffmpeg that records the size of its input
+    ffmpeg = tmp_path / "ffmpeg"
+    ffmpeg.write_text(
+        "#!/bin/sh\n" 'for last in "$@"; do :; done\n' 'wc -c > "$last"\n'
+    )
+    ffmpeg.chmod(ffmpeg.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+    path = str(tmp_path / "frames.mp4")
+    assert write_animation(_frames(3), path) == 3
+    with open(path) as f:
+        assert int(f.read()) == 3 * 24 * 32 * 4
+
+
+def test_write_video_requires_ffmpeg(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    with pytest.raises(RuntimeError):
+        write_animation(_frames(1), str(tmp_path / "frames.mp4"))
@@ -0,0 +1,51 @@
+import chess
+import numpy as np
+from matplotlib import image
+import matplotlib.pyplot as plt
+from chessplotlib.plot import SYMBOLS, GlyphCache, GLYPH_CACHE, add_piece, plot_board
+
+
+def test_glyph_cache_counts():
+    cache = GlyphCache()
+    for piece in SYMBOLS:
+        cache.get(piece)
+    assert cache.misses == len(SYMBOLS)
+    assert cache.hits == 0
+
+    path = cache.get("K")
+    assert cache.get("K") is path
+    assert cache.hits == 2
+
+    cache.clear()
+    assert cache.hits == cache.misses == 0
+
+
+def test_glyphs_fit_unit_square():
+    cache = GlyphCache()
+    for piece in SYMBOLS:
+        extents = cache.get(piece).get_extents()
+        assert -0.5 <= extents.x0 < extents.x1 <= 0.5
+        assert -0.5 <= extents.y0 < extents.y1 <= 0.5
+
+
+def test_add_piece_glyph_matches_text():
+    board = chess.Board("rnbqkbnr/pppppppp/8/8/8/8/8/RNBQKBNR w - - 0 1")
+
+    plt.cla()
+    ax = plt.gca()
+    plot_board(ax, board)
+    add_piece(ax, "e4", "P")
+    plt.savefig(f"./test/temp.png")
+    expected = image.imread(f"./test/temp.png")
+
+    plt.cla()
+    ax = plt.gca()
+    plot_board(ax, board)
+    misses = GLYPH_CACHE.misses
+    add_piece(ax, "e4", "P", glyph=True)
+    add_piece(ax, "e4", "P", glyph=True, alpha=0.0)
+    plt.savefig(f"./test/temp.png")
+    new = image.imread(f"./test/temp.png")
+
+    assert GLYPH_CACHE.misses <= misses + 1
+    assert np.abs(new - expected).mean() < 0.001
@@ -0,0 +1,53 @@
+import sys
+import json
+import subprocess
+
+import pytest
+import chessplotlib
+
+# Generous, since it includes interpreter noise, the import itself takes a
+# few milliseconds when it does not load matplotlib
+IMPORT_BUDGET = 0.05
+
+
+def _run(code):
+    output = subprocess.check_output([sys.executable, "-c", code])
+    return json.loads(output)
+
+
+def test_import_loads_nothing_heavy():
+    result = _run(
+        "import sys, json, time\n"
+        "start = time.perf_counter()\n"
+        "import chessplotlib\n"
+        "elapsed = time.perf_counter() - start\n"
+        "print(json.dumps([elapsed, sorted(sys.modules)]))\n"
+    )
+    elapsed, modules = result
+
+    assert not [m for m in modules if m.startswith(("matplotlib", "numpy"))]
+    assert elapsed < IMPORT_BUDGET
+
+
+def test_plotting_does_not_select_a_backend():
+    modules = _run(
+        "import sys, json, chess\n"
+        "from matplotlib.figure import Figure\n"
+        "from chessplotlib import plot_board, PGNViewer\n"
+        "plot_board(Figure().add_subplot(1, 1, 1), chess.Board(), collections=True)\n"
+        "print(json.dumps(sorted(sys.modules)))\n"
+    )
+
+    assert "chessplotlib.plot" in modules
+    assert "chessplotlib.pgn" in modules
+    assert "matplotlib.pyplot" not in modules
+    assert "chessplotlib.analysis" not in modules
+
+
+def test_lazy_attributes():
+    from chessplotlib.plot import plot_board
+
+    assert chessplotlib.plot_board is plot_board
+    assert set(chessplotlib.__all__) <= set(dir(chessplotlib))
+    with pytest.raises(AttributeError):
+        chessplotlib.not_a_function
@@ -0,0 +1,295 @@
+import io
+from types import SimpleNamespace
+
+import chess.pgn
+import numpy as np
+import pytest
+import matplotlib.pyplot as plt
+from PIL import Image
+from chessplotlib import plot_board
+from chessplotlib.pgn import NodeBoards, PGNViewer
+from chessplotlib.cache import RenderCache
+
+GAME = "1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. O-O Be7 6. Re1 b5 7. Bb3 d6 *"
+
+
+def _game():
+    return chess.pgn.read_game(io.StringIO(GAME))
+
+
+def _press(viewer, key, times=1):
+    for _ in range(times):
+        viewer._press(SimpleNamespace(key=key))
+
+
+def _pixels(fig):
+    return np.array(fig.canvas.buffer_rgba())
+
+
+def test_blit_matches_full_redraw():
+    fig, ax = plt.subplots(1, 1)
+    viewer = PGNViewer(fig, ax, _game())
+    _press(viewer, "right", 5)
+    _press(viewer, "left")
+    fig.canvas.draw()
+    expected = _pixels(fig)
+    plt.close(fig)
+
+    fig, ax = plt.subplots(1, 1)
+    viewer = PGNViewer(fig, ax, _game(), blit=True)
+    fig.canvas.draw()
+    _press(viewer, "right", 5)
+    _press(viewer, "left")
+    assert viewer.move_num == 4
+    assert (_pixels(fig) == expected).all()
+    plt.close(fig)
+
+
+def test_blit_keeps_render_overrides():
+    class Viewer(PGNViewer):
+        def render(self, ax, move_num, boards, moves):
+            plot_board(ax, boards[move_num], checkers=False)
+
+    fig, ax = plt.subplots(1, 1)
+    viewer = Viewer(fig, ax, _game(), blit=True)
+    fig.canvas.draw()
+    n_children = len(ax.get_children())
+    _press(viewer, "right", 3)
+
+    assert len(ax.get_children()) == n_children
+    assert all(artist.get_animated() for artist in viewer._dynamic)
+    plt.close(fig)
+
+
+def test_node_boards():
+    game = _game()
+    boards = NodeBoards([game] + list(game.mainline()), checkpoint=4, cache_size=2)
+
+    expected = [game.board()]
+    for move in game.mainline_moves():
+        board = expected[-1].copy()
+        board.push(move)
+        expected.append(board)
+
+    assert len(boards) == len(expected)
+    for i in [9, 2, len(expected) - 1, 0, 5, -1, -len(expected)]:
+        assert boards[i].fen() == expected[i].fen()
+
+    assert len(boards._cache) == 2
+    assert [b.fen() for b in boards[3:7]] == [b.fen() for b in expected[3:7]]
+    assert [b.fen() for b in boards] == [b.fen() for b in expected]
+    with pytest.raises(IndexError):
+        boards[len(expected)]
+
+
+def test_set_game():
+    fig, ax = plt.subplots(1, 1)
+    viewer = PGNViewer(fig, ax, _game(), blit=True)
+    _press(viewer, "right", 3)
+
+    game = chess.pgn.read_game(io.StringIO("1. d4 d5 2. c4 *"))
+    viewer.set_game(game)
+    assert viewer.move_num == 0
+    assert len(viewer.moves) == 3
+    assert viewer.board_artist.board.fen() == chess.Board().fen()
+    plt.close(fig)
+
+
+def test_blit_cache_matches_render():
+    fig, ax = plt.subplots(1, 1)
+    cache = RenderCache()
+    viewer = PGNViewer(fig, ax, _game(), blit=True, cache=cache)
+    fig.canvas.draw()
+
+    frames = []
+    for _ in range(4):
+        _press(viewer, "right")
+        frames.append(_pixels(fig))
+
+    assert cache.misses == 4
+    for frame in reversed(frames[:-1]):
+        _press(viewer, "left")
+        assert (_pixels(fig) == frame).all()
+
+    assert cache.hits == 3
+
+    # A full draw after a cached frame catches the artists up
+    fig.canvas.draw()
+    assert (_pixels(fig) == frames[0]).all()
+    plt.close(fig)
+
+
+def test_export_gif(tmp_path):
+    fig, ax = plt.subplots(1, 1)
+    viewer = PGNViewer(fig, ax, _game())
+    _press(viewer, "right", 2)
+    fig.canvas.draw()
+    expected = _pixels(fig)
+
+    path = str(tmp_path / "game.gif")
+    assert viewer.export(path, fps=4) == len(viewer.moves)
+    assert viewer.move_num == 2
+    plt.close(fig)
+
+    # Frames match the viewer, up to the colors of the GIF palette
+    image = Image.open(path)
+    assert image.n_frames == len(viewer.moves)
+    image.seek(2)
+    frame = np.asarray(image.convert("RGB"), dtype=float)
+    assert np.abs(frame - expected[..., :3]).mean() < 1.0
+
+
+def test_frames_require_blit():
+    fig, ax = plt.subplots(1, 1)
+    viewer = PGNViewer(fig, ax, _game())
+    with pytest.raises(ValueError):
+        next(viewer.frames())
+    plt.close(fig)
+
+
+def test_prefetch_fills_cache():
+    fig, ax = plt.subplots(1, 1)
+    viewer = PGNViewer(fig, ax, _game(), blit=True, prefetch=2)
+    fig.canvas.draw()
+    assert viewer._prefetcher.wait(timeout=30)
+    assert viewer._prefetcher.rendered == 2
+
+    # The next move is a single blit of the prefetched frame
+    _press(viewer, "right")
+    assert viewer.cache.hits == 1
+    prefetched = _pixels(fig)
+    assert viewer._prefetcher.wait(timeout=30)
+
+    fig.canvas.draw()
+    assert (_pixels(fig) == prefetched).all()
+    plt.close(fig)
+
+
+def test_offscreen_frames_skip_subclass_init(tmp_path):
+    class Viewer(PGNViewer):
+        def __init__(self, fig, ax, path, **kwargs):
+            self.inits = getattr(self, "inits", 0) + 1
+            super().__init__(fig, ax, _game(), **kwargs)
+
+    fig, ax = plt.subplots(1, 1)
+    viewer = Viewer(fig, ax, "game.pgn", blit=True, prefetch=1)
+    fig.canvas.draw()
+    assert viewer._prefetcher.wait(timeout=30)
+
+    # Frames of the plain off screen viewer are used by the subclass
+    _press(viewer, "right")
+    assert viewer.cache.hits == 1
+    assert viewer.export(str(tmp_path / "game.gif")) == len(viewer.moves)
+    assert viewer.inits == 1
+    plt.close(fig)
+
+    class Arrows(PGNViewer):
+        def render(self, ax, move_num, boards, moves):
+            super().render(ax, move_num, boards, moves)
+
+    fig, ax = plt.subplots(1, 1)
+    with pytest.raises(ValueError):
+        Arrows(fig, ax, _game(), blit=True, prefetch=1)
+    plt.close(fig)
+
+
+def test_coalesced_presses_draw_once():
+    fig, ax = plt.subplots(1, 1)
+    viewer = PGNViewer(fig, ax, _game(), blit=True, show_frame_time=True)
+    fig.canvas.draw()
+
+    # Stand-in for the timer of an interactive canvas
+    started = []
+    viewer._timer = SimpleNamespace(start=lambda: started.append(True))
+    draws = []
+    viewer._draw_move = lambda: draws.append(viewer.move_num)
+
+    _press(viewer, "right", 5)
+    assert len(started) == 1
+    assert draws == []
+
+    viewer._on_timer()
+    assert draws == [5]
+    assert viewer.frame_time > 0
+    plt.close(fig)
+
+
+VARIATIONS = (
+    "1. e4 e5 (1... c5 2. Nf3 d6) (1... e6 2. d4) 2. Nf3 Nc6 (2... d6) 3. Bb5 *"
+)
+
+
+def _moves(*ucis):
+    return [chess.Move.from_uci(uci) for uci in ucis]
+
+
+def test_node_boards_replay_from_branch(monkeypatch):
+    game = chess.pgn.read_game(io.StringIO(VARIATIONS))
+    boards = NodeBoards([game] + list(game.mainline()), checkpoint=2)
+    assert [b.fen() for b in boards] == [n.board().fen() for n in boards.nodes]
+
+    e4 = boards.nodes[1]
+    sicilian = boards.branch(2, e4.variations[1])
+    assert sicilian.moves == _moves("e2e4", "c7c5", "g1f3", "d7d6")
+
+    pushes = []
+    push = chess.Board.push
+    monkeypatch.setattr(
+        chess.Board, "push", lambda board, m: pushes.append(m) or push(board, m)
+    )
+    board = sicilian[-1]
+
+    # Only the moves after the branch point were replayed
+    assert pushes == sicilian.moves[1:]
+    monkeypatch.undo()
+    assert board.fen() == sicilian.nodes[-1].board().fen()
+
+
+def test_node_boards_keep_checkpoints(monkeypatch):
+    # A long game of knights moving back and forth
+    shuffle = _moves("g1f3", "g8f6", "f3g1", "f6g8")
+    game = chess.pgn.Game()
+    game.add_line(shuffle * 150)
+    boards = NodeBoards([game] + list(game.mainline()), checkpoint=8, cache_size=16)
+    for board in boards:
+        pass
+
+    pushes = []
+    push = chess.Board.push
+    monkeypatch.setattr(
+        chess.Board, "push", lambda board, m: pushes.append(m) or push(board, m)
+    )
+
+    # The visited boards were evicted, but the checkpoints were not
+    for index in (300, 13, 597):
+        pushes.clear()
+        board = boards[index]
+        assert len(pushes) <= boards.checkpoint
+        assert board.board_fen() == boards.nodes[index].board().board_fen()
+
+
+def test_variation_navigation():
+    fig, ax = plt.subplots(1, 1)
+    game = chess.pgn.read_game(io.StringIO(VARIATIONS))
+    viewer = PGNViewer(fig, ax, game, blit=True)
+    fig.canvas.draw()
+
+    _press(viewer, "right")
+    assert viewer.moves[1] == chess.Move.from_uci("e7e5")
+
+    _press(viewer, "down")
+    assert viewer.moves[1:] == _moves("c7c5", "g1f3", "d7d6")
+    _press(viewer, "down")
+    assert viewer.moves[1:] == _moves("e7e6", "d2d4")
+    _press(viewer, "down")
+    assert viewer.moves[1] == chess.Move.from_uci("e7e6")
+
+    _press(viewer, "right", 5)
+    assert viewer.move_num == 2
+    assert viewer.board_artist.board.fen() == viewer.boards.nodes[2].board().fen()
+
+    # The main line is back two variations up
+    _press(viewer, "left")
+    _press(viewer, "up", 2)
+    assert viewer.moves == list(game.mainline_moves())
+    plt.close(fig)
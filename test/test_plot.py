@@ -3,7 +3,16 @@ import pytest
 import numpy as np
 from matplotlib import image
 import matplotlib.pyplot as plt
-from chessplotlib import plot_board, plot_move, mark_move
+from chessplotlib import (
+    plot_board,
+    plot_board_grid,
+    plot_move,
+    plot_moves,
+    plot_heatmap,
+    mark_move,
+    mark_squares,
+)
+from chessplotlib.plot import _square_to_grid
 
 with open("test/boards.txt", "r") as bf:
     BOARD_FENS = [l.rstrip() for l in bf.readlines()]
@@ -60,3 +69,145 @@ def test_mark_move_plot(i, board_fen, move_uci):
     baseline = image.imread(f"./test/baseline/marked_move_{i}.png")
 
     assert (new == baseline).all()
+
+
+@pytest.mark.parametrize("i,board_fen", list(enumerate(BOARD_FENS)))
+def test_board_plot_collections(i, board_fen):
+    # Glyph outlines are filled as paths instead of rendered as hinted text,
+    # so only the anti-aliased piece edges are allowed to differ.
+    board = chess.Board(board_fen)
+
+    plt.cla()
+    plot_board(plt.gca(), board)
+    plt.savefig(f"./test/temp.png")
+    expected = image.imread(f"./test/temp.png")
+
+    plt.cla()
+    ax = plt.gca()
+    plot_board(ax, board, collections=True)
+    plt.savefig(f"./test/temp.png")
+    new = image.imread(f"./test/temp.png")
+
+    assert len(ax.collections) == 2
+    assert len(ax.texts) == 0
+    assert np.abs(new - expected).mean() < 0.005
+
+
+def test_plot_moves_single_collection():
+    board = chess.Board(BOARD_FENS[1])
+    moves = list(board.legal_moves)
+    weights = np.linspace(0, 1, len(moves))
+
+    plt.cla()
+    ax = plt.gca()
+    plot_board(ax, board)
+    n_children = len(ax.get_children())
+    arrows = plot_moves(ax, board, moves, weights=weights)
+
+    assert len(ax.get_children()) == n_children + 1
+    assert len(arrows.get_paths()) == len(moves)
+
+    # Heavier moves are more opaque
+    alphas = arrows.get_facecolors()[:, 3]
+    assert (np.diff(alphas) > 0).all()
+    assert alphas[-1] == 1.0
+
+    # Colormap objects work as well as names
+    reds = plot_moves(ax, board, moves, weights=weights, cmap=plt.get_cmap("Reds"))
+    np.testing.assert_array_equal(reds.get_facecolors(), arrows.get_facecolors())
+
+    # An arrow ends on the center of its destination square
+    e2e4 = plot_moves(ax, chess.Board(), [chess.Move.from_uci("e2e4")])
+    vertices = e2e4.get_paths()[0].vertices
+    assert np.allclose(vertices[3], (4, 4))
+    assert np.allclose(vertices[[0, 6]].mean(axis=0), (4, 6))
+
+
+def test_square_to_grid_accepts_names_and_indices():
+    for square in chess.SQUARES:
+        name = chess.SQUARE_NAMES[square]
+        expected = (chess.square_file(square), 7 - chess.square_rank(square))
+        assert _square_to_grid(name) == expected
+        assert _square_to_grid(square) == expected
+
+
+def test_mark_squares_inputs():
+    squares = chess.Board().attacks(chess.G1)
+    mask = np.zeros(64, dtype=bool)
+    mask[list(squares)] = True
+
+    plt.cla()
+    ax = plt.gca()
+    outlines = [
+        mark_squares(ax, squares),
+        mark_squares(ax, int(squares)),
+        mark_squares(ax, mask),
+        mark_squares(ax, ["e2", "f3", "h3"]),
+    ]
+
+    assert len(ax.collections) == 4
+    expected = [p.vertices for p in outlines[0].get_paths()]
+    assert len(expected) == 3
+    for collection in outlines[1:]:
+        vertices = [p.vertices for p in collection.get_paths()]
+        assert all(np.array_equal(a, b) for (a, b) in zip(vertices, expected))
+
+
+def test_plot_heatmap_orientation():
+    values = np.zeros(64)
+    values[chess.E4] = 1.0
+    values[chess.A8] = np.nan
+
+    plt.cla()
+    ax = plt.gca()
+    plot_board(ax, chess.Board())
+    heatmap = plot_heatmap(ax, values)
+
+    grid = heatmap.get_array()
+    assert grid[4, 4] == 1.0
+    assert np.ma.is_masked(grid[0, 0])
+    assert heatmap.get_zorder() < min(t.get_zorder() for t in ax.texts)
+
+
+def test_plot_board_grid_constant_artists():
+    boards = [chess.Board(fen) for fen in BOARD_FENS]
+    moves = [chess.Move.from_uci(uci) for uci in MOVE_UCIS]
+    moves[0] = None
+
+    counts = []
+    for n in (1, len(boards), 4 * len(boards)):
+        fig = plt.figure()
+        ax = plot_board_grid(fig, (boards * 4)[:n], (moves * 4)[:n], ncols=5)
+        counts.append(len(ax.get_children()))
+        plt.close(fig)
+
+    assert counts[0] == counts[1] == counts[2]
+
+    fig = plt.figure()
+    ax = plot_board_grid(fig, boards[:2], ncols=2, gap=1)
+    image, grid, pieces = ax.images[0], *ax.collections
+
+    # The second board starts nine squares to the right of the first
+    n_first = len(boards[0].piece_map())
+    assert len(pieces.get_paths()) == n_first + len(boards[1].piece_map())
+    offsets = pieces.get_offsets()
+    assert offsets[:n_first, 0].max() == 7
+    assert offsets[n_first:, 0].min() == 9
+    assert image.get_array().mask[:, 8].all()
+    assert not ax.axison
+    plt.close(fig)
+
+
+def test_plot_board_grid_title_band():
+    boards = [chess.Board()] * 4
+    fig = plt.figure()
+    ax = plot_board_grid(fig, boards, ncols=2, titles="abcd", gap=0)
+    image, grid, pieces = ax.images[0], *ax.collections
+
+    # Each row has a band for its titles, even without a gap
+    assert image.get_array().shape == (18, 16)
+    assert image.get_array().mask[8].all()
+    assert pieces.get_offsets()[:, 1].min() == 0.05
+    assert pieces.get_offsets()[64:, 1].min() == 9.05
+    assert [text.get_position()[1] for text in ax.texts] == [8, 8, 17, 17]
+    plt.close(fig)
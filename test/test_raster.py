@@ -0,0 +1,67 @@
+import chess
+import numpy as np
+from chessplotlib.raster import SpriteAtlas, render_array
+
+with open("test/boards.txt", "r") as bf:
+    BOARD_FENS = [l.rstrip() for l in bf.readlines()]
+
+
+def _cell(image, square, size):
+    x = chess.square_file(square) * size
+    y = (7 - chess.square_rank(square)) * size
+    return image[y : y + size, x : x + size]
+
+
+def test_render_array_shape():
+    for fen in BOARD_FENS:
+        image = render_array(chess.Board(fen), square_size=20)
+        assert image.shape == (160, 160, 3)
+        assert image.dtype == np.uint8
+
+
+def test_render_array_only_changes_moved_squares():
+    atlas = SpriteAtlas(square_size=24)
+    board = chess.Board()
+    before = atlas.render(board)
+    board.push_san("e4")
+    after = atlas.render(board)
+
+    changed = {
+        square
+        for square in chess.SQUARES
+        if (_cell(before, square, 24) != _cell(after, square, 24)).any()
+    }
+    assert changed == {chess.E2, chess.E4}
+
+    # Empty squares of the same color are identical
+    assert (_cell(after, chess.E2, 24) == _cell(after, chess.C4, 24)).all()
+
+
+def test_render_overlays():
+    atlas = SpriteAtlas(square_size=24)
+    board = chess.Board()
+    out = np.zeros((atlas.size, atlas.size, 3), dtype=np.uint8)
+
+    image = atlas.render(board, marks=["e2", chess.D2], out=out)
+    assert image is out
+    for square in [chess.E2, chess.D2]:
+        assert (_cell(image, square, 24)[0] == (255, 0, 0)).all()
+
+    plain = atlas.render(board)
+    moved = atlas.render(board, move=chess.Move.from_uci("e2e4"))
+    diff = (plain != moved).any(-1)
+    red = (moved[..., 0] > 200) & (moved[..., 1] < 100)
+    assert diff.any()
+    assert red[diff].any()
+    assert not diff[: 3 * 24].any()
+
+
+def test_render_batch_matches_render():
+    atlas = SpriteAtlas(square_size=16)
+    boards = [chess.Board(fen) for fen in BOARD_FENS]
+    out = np.zeros((len(boards), atlas.size, atlas.size, 3), dtype=np.uint8)
+
+    images = atlas.render_batch(boards, out=out)
+    assert images is out
+    for board, image in zip(boards, images):
+        assert (atlas.render(board) == image).all()
@@ -0,0 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import chess
+import numpy as np
+from chessplotlib.render import render_board
+
+with open("test/boards.txt", "r") as bf:
+    BOARD_FENS = [l.rstrip() for l in bf.readlines()]
+
+with open("test/moves.txt", "r") as mf:
+    MOVE_UCIS = [l.rstrip() for l in mf.readlines()]
+
+
+def _render(i, fmt="png"):
+    board = chess.Board(BOARD_FENS[i])
+    move = chess.Move.from_uci(MOVE_UCIS[i])
+    return render_board(board, move, marks=[MOVE_UCIS[i][:2]], size=200, fmt=fmt)
+
+
+def test_render_board_formats():
+    png = _render(0)
+    assert png.startswith(b"\x89PNG")
+
+    rgba = _render(0, fmt="rgba")
+    assert rgba.shape == (200, 200, 4)
+    assert rgba.dtype == np.uint8
+
+    svg = _render(0, fmt="svg")
+    assert b"<svg" in svg
+
+
+def test_render_board_threads():
+    indices = list(range(len(BOARD_FENS))) * 2
+    serial = [_render(i, "rgba") for i in indices]
+
+    with ThreadPoolExecutor(4) as pool:
+        threaded = list(pool.map(lambda i: _render(i, "rgba"), indices))
+
+    for a, b in zip(serial, threaded):
+        assert (a == b).all()
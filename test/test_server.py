@@ -0,0 +1,106 @@
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import chess
+from chessplotlib import server as server_module
+from chessplotlib.server import BoardServer
+
+
+async def _get(port, target, headers=()):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    request = [f"GET {target} HTTP/1.1", "Host: localhost", *headers]
+    writer.write(("\r\n".join(request) + "\r\n\r\n").encode())
+    await writer.drain()
+
+    response = await reader.read()
+    writer.close()
+
+    head, body = response.split(b"\r\n\r\n", 1)
+    lines = head.decode().split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    headers = dict(line.split(": ", 1) for line in lines[1:])
+    return status, headers, body
+
+
+def _serve(test, **kwargs):
+    async def main():
+        server = BoardServer(port=0, **kwargs)
+        await server.start()
+        try:
+            await test(server)
+        finally:
+            await server.close()
+
+    asyncio.run(main())
+
+
+def test_board_endpoint():
+    fen = quote(chess.Board().fen())
+    target = f"/board.png?fen={fen}&move=e2e4&marks=e2,e4&size=200"
+
+    async def test(server):
+        status, headers, png = await _get(server.port, target)
+        assert status == 200
+        assert png.startswith(b"\x89PNG")
+
+        etag = headers["ETag"]
+        status, _, body = await _get(server.port, target, [f"If-None-Match: {etag}"])
+        assert status == 304
+        assert body == b""
+
+        status, _, cached = await _get(server.port, target)
+        assert cached == png
+        assert server.cache.hits == 1
+
+        status, _, body = await _get(server.port, "/board.png?fen=nonsense")
+        assert status == 400
+        status, _, body = await _get(server.port, "/board.png?marks=z9")
+        assert status == 400
+        status, _, body = await _get(server.port, "/other")
+        assert status == 404
+
+    _serve(test, workers=1)
+
+
+def test_coalescing_and_metrics():
+    async def test(server):
+        target = "/board.png?move=g1f3&size=128"
+        responses = await asyncio.gather(*[_get(server.port, target) for _ in range(5)])
+
+        assert all(status == 200 for (status, _, _) in responses)
+        assert len({body for (_, _, body) in responses}) == 1
+        assert server.cache.misses == 5
+        assert server.metrics()["coalesced"] == 4
+
+        status, _, body = await _get(server.port, "/metrics")
+        metrics = json.loads(body)
+        assert status == 200
+        assert metrics["requests"] == 5
+        assert metrics["queue_depth"] == 0
+        assert set(metrics["latency"]) == {"p50_ms", "p90_ms", "p99_ms"}
+
+    with ThreadPoolExecutor(1) as executor:
+        _serve(test, executor=executor)
+
+
+def test_failed_render(monkeypatch):
+    def fail(*args):
+        raise RuntimeError("out of memory")
+
+    monkeypatch.setattr(server_module, "_render_png", fail)
+
+    async def test(server):
+        status, _, body = await _get(server.port, "/board.png?size=128")
+        assert status == 500
+        assert b"out of memory" in body
+
+        metrics = server.metrics()
+        assert metrics["requests"] == 1
+        assert metrics["errors"] == 1
+        assert metrics["inflight"] == 0
+        assert "p50_ms" in metrics["latency"]
+
+    with ThreadPoolExecutor(1) as executor:
+        _serve(test, executor=executor)
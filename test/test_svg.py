@@ -0,0 +1,58 @@
+import io
+import xml.etree.ElementTree as ET
+
+import chess
+from chessplotlib.svg import render_svg
+from chessplotlib.render import render_board
+
+with open("test/boards.txt", "r") as bf:
+    BOARD_FENS = [l.rstrip() for l in bf.readlines()]
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+def _parse(svg):
+    return ET.parse(io.StringIO(svg)).getroot()
+
+
+def test_render_svg_shares_glyphs():
+    for fen in BOARD_FENS:
+        board = chess.Board(fen)
+        root = _parse(render_svg(board))
+
+        symbols = {piece.symbol() for piece in board.piece_map().values()}
+        defs = root.find(f"{SVG}defs")
+        assert {path.get("id") for path in defs.findall(f"{SVG}path")} == {
+            f"{symbol}45" for symbol in symbols
+        }
+        assert len(defs.findall(f"{SVG}pattern")) == 1
+        assert len(list(root.iter(f"{SVG}use"))) == len(board.piece_map())
+
+
+def test_render_svg_overlays():
+    board = chess.Board()
+    move = chess.Move.from_uci("e2e4")
+    root = _parse(render_svg(board, move=move, marks=["e2", chess.E4]))
+
+    uses = [
+        (use.get("href"), use.get("x"), use.get("y")) for use in root.iter(f"{SVG}use")
+    ]
+    assert len(uses) == 33
+    assert uses[-1] == ("#P45", "180", "180")
+
+    paths = root.iter(f"{SVG}path")
+    red = [path for path in paths if "#ff0000" in path.attrib.values()]
+    assert len(red) == 2
+    assert red[0].get("d").count("z") == 2
+
+    root = _parse(render_svg(board, checkers=False, coordinates=False))
+    assert root.find(f"{SVG}defs").find(f"{SVG}pattern") is None
+    assert root.find(f"{SVG}g").find(f"{SVG}text") is None
+    assert root.get("viewBox") == "0 0 360 360"
+
+
+def test_render_svg_smaller_than_savefig():
+    board = chess.Board(BOARD_FENS[1])
+    native = render_svg(board)
+    figure = render_board(board, fmt="svg")
+    assert len(native) * 4 < len(figure)
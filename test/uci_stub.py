@@ -0,0 +1,89 @@
+"""
+Minimal UCI engine for the analysis tests.
+
+Scores positions by material and plays the first legal move in UCI order.
+Each depth takes DELAY seconds, so analyses can be stopped part way.
+"""
+
+import sys
+import threading
+
+import chess
+
+DELAY = 0.02
+VALUES = {
+    chess.PAWN: 100,
+    chess.KNIGHT: 300,
+    chess.BISHOP: 300,
+    chess.ROOK: 500,
+    chess.QUEEN: 900,
+}
+
+
+def send(line):
+    sys.stdout.write(line + "\n")
+    sys.stdout.flush()
+
+
+def search(board, depth, stop):
+    moves = sorted(board.legal_moves, key=lambda m: m.uci())
+    best = moves[0] if moves else None
+
+    material = 0
+    for piece_type, value in VALUES.items():
+        material += value * len(board.pieces(piece_type, board.turn))
+        material -= value * len(board.pieces(piece_type, not board.turn))
+
+    for d in range(1, depth + 1):
+        if stop.wait(DELAY):
+            break
+        pv = f" pv {best.uci()}" if best else ""
+        send(f"info depth {d} score cp {material} nodes {d * 1000}{pv}")
+
+    send(f"bestmove {best.uci() if best else '0000'}")
+
+
+def main():
+    board = chess.Board()
+    thread = None
+    stop = threading.Event()
+
+    for line in sys.stdin:
+        tokens = line.split()
+        if not tokens:
+            continue
+
+        command = tokens[0]
+        if command == "uci":
+            send("id name uci-stub")
+            send("uciok")
+        elif command == "isready":
+            send("readyok")
+        elif command == "position":
+            if tokens[1] == "startpos":
+                board = chess.Board()
+                rest = tokens[2:]
+            else:
+                end = tokens.index("moves") if "moves" in tokens else len(tokens)
+                board = chess.Board(" ".join(tokens[2:end]))
+                rest = tokens[end:]
+            for uci in rest[1:]:
+                board.push_uci(uci)
+        elif command == "go":
+            depth = 1000
+            if "depth" in tokens:
+                depth = int(tokens[tokens.index("depth") + 1])
+            stop = threading.Event()
+            thread = threading.Thread(target=search, args=(board.copy(), depth, stop))
+            thread.start()
+        elif command == "stop":
+            stop.set()
+            if thread is not None:
+                thread.join()
+        elif command == "quit":
+            stop.set()
+            break
+
+
+if __name__ == "__main__":
+    main()